@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from src.build import build_site
+
+
+@pytest.mark.parametrize("count", [30, 300, 3000])
+def test_build_airfields(benchmark, synthetic_world, count):
+    synthetic_world(count)
+    rounds = 1 if count >= 3000 else 3
+    airfields, _, _ = benchmark.pedantic(
+        build_site.build_airfields,
+        args=("sample",),
+        kwargs={"record_history": False},
+        rounds=rounds,
+        iterations=1,
+    )
+    assert len(airfields) == count
+
+
+def test_build_site_full(benchmark, tmp_path, monkeypatch):
+    monkeypatch.setattr(build_site, "SITE_DIR", tmp_path / "site")
+    monkeypatch.setattr(build_site, "HISTORY_DIR", tmp_path / "history")
+    benchmark.pedantic(build_site.build_site, args=("sample",), kwargs={"full": True}, rounds=3)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+
+from src.compute.cruise_level import candidate_levels, optimise_cruise_level
+from src.compute.density_altitude import density_altitude
+from src.compute.sigmet_index import SigmetIndex
+from src.compute.spatial import SpatialIndex, path_points
+from src.compute.sun import sun_times
+from src.compute.wind_components import wind_components
+
+COUNT = 10_000
+
+
+def test_wind_components(benchmark):
+    rng = random.Random(0)
+    inputs = [
+        (rng.randrange(0, 360, 10), rng.randint(0, 40), rng.randrange(0, 360, 10))
+        for _ in range(COUNT)
+    ]
+    benchmark(lambda: [wind_components(*args) for args in inputs])
+
+
+def test_density_altitude(benchmark):
+    rng = random.Random(0)
+    inputs = [
+        (rng.uniform(0, 2500), rng.randint(980, 1040), rng.randint(-10, 45)) for _ in range(COUNT)
+    ]
+    benchmark(lambda: [density_altitude(*args) for args in inputs])
+
+
+def test_sun_times(benchmark):
+    rng = random.Random(0)
+    start = dt.date(2026, 1, 1)
+    inputs = [
+        (
+            start + dt.timedelta(days=rng.randint(0, 364)),
+            rng.uniform(-60, 60),
+            rng.uniform(-180, 180),
+        )
+        for _ in range(COUNT // 10)
+    ]
+    benchmark(lambda: [sun_times(*args) for args in inputs])
+
+
+def test_spatial_index_queries(benchmark):
+    rng = random.Random(0)
+    index = SpatialIndex(
+        (f"P{i}", rng.uniform(-60, 60), rng.uniform(-180, 180)) for i in range(COUNT)
+    )
+    queries = [(rng.uniform(-60, 60), rng.uniform(-180, 180)) for _ in range(COUNT // 10)]
+
+    def run() -> None:
+        for lat, lon in queries:
+            index.within(lat, lon, 100)
+            index.nearest(lat, lon, 3)
+            index.corridor([(lat, lon), (lat + 2, lon + 2)], 25)
+
+    benchmark(run)
+
+
+def test_cruise_level_optimiser(benchmark):
+    rng = random.Random(0)
+    table = [
+        {
+            "level_ft": level_ft,
+            "wind_dir_deg": rng.randrange(360),
+            "wind_speed_kt": rng.uniform(5, 80),
+            "temp_c": 15 - level_ft / 500,
+        }
+        for level_ft in range(0, 42_000, 3000)
+    ]
+    hazards = [
+        {"phenomenon": "TURB", "base_ft": 8000, "top_ft": 18000},
+        {"phenomenon": "TS", "base_ft": 10000, "top_ft": 20000},
+    ]
+    routes = [
+        [
+            {"distance_nm": rng.uniform(20, 200), "track_deg": rng.uniform(0, 360)}
+            for _ in range(rng.randint(1, 6))
+        ]
+        for _ in range(COUNT // 100)
+    ]
+    candidates = candidate_levels(range(3000, 41_000, 2000))
+
+    def run() -> None:
+        for legs in routes:
+            optimise_cruise_level(legs, table, candidates, 250, hazards)
+
+    benchmark(run)
+
+
+def test_sigmet_index_route_queries(benchmark):
+    rng = random.Random(0)
+    sigmets = []
+    for _ in range(COUNT // 10):
+        lat, lon = rng.uniform(-60, 60), rng.uniform(-170, 170)
+        sigmets.append(
+            {
+                "phenomenon": "TURB",
+                "base_ft": 10000,
+                "top_ft": 30000,
+                "valid_from": None,
+                "valid_to": None,
+                "area": {
+                    "type": "polygon",
+                    "points": [[lat, lon], [lat, lon + 3], [lat - 2, lon + 3], [lat - 2, lon]],
+                },
+            }
+        )
+    index = SigmetIndex(sigmets)
+    routes = []
+    for _ in range(COUNT // 100):
+        lat, lon = rng.uniform(-60, 60), rng.uniform(-170, 170)
+        waypoints = [(lat + rng.uniform(-3, 3), lon + rng.uniform(-3, 3)) for _ in range(4)]
+        routes.append([path_points(a, b, 50) for a, b in zip(waypoints, waypoints[1:])])
+
+    def run() -> None:
+        for paths in routes:
+            index.crossing(paths, base_ft=5000, top_ft=12000)
+
+    benchmark(run)
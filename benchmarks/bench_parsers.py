@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from benchmarks.metar_tokenizer import synthetic_reports
+from src.build import build_site
+from src.parsers.metar import decode_metar
+from src.parsers.taf import decode_taf
+from src.yaml_loader import load_yaml
+
+REFERENCE = dt.datetime(2026, 2, 14, tzinfo=dt.timezone.utc)
+
+
+def test_decode_metar(benchmark):
+    reports = synthetic_reports(2000)
+    benchmark(lambda: [decode_metar(raw, reference=REFERENCE) for raw in reports])
+
+
+def test_decode_taf(benchmark):
+    samples = sorted((build_site.SAMPLES_DIR / "taf").glob("*.txt"))
+    tafs = [path.read_text(encoding="utf-8").strip() for path in samples] * 200
+    benchmark(lambda: [decode_taf(raw) for raw in tafs])
+
+
+def test_load_yaml_packs(benchmark):
+    texts = [
+        path.read_text(encoding="utf-8")
+        for path in sorted(build_site.PACKS_DIR.glob("*/*.yaml"))
+        + sorted(build_site.DATA_DIR.glob("*.yaml"))
+    ]
+    benchmark(lambda: [load_yaml(text) for text in texts])
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from itertools import cycle, islice
+
+import pytest
+
+from src.build import build_site
+from src.build.output import write_page
+from src.build.render_html import render_airfield_page
+
+PAGES = 1000
+
+
+@pytest.fixture
+def airfield_pages(synthetic_world):
+    """1k computed airfields (50 distinct, repeated) and the sample mode banner."""
+    synthetic_world(50)
+    airfields, _, _ = build_site.build_airfields("sample", record_history=False)
+    return list(islice(cycle(airfields), PAGES)), build_site.build_mode_info("sample")
+
+
+def test_render_airfield_pages(benchmark, airfield_pages):
+    airfields, mode_info = airfield_pages
+    benchmark.extra_info["pages"] = PAGES
+    pages = benchmark(lambda: [render_airfield_page(item, mode_info) for item in airfields])
+    assert len(pages) == PAGES
+
+
+def test_write_airfield_pages(benchmark, airfield_pages, tmp_path):
+    airfields, mode_info = airfield_pages
+    benchmark.extra_info["pages"] = PAGES
+
+    def write_pages() -> None:
+        for index, item in enumerate(airfields):
+            write_page(
+                tmp_path / "airfield" / f"{index}.html", render_airfield_page(item, mode_info)
+            )
+
+    benchmark.pedantic(write_pages, rounds=5)
+    assert len(list((tmp_path / "airfield").iterdir())) == PAGES
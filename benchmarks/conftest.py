@@ -0,0 +1,24 @@
+"""Shared synthetic inputs for the pytest-benchmark suite.
+
+Run with ``make bench``; see the Makefile for saving and comparing baselines.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from src.build import build_site
+from src.build.synthetic import write_synthetic_data
+
+
+@pytest.fixture
+def synthetic_world(tmp_path, monkeypatch):
+    """Point build_site at a synthetic data dir with ``count`` aerodromes under ``tmp_path``."""
+
+    def _install(count: int, routes: int = 0) -> None:
+        for name in ("DATA_DIR", "PACKS_DIR", "SAMPLES_DIR", "HISTORY_DIR"):
+            monkeypatch.setattr(build_site, name, getattr(build_site, name))
+        write_synthetic_data(tmp_path / "data", count, routes)
+        build_site.use_data_dir(tmp_path / "data")
+
+    return _install
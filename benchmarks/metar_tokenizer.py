@@ -0,0 +1,218 @@
+"""Throughput of the single-pass METAR tokenizer against the previous multi-regex decoder.
+
+Run with ``python -m benchmarks.metar_tokenizer [--count N] [--seed S]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import re
+import time
+from pathlib import Path
+
+from src.parsers.metar import decode_metar
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLES_DIR = ROOT / "data" / "samples" / "metar"
+REFERENCE = dt.datetime(2026, 2, 14, tzinfo=dt.timezone.utc)
+
+# --- Previous decoder, kept verbatim as the baseline -------------------------------------
+
+WIND_RE = re.compile(r"(?P<dir>\d{3}|VRB)(?P<speed>\d{2})(G(?P<gust>\d{2}))?KT")
+VAR_WIND_RE = re.compile(r"(?P<from>\d{3})V(?P<to>\d{3})")
+VIS_RE = re.compile(r"\b(?P<vis>\d{4})\b")
+TEMP_RE = re.compile(r"(?P<temp>M?\d{2})/(?P<dew>M?\d{2})")
+QNH_RE = re.compile(r"Q(?P<qnh>\d{4})")
+TIME_RE = re.compile(r"(?P<day>\d{2})(?P<hour>\d{2})(?P<min>\d{2})Z")
+CLOUD_RE = re.compile(r"(?P<cover>FEW|SCT|BKN|OVC)(?P<base>\d{3})")
+LEGACY_WEATHER_CODES = {"TS", "RA", "SH", "DZ", "SN", "BR", "FG", "HZ", "GR", "GS", "SQ", "VA"}
+
+
+def _legacy_temp(value: str) -> int:
+    if value.startswith("M"):
+        return -int(value[1:])
+    return int(value)
+
+
+def _legacy_time(raw: str) -> str:
+    match = TIME_RE.search(raw)
+    if not match:
+        return ""
+    now = dt.datetime.now(dt.timezone.utc)
+    obs = dt.datetime(
+        year=now.year,
+        month=now.month,
+        day=int(match.group("day")),
+        hour=int(match.group("hour")),
+        minute=int(match.group("min")),
+        tzinfo=dt.timezone.utc,
+    )
+    return obs.isoformat().replace("+00:00", "Z")
+
+
+def legacy_decode_metar(raw: str) -> dict:
+    wind_dir = None
+    wind_speed = None
+    gust = None
+    wind_match = WIND_RE.search(raw)
+    if wind_match:
+        if wind_match.group("dir") != "VRB":
+            wind_dir = int(wind_match.group("dir"))
+        wind_speed = int(wind_match.group("speed"))
+        if wind_match.group("gust"):
+            gust = int(wind_match.group("gust"))
+
+    var_wind = None
+    var_match = VAR_WIND_RE.search(raw)
+    if var_match:
+        var_wind = {"from": int(var_match.group("from")), "to": int(var_match.group("to"))}
+
+    vis_match = VIS_RE.search(raw)
+    visibility_m = int(vis_match.group("vis")) if vis_match else None
+
+    cloud_layers = []
+    for cover, base in CLOUD_RE.findall(raw):
+        cloud_layers.append({"cover": cover, "base_ft": int(base) * 100})
+
+    ceiling = None
+    for layer in cloud_layers:
+        if layer["cover"] in {"BKN", "OVC"}:
+            ceiling = layer["base_ft"]
+            break
+
+    temp_match = TEMP_RE.search(raw)
+    temp_c = dew_c = None
+    if temp_match:
+        temp_c = _legacy_temp(temp_match.group("temp"))
+        dew_c = _legacy_temp(temp_match.group("dew"))
+
+    qnh_match = QNH_RE.search(raw)
+    qnh_hpa = int(qnh_match.group("qnh")) if qnh_match else None
+
+    observed_time = _legacy_time(raw)
+
+    weather = [
+        token for token in raw.split() if any(code in token for code in LEGACY_WEATHER_CODES)
+    ]
+
+    remarks = ""
+    if "RMK" in raw:
+        remarks = raw.split("RMK", 1)[1].strip()
+
+    return {
+        "raw": raw,
+        "observed_time_utc": observed_time,
+        "wind_dir_deg": wind_dir,
+        "wind_speed_kt": wind_speed,
+        "gust_kt": gust,
+        "variable_wind": var_wind,
+        "visibility_m": visibility_m,
+        "weather_codes": weather,
+        "cloud_layers": cloud_layers,
+        "ceiling_ft": ceiling,
+        "temp_c": temp_c,
+        "dewpoint_c": dew_c,
+        "qnh_hpa": qnh_hpa,
+        "remarks": remarks,
+    }
+
+
+# --- Corpora --------------------------------------------------------------------------------
+
+
+def sample_reports() -> list[str]:
+    return [path.read_text(encoding="utf-8").strip() for path in sorted(SAMPLES_DIR.glob("*.txt"))]
+
+
+def synthetic_reports(count: int, seed: int = 0) -> list[str]:
+    """Plausible METARs covering every group the tokenizer classifies."""
+    rng = random.Random(seed)
+    idents = ["FAOR", "FACT", "FALA", "FABB", "FAPN", "EGLL", "KJFK", "LFPG", "YSSY"]
+    weather = ["-RA", "RA", "+TSRA", "BR", "FG", "VCSH", "-SHRA", "HZ", "FZFG", "-DZ"]
+    covers = ["FEW", "SCT", "BKN", "OVC"]
+    remarks = ["RMK AO2 SLP132", "RMK QFE1002", "RMK CB SE", "RMK RAB15 T01780122"]
+    reports = []
+    for _ in range(count):
+        parts = [rng.choice(idents), f"{rng.randint(1, 28):02d}{rng.randint(0, 23):02d}00Z"]
+        speed = rng.randint(0, 35)
+        gust = f"G{speed + rng.randint(8, 20):02d}" if rng.random() < 0.2 else ""
+        direction = "VRB" if rng.random() < 0.1 else f"{rng.randrange(0, 360, 10):03d}"
+        parts.append(f"{direction}{speed:02d}{gust}KT")
+        if rng.random() < 0.15:
+            parts.append(f"{rng.randrange(0, 180, 10):03d}V{rng.randrange(180, 360, 10):03d}")
+        if rng.random() < 0.1:
+            parts.append("CAVOK")
+        else:
+            parts.append(rng.choice(["9999", "8000", "5000", "3000", "1200", "0600"]))
+            if rng.random() < 0.05:
+                parts.append(f"R{rng.randint(1, 36):02d}L/{rng.randint(3, 15) * 100:04d}U")
+            parts.extend(rng.sample(weather, rng.choice([0, 0, 1, 2])))
+            base = rng.randint(3, 30)
+            for _ in range(rng.choice([0, 1, 1, 2, 3])):
+                parts.append(f"{rng.choice(covers)}{base:03d}")
+                base += rng.randint(5, 40)
+        temp = rng.randint(-10, 35)
+        dew = temp - rng.randint(0, 15)
+        fmt = lambda value: f"M{-value:02d}" if value < 0 else f"{value:02d}"  # noqa: E731
+        parts.append(f"{fmt(temp)}/{fmt(dew)}")
+        parts.append(f"Q{rng.randint(985, 1035)}")
+        if rng.random() < 0.3:
+            parts.append(rng.choice(["NOSIG", "TEMPO 3000 SHRA", "BECMG 9999"]))
+        if rng.random() < 0.25:
+            parts.append(rng.choice(remarks))
+        reports.append(" ".join(parts))
+    return reports
+
+
+# --- Runner ---------------------------------------------------------------------------------
+
+
+def _throughput(decode, reports: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in reports:
+            decode(raw)
+        best = min(best, time.perf_counter() - start)
+    return len(reports) / best
+
+
+def run(count: int, seed: int, repeat: int) -> list[dict]:
+    corpora = {
+        "samples": sample_reports() * 1000,
+        f"synthetic x{count}": synthetic_reports(count, seed),
+    }
+    results = []
+    for name, reports in corpora.items():
+        legacy = _throughput(legacy_decode_metar, reports, repeat)
+        tokenizer = _throughput(lambda raw: decode_metar(raw, reference=REFERENCE), reports, repeat)
+        results.append(
+            {
+                "corpus": name,
+                "reports": len(reports),
+                "legacy_per_s": round(legacy),
+                "tokenizer_per_s": round(tokenizer),
+                "speedup": round(tokenizer / legacy, 2),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing runs")
+    args = parser.parse_args()
+    print(f"{'corpus':<20} {'reports':>8} {'legacy/s':>10} {'tokenizer/s':>12} {'speedup':>8}")
+    for row in run(args.count, args.seed, args.repeat):
+        print(
+            f"{row['corpus']:<20} {row['reports']:>8} {row['legacy_per_s']:>10} "
+            f"{row['tokenizer_per_s']:>12} {row['speedup']:>7}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+DEFAULT_TTL_SECONDS = {
+    "metar": 30 * 60,
+    "taf": 3 * 60 * 60,
+}
+
+
+class HttpCache:
+    """On-disk response cache for live adapters.
+
+    Bodies are stored with their ``ETag``/``Last-Modified`` validators. A response younger
+    than its product TTL is served without a request; an older one is revalidated with a
+    conditional GET so an unchanged upstream costs a 304 instead of a full download. Empty
+    bodies are never cached.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: dict[str, int] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.ttl_seconds = {**DEFAULT_TTL_SECONDS, **(ttl_seconds or {})}
+        self.clock = clock
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "empty": 0}
+        self._lock = threading.Lock()
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def _load(self, url: str) -> dict | None:
+        path = self._entry_path(url)
+        if not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _store(self, entry: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._entry_path(entry["url"]).write_text(json.dumps(entry), encoding="utf-8")
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(
+        self,
+        url: str,
+        product: str,
+        headers: dict[str, str] | None = None,
+        timeout: float = 10,
+    ) -> str:
+        now = self.clock()
+        entry = self._load(url)
+        ttl = self.ttl_seconds.get(product, 0)
+        if entry and now - entry["fetched_at"] < ttl:
+            self._count("hits")
+            return entry["body"]
+
+        request_headers = dict(headers or {})
+        if entry and entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with urlopen(Request(url, headers=request_headers), timeout=timeout) as resp:
+                body = resp.read().decode("utf-8").strip()
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+        except HTTPError as exc:
+            if exc.code != 304 or not entry:
+                raise
+            entry["fetched_at"] = now
+            self._store(entry)
+            self._count("revalidated")
+            return entry["body"]
+
+        if not body:
+            # An empty 200 is an upstream hiccup, not a report: keep serving the stale body
+            # (if any) and retry on the next call instead of caching it for a whole TTL.
+            self._count("empty")
+            return entry["body"] if entry else body
+
+        self._store(
+            {
+                "url": url,
+                "body": body,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now,
+            }
+        )
+        self._count("misses")
+        return body
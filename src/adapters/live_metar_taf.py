@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from urllib.request import Request, urlopen
 
+from src.adapters.http_cache import HttpCache
+from src.profiling import timed
+
+REPORT_PREFIXES = {"METAR", "SPECI", "TAF", "AMD", "COR"}
+
 
 @dataclass
 class RawObservation:
@@ -12,27 +18,105 @@ class RawObservation:
     observed_time_utc: str
 
 
+def _split_reports(text: str) -> dict[str, str]:
+    """Map each ident in a multi-station raw response to the first line of its report.
+
+    Indented lines continue the previous report (multi-line TAFs) and are skipped so
+    bulk results match the single-station ``splitlines()[0]`` behaviour.
+    """
+    reports: dict[str, str] = {}
+    for line in text.splitlines():
+        if not line.strip() or line[0].isspace():
+            continue
+        tokens = line.split()
+        ident = next((token for token in tokens if token not in REPORT_PREFIXES), None)
+        if ident and ident not in reports:
+            reports[ident] = line.strip()
+    return reports
+
+
 class LiveMetarTafAdapter:
     metar_url = "https://aviationweather.gov/api/data/metar?ids={ident}&format=raw"
     taf_url = "https://aviationweather.gov/api/data/taf?ids={ident}&format=raw"
+    metar_fallback_url = "https://tgftp.nws.noaa.gov/data/observations/metar/stations/{ident}.TXT"
+    taf_fallback_url = "https://tgftp.nws.noaa.gov/data/forecasts/taf/stations/{ident}.TXT"
+
+    headers = {"User-Agent": "METAR.oncloud.africa (training)"}
+
+    def __init__(
+        self,
+        batch_size: int = 40,
+        max_workers: int = 8,
+        cache: HttpCache | None = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.cache = cache
 
-    def _fetch(self, url: str) -> str:
-        request = Request(url, headers={"User-Agent": "METAR.oncloud.africa (training)"})
+    @timed("adapter.live_metar_taf")
+    def _fetch(self, url: str, product: str) -> str:
+        if self.cache:
+            return self.cache.get(url, product, headers=self.headers)
+        request = Request(url, headers=self.headers)
         with urlopen(request, timeout=10) as resp:
             return resp.read().decode("utf-8").strip()
 
+    def _fetch_fallback(self, url: str, ident: str, product: str) -> str:
+        return self._fetch(url.format(ident=ident), product).splitlines()[-1].strip()
+
     def fetch_metar(self, ident: str) -> RawObservation:
-        raw = self._fetch(self.metar_url.format(ident=ident)).splitlines()[0].strip()
+        raw = self._fetch(self.metar_url.format(ident=ident), "metar").splitlines()[0].strip()
         if not raw:
-            raw = self._fetch(
-                f"https://tgftp.nws.noaa.gov/data/observations/metar/stations/{ident}.TXT"
-            ).splitlines()[-1].strip()
+            raw = self._fetch_fallback(self.metar_fallback_url, ident, "metar")
         return RawObservation(ident=ident, raw=raw, source="LIVE_BETA", observed_time_utc="")
 
     def fetch_taf(self, ident: str) -> RawObservation:
-        raw = self._fetch(self.taf_url.format(ident=ident)).splitlines()[0].strip()
+        raw = self._fetch(self.taf_url.format(ident=ident), "taf").splitlines()[0].strip()
         if not raw:
-            raw = self._fetch(
-                f"https://tgftp.nws.noaa.gov/data/forecasts/taf/stations/{ident}.TXT"
-            ).splitlines()[-1].strip()
+            raw = self._fetch_fallback(self.taf_fallback_url, ident, "taf")
         return RawObservation(ident=ident, raw=raw, source="LIVE_BETA", observed_time_utc="")
+
+    def _fetch_many(
+        self,
+        idents: list[str],
+        bulk_url: str,
+        fallback_url: str,
+        product: str,
+    ) -> dict[str, RawObservation]:
+        reports: dict[str, str] = {}
+        for start in range(0, len(idents), self.batch_size):
+            batch = idents[start : start + self.batch_size]
+            try:
+                text = self._fetch(bulk_url.format(ident=",".join(batch)), product)
+            except Exception:
+                continue
+            reports.update(
+                {ident: raw for ident, raw in _split_reports(text).items() if ident in batch}
+            )
+
+        def _fallback(ident: str) -> str:
+            try:
+                return self._fetch_fallback(fallback_url, ident, product)
+            except Exception:
+                return ""
+
+        missing = [ident for ident in idents if not reports.get(ident)]
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                reports.update(zip(missing, pool.map(_fallback, missing)))
+
+        return {
+            ident: RawObservation(
+                ident=ident, raw=reports[ident], source="LIVE_BETA", observed_time_utc=""
+            )
+            for ident in idents
+            if reports.get(ident)
+        }
+
+    def fetch_metars(self, idents: list[str]) -> dict[str, RawObservation]:
+        """Fetch METARs for many stations; idents missing from the result failed both sources."""
+        return self._fetch_many(idents, self.metar_url, self.metar_fallback_url, "metar")
+
+    def fetch_tafs(self, idents: list[str]) -> dict[str, RawObservation]:
+        """Fetch TAFs for many stations; idents missing from the result failed both sources."""
+        return self._fetch_many(idents, self.taf_url, self.taf_fallback_url, "taf")
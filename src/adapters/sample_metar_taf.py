@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from src.adapters.base import RawObservation
+from src.profiling import timed
 
 
 class SampleMetarTafAdapter:
@@ -10,6 +11,7 @@ class SampleMetarTafAdapter:
         self.metar_dir = metar_dir
         self.taf_dir = taf_dir
 
+    @timed("adapter.sample_metar_taf")
     def _read(self, directory: Path, ident: str) -> str:
         path = directory / f"{ident}.txt"
         if not path.exists():
@@ -3,12 +3,14 @@ from __future__ import annotations
 from pathlib import Path
 
 from src.adapters.base import TextProduct
+from src.profiling import timed
 
 
 class SampleNotamAdapter:
     def __init__(self, notam_dir: Path) -> None:
         self.notam_dir = notam_dir
 
+    @timed("adapter.sample_notam")
     def fetch(self, ident: str) -> TextProduct:
         path = self.notam_dir / f"{ident}.txt"
         lines = [
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from src.profiling import timed
+
 
 class SampleSigmetAdapter:
     def __init__(self, sigmet_path: Path) -> None:
         self.sigmet_path = sigmet_path
 
+    @timed("adapter.sample_sigmet")
     def fetch(self) -> list[str]:
         return [
             line.strip()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.adapters.sample_winds_temps import SampleWindsTempsAdapter
+from src.compute.winds_grid import WindsGrid
+from src.profiling import timed
+
+SAMPLE_DIR = Path(__file__).resolve().parents[2] / "data" / "samples" / "winds_temps"
+# Southern Africa at 2° spacing, wide enough for the synthetic packs; the sample column
+# is reproduced exactly at Johannesburg.
+SAMPLE_LATS = tuple(range(-36, 7, 2))
+SAMPLE_LONS = tuple(range(10, 43, 2))
+SAMPLE_REFERENCE = (-26.0, 28.0)
+
+
+class SampleWindsGridAdapter:
+    def __init__(self, grid_path: Path) -> None:
+        self.grid_path = grid_path
+
+    @timed("adapter.sample_winds_grid")
+    def fetch(self) -> WindsGrid:
+        return WindsGrid.load(self.grid_path)
+
+
+def write_sample_grid(column_path: Path, grid_path: Path) -> WindsGrid:
+    """Regenerate the sample grid from the single-column sample in ``column_path``."""
+    column = SampleWindsTempsAdapter(column_path).fetch()
+    grid = WindsGrid.from_column(
+        column["levels"], SAMPLE_LATS, SAMPLE_LONS, SAMPLE_REFERENCE, column["source"]
+    )
+    grid.write(grid_path)
+    return grid
+
+
+if __name__ == "__main__":
+    write_sample_grid(SAMPLE_DIR / "winds_temps.json", SAMPLE_DIR / "winds_grid.bin")
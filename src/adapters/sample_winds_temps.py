@@ -3,10 +3,13 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from src.profiling import timed
+
 
 class SampleWindsTempsAdapter:
     def __init__(self, winds_path: Path) -> None:
         self.winds_path = winds_path
 
+    @timed("adapter.sample_winds_temps")
     def fetch(self) -> dict:
         return json.loads(self.winds_path.read_text(encoding="utf-8"))
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from src.build.output import copy_file, write_bytes
+
+MANIFEST_NAME = "manifest.json"
+# The last few asset manifests, so superseded fingerprints outlive the build that replaced them.
+GENERATIONS_NAME = "generations.json"
+KEEP_GENERATIONS = 3
+HASH_LENGTH = 10
+
+
+def hashed_name(name: str, payload: bytes) -> str:
+    """``style.css`` → ``style.<hash>.css``, the hash covering the file contents."""
+    stem, dot, suffix = name.rpartition(".")
+    fingerprint = hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{fingerprint}.{suffix}" if dot else f"{name}.{fingerprint}"
+
+
+def publish_bytes(assets_dir: Path, name: str, payload: bytes) -> str:
+    """Write ``name`` and its fingerprinted copy; return the fingerprinted name.
+
+    The unhashed copy stays for anything linking the old fixed URL.
+    """
+    fingerprinted = hashed_name(name, payload)
+    write_bytes(assets_dir / name, payload)
+    write_bytes(assets_dir / fingerprinted, payload)
+    return fingerprinted
+
+
+def publish_file(assets_dir: Path, source: Path) -> str:
+    """``publish_bytes`` for an asset on disk, copied rather than re-encoded."""
+    fingerprinted = hashed_name(source.name, source.read_bytes())
+    copy_file(source, assets_dir / source.name)
+    copy_file(source, assets_dir / fingerprinted)
+    return fingerprinted
+
+
+def prune_stale(
+    assets_dir: Path, manifest: dict[str, str], keep: int = KEEP_GENERATIONS
+) -> list[Path]:
+    """Remove fingerprinted copies that none of the last ``keep`` asset manifests name.
+
+    A superseded copy survives the next ``keep - 1`` asset changes, so cached pages that
+    still link it keep working for a while after the build that replaced it.
+    """
+    generations = _load_json(assets_dir / GENERATIONS_NAME, [])
+    if not generations or generations[-1] != manifest:
+        generations.append(manifest)
+    generations = generations[-keep:]
+    write_bytes(
+        assets_dir / GENERATIONS_NAME, json.dumps(generations, sort_keys=True).encode("utf-8")
+    )
+    retained = {
+        fingerprinted for generation in generations for fingerprinted in generation.values()
+    }
+
+    removed = []
+    for name in manifest:
+        stem, dot, suffix = name.rpartition(".")
+        pattern = re.compile(
+            rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}\.{re.escape(suffix)}"
+            if dot
+            else rf"{re.escape(name)}\.[0-9a-f]{{{HASH_LENGTH}}}"
+        )
+        for path in assets_dir.iterdir():
+            if path.name not in retained and pattern.fullmatch(path.name):
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+def _load_json(path: Path, default):
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -2,15 +2,27 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Iterable
 
+from src import profiling
+from src.adapters.base import RawObservation
+from src.adapters.http_cache import HttpCache
 from src.adapters.live_metar_taf import LiveMetarTafAdapter
 from src.adapters.sample_metar_taf import SampleMetarTafAdapter
 from src.adapters.sample_notam import SampleNotamAdapter
 from src.adapters.sample_sigmet import SampleSigmetAdapter
 from src.adapters.sample_sigwx import SampleSigwxAdapter
-from src.adapters.sample_winds_temps import SampleWindsTempsAdapter
+from src.adapters.sample_winds_grid import SampleWindsGridAdapter
+from src.build.assets import MANIFEST_NAME as ASSET_MANIFEST
+from src.build.assets import prune_stale, publish_bytes, publish_file
+from src.build.history_store import DEFAULT_RETENTION, open_history_store
+from src.build.manifest import changed_keys, code_digest, digest, load_manifest
+from src.build.output import write_page, write_text
 from src.build.render_html import (
     render_airfield_page,
     render_home,
@@ -18,24 +30,40 @@ from src.build.render_html import (
     render_routes_index,
     render_tool_page,
     render_tools_index,
+    use_assets,
 )
-from src.build.render_json import write_json
+from src.build.render_json import available_compressions, write_json
 from src.build.schema_validate import validate_all
+from src.build.snapshot_store import write_snapshot
 from src.compute.change_detection import detect_changes
 from src.compute.cloud_base import cloud_base_ft
 from src.compute.compound_flags import compound_flags
+from src.compute.cruise_level import candidate_levels, optimise_cruise_level
 from src.compute.density_altitude import density_altitude
 from src.compute.risk_flags import flag_severity
-from src.compute.route import bearing_deg, ground_speed_estimate, headwind_component
+from src.compute.route import level_plans, route_legs
+from src.compute.sigmet_index import SigmetIndex
+from src.compute.spatial import SpatialIndex, path_points
 from src.compute.stability import stability_score
 from src.compute.sun import civil_twilight, is_night, sun_times
+from src.compute.taf_timeline import TafTimeline, resolve_taf_time
+from src.compute.trends import (
+    HistoryColumns,
+    qnh_falling_fast,
+    qnh_rate,
+    qnh_trend,
+    sparkline_series,
+    trend_stats,
+)
+from src.compute.verdicts import verdict_inputs, verdict_matrix
 from src.compute.wind_components import wind_components
+from src.compute.winds_grid import WindsGrid, freezing_level_ft, interpolate_level
 from src.compute.workload import workload_score
 from src.parsers.metar import decode_metar
 from src.parsers.notam import decode_notam
 from src.parsers.sigmet import decode_sigmet
 from src.parsers.taf import decode_taf
-from src.yaml_loader import load_yaml
+from src.yaml_loader import load_yaml_path
 
 ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = ROOT / "data"
@@ -43,6 +71,23 @@ PACKS_DIR = DATA_DIR / "packs"
 SAMPLES_DIR = DATA_DIR / "samples"
 SITE_DIR = ROOT / "site"
 HISTORY_DIR = DATA_DIR / "history"
+CACHE_DIR = ROOT / ".cache"
+TREND_WINDOW = 20
+NEAREST_ALTERNATES = 3
+DEFAULT_TAS_KT = 120
+ARRIVAL_WINDOW = dt.timedelta(hours=1)
+LEG_SAMPLE_SPACING_NM = 50
+# Per-build stamps added to live METARs; they never alone make a page worth re-rendering.
+LIVE_FETCH_KEYS = ("fetch_time_utc", "latency_min")
+
+
+def use_data_dir(data_dir: Path) -> None:
+    """Read packs, samples and history from ``data_dir`` instead of the bundled ``data/``."""
+    global DATA_DIR, PACKS_DIR, SAMPLES_DIR, HISTORY_DIR
+    DATA_DIR = data_dir
+    PACKS_DIR = data_dir / "packs"
+    SAMPLES_DIR = data_dir / "samples"
+    HISTORY_DIR = data_dir / "history"
 
 
 def utc_now() -> dt.datetime:
@@ -50,7 +95,8 @@ def utc_now() -> dt.datetime:
 
 
 def load_yaml_file(path: Path) -> dict:
-    return load_yaml(path.read_text(encoding="utf-8"))
+    with profiling.phase("yaml"):
+        return load_yaml_path(path, CACHE_DIR / "yaml")
 
 
 def load_packs() -> tuple[list[dict], list[dict]]:
@@ -88,40 +134,13 @@ def load_aircraft() -> list[dict]:
     return load_yaml_file(DATA_DIR / "aircraft.yaml")["aircraft"]
 
 
-def load_history(ident: str) -> list[dict]:
-    path = HISTORY_DIR / f"{ident}.json"
-    if not path.exists():
-        return []
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def save_history(ident: str, history: list[dict]) -> None:
-    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
-    path = HISTORY_DIR / f"{ident}.json"
-    path.write_text(json.dumps(history[-200:], indent=2), encoding="utf-8")
-
-
 def append_history_entry(history: list[dict], entry: dict) -> list[dict]:
-    """Append a METAR-derived history entry only when it changes.
+    """Append a METAR-derived history entry unless its observation is already recorded.
 
-    This keeps repeated sample builds idempotent by avoiding duplicate points
-    with identical observation timestamps and values.
+    Entries are deduplicated by ``timestamp``, matching the history store, which keeps
+    repeated sample builds idempotent.
     """
-    if not history:
-        return [entry]
-
-    latest = history[-1]
-    keys = (
-        "timestamp",
-        "wind_speed_kt",
-        "wind_dir_deg",
-        "qnh_hpa",
-        "temp_c",
-        "dewpoint_c",
-        "visibility_m",
-        "ceiling_ft_est",
-    )
-    if all(latest.get(key) == entry.get(key) for key in keys):
+    if history and history[-1].get("timestamp") == entry.get("timestamp"):
         return history
     return [*history, entry]
 
@@ -132,40 +151,10 @@ def _parse_iso(ts: str | None) -> dt.datetime | None:
     return dt.datetime.fromisoformat(ts.replace("Z", "+00:00"))
 
 
-def hours_between(prev_ts: str | None, curr_ts: str | None) -> float | None:
-    prev = _parse_iso(prev_ts)
-    curr = _parse_iso(curr_ts)
-    if not prev or not curr:
-        return None
-    delta = curr - prev
-    return max(delta.total_seconds() / 3600.0, 0.0)
-
-
 def parse_taf_valid_to(valid_to: str, reference: dt.datetime) -> dt.datetime | None:
-    if not valid_to or len(valid_to) != 4 or not valid_to.isdigit():
-        return None
-
-    day = int(valid_to[:2])
-    hour = int(valid_to[2:])
-    if day < 1 or day > 31 or hour < 0 or hour > 24:
+    if not valid_to or len(valid_to) != 4:
         return None
-
-    month = reference.month
-    year = reference.year
-    if day < reference.day:
-        month = month + 1 if month < 12 else 1
-        year = year + 1 if month == 1 else year
-
-    if hour == 24:
-        hour = 0
-        day += 1
-
-    try:
-        valid_dt = dt.datetime(year, month, day, hour, 0, tzinfo=dt.timezone.utc)
-    except ValueError:
-        return None
-
-    return valid_dt
+    return resolve_taf_time(valid_to, reference)
 
 
 def time_to_expiry(end_time: dt.datetime | None, now: dt.datetime) -> dict:
@@ -194,32 +183,6 @@ def build_mode_info(mode: str) -> dict:
     }
 
 
-def qnh_trend(history: list[dict]) -> str:
-    if len(history) < 2:
-        return "steady"
-    prev = history[-2]
-    curr = history[-1]
-    if not prev.get("qnh_hpa") or not curr.get("qnh_hpa"):
-        return "steady"
-    delta = curr["qnh_hpa"] - prev["qnh_hpa"]
-    if delta > 1:
-        return "rising"
-    if delta < -1:
-        return "falling"
-    return "steady"
-
-
-def qnh_falling_fast(history: list[dict], threshold: float) -> bool:
-    if len(history) < 2:
-        return False
-    prev = history[-2]
-    curr = history[-1]
-    if not prev.get("qnh_hpa") or not curr.get("qnh_hpa"):
-        return False
-    delta = curr["qnh_hpa"] - prev["qnh_hpa"]
-    return delta <= -threshold
-
-
 def compute_flags(
     metar: dict,
     da: dict,
@@ -322,7 +285,7 @@ def night_ready(airfield: dict) -> bool:
 def _build_metar_taf_adapter(mode: str) -> tuple[SampleMetarTafAdapter, LiveMetarTafAdapter | None]:
     sample = SampleMetarTafAdapter(SAMPLES_DIR / "metar", SAMPLES_DIR / "taf")
     if mode == "live_beta":
-        return sample, LiveMetarTafAdapter()
+        return sample, LiveMetarTafAdapter(cache=HttpCache(CACHE_DIR / "http"))
     return sample, None
 
 
@@ -355,370 +318,703 @@ def _runway_condition_from_notams(runway_ident: str, notam_lines: list[str]) ->
     return "Not reported"
 
 
-def _fetch_with_fallback(
-    ident: str,
+def _fetch_all_with_fallback(
+    idents: list[str],
     adapter: LiveMetarTafAdapter | None,
     fallback: SampleMetarTafAdapter,
     kind: str,
-) -> tuple[dict, str]:
-    try:
-        if adapter:
+) -> dict[str, tuple[RawObservation, str]]:
+    """Fetch many stations at once; the sample fallback still applies per station."""
+    fetched: dict = {}
+    if adapter:
+        try:
             if kind == "metar":
-                return adapter.fetch_metar(ident), "LIVE_BETA"
-            return adapter.fetch_taf(ident), "LIVE_BETA"
-    except Exception:
-        pass
-    if kind == "metar":
-        return fallback.fetch_metar(ident), "SAMPLE_FALLBACK"
-    return fallback.fetch_taf(ident), "SAMPLE_FALLBACK"
+                fetched = adapter.fetch_metars(idents)
+            else:
+                fetched = adapter.fetch_tafs(idents)
+        except Exception:
+            fetched = {}
+    results = {}
+    for ident in idents:
+        if ident in fetched:
+            results[ident] = (fetched[ident], "LIVE_BETA")
+        elif kind == "metar":
+            results[ident] = (fallback.fetch_metar(ident), "SAMPLE_FALLBACK")
+        else:
+            results[ident] = (fallback.fetch_taf(ident), "SAMPLE_FALLBACK")
+    return results
+
+
+def compute_airfield(
+    airfield: dict,
+    metar: tuple[RawObservation, str],
+    taf: tuple[RawObservation, str],
+    notam_entries: list[dict],
+    history: list[dict],
+    *,
+    profile: dict,
+    profiles: list[dict],
+    aircraft: list[dict],
+    now: dt.datetime,
+    mode: str,
+    trend_window: int = TREND_WINDOW,
+) -> tuple[dict, list[dict]]:
+    """Decode and compute one airfield from already-fetched inputs.
+
+    Pure apart from its arguments, so build_airfields can fan it out to worker processes.
+    Returns the airfield payload and the history list with the new observation appended.
+    """
+    metar_raw, metar_source = metar
+    taf_raw, taf_source = taf
+    notam_lines = [entry["text"] for entry in notam_entries]
+    with profiling.phase("decode"):
+        metar_decoded = decode_metar(metar_raw.raw, reference=now)
+        taf_decoded = decode_taf(taf_raw.raw)
+    if mode == "live_beta":
+        fetch_time = now.isoformat().replace("+00:00", "Z")
+        obs_time = _parse_iso(metar_decoded.get("observed_time_utc"))
+        latency = round((now - obs_time).total_seconds() / 60.0, 1) if obs_time else None
+        metar_decoded["fetch_time_utc"] = fetch_time
+        metar_decoded["latency_min"] = latency
+
+    components = []
+    runway_surface_conditions = []
+    for runway in airfield["runways"]:
+        comp = wind_components(
+            metar_decoded["wind_dir_deg"],
+            metar_decoded["wind_speed_kt"],
+            runway["magnetic_heading_deg"],
+        )
+        components.append({"runway": runway["designator"], **comp})
+        runway_surface_conditions.append(
+            {
+                "runway": runway["designator"],
+                "surface": runway.get("surface", "--"),
+                "condition": _runway_condition_from_notams(runway["designator"], notam_lines),
+            }
+        )
 
+    crosswind = max((c["crosswind_kt"] or 0 for c in components), default=0)
+    da = density_altitude(
+        airfield["elevation_m"],
+        metar_decoded["qnh_hpa"],
+        metar_decoded["temp_c"],
+    )
+    ceiling_est = metar_decoded.get("ceiling_ft") or cloud_base_ft(
+        metar_decoded.get("temp_c"),
+        metar_decoded.get("dewpoint_c"),
+    )
+
+    previous = history[-1] if history else None
+    new_history_entry = {
+        "timestamp": metar_decoded["observed_time_utc"],
+        "wind_speed_kt": metar_decoded["wind_speed_kt"],
+        "wind_dir_deg": metar_decoded["wind_dir_deg"],
+        "qnh_hpa": metar_decoded["qnh_hpa"],
+        "temp_c": metar_decoded["temp_c"],
+        "dewpoint_c": metar_decoded["dewpoint_c"],
+        "visibility_m": metar_decoded["visibility_m"],
+        "ceiling_ft_est": ceiling_est,
+    }
+    history = append_history_entry(history, new_history_entry)
+    changes = detect_changes(previous, history[-1])
+    columns = HistoryColumns.from_entries(history[-trend_window:])
+    stats = trend_stats(columns)
+
+    taf_timeline = TafTimeline.from_decoded(taf_decoded, now)
+    taf_outlook = taf_timeline.outlook(now)
+    taf_expiry = time_to_expiry(
+        taf_timeline.valid_to or parse_taf_valid_to(taf_decoded["summary"]["valid_to"], now),
+        now,
+    )
+
+    sun = sun_times(now.date(), airfield["latitude_deg"], airfield["longitude_deg"])
+    twilight = civil_twilight(now.date(), airfield["latitude_deg"], airfield["longitude_deg"])
+    night = is_night(now, twilight.get("sunset"), twilight.get("sunrise"))
+
+    trend_fast = qnh_falling_fast(columns, profile["thresholds"]["qnh_fall_fast_hpa_per_hr"])
+    flags, flag_explanations = compute_flags(
+        metar_decoded,
+        da,
+        components,
+        profile,
+        trend_fast,
+    )
+    runway_short = any(
+        runway["length_m"] < profile["thresholds"]["short_runway_m"]
+        for runway in airfield["runways"]
+    )
+    taf_deteriorating = bool(taf_outlook and taf_outlook["deteriorating"])
+    taf_convective = bool(taf_outlook and taf_outlook["worst"]["convective"])
+    compounds = compound_flags(flags, runway_short, night, taf_deteriorating, trend_fast)
+    for compound in compounds:
+        if compound == "HIGH_DA_SHORT_RWY":
+            flag_explanations[compound] = {
+                "density_altitude_ft": da.get("da_ft"),
+                "short_runway_threshold_m": profile["thresholds"]["short_runway_m"],
+                "note": "High DA combined with short runway increases performance risk.",
+            }
+        elif compound == "CROSSWIND_HIGH_GUSTY":
+            flag_explanations[compound] = {
+                "crosswind_kt": crosswind,
+                "gust_kt": metar_decoded.get("gust_kt"),
+                "note": "Crosswind with gusts increases workload.",
+            }
+        elif compound == "LOW_CEILING_NIGHT":
+            flag_explanations[compound] = {
+                "ceiling_ft": metar_decoded.get("ceiling_ft"),
+                "night": night,
+                "note": "Low ceiling during night conditions.",
+            }
+        elif compound == "RAPID_QNH_FALL_TAF_DETERIORATING":
+            flag_explanations[compound] = {
+                "qnh_change_rate_hpa_per_hr": qnh_rate(columns),
+                "taf_hint": taf_decoded.get("raw"),
+                "taf_worst": taf_outlook["worst"] if taf_outlook else None,
+                "note": "Rapid QNH fall with deteriorating TAF.",
+            }
+        else:
+            flag_explanations[compound] = {"note": "Compound flag based on multiple conditions."}
+    all_flags = flags + compounds
+    severity = flag_severity(all_flags, profile.get("severity", {}))
+
+    go_no_go = verdict_matrix(verdict_inputs(metar_decoded, components, da), profiles, aircraft)
+    go_no_go["severity"] = []
+    for item in profiles:
+        item_fast = qnh_falling_fast(columns, item["thresholds"]["qnh_fall_fast_hpa_per_hr"])
+        item_flags, _ = compute_flags(metar_decoded, da, components, item, item_fast)
+        item_short = any(
+            runway["length_m"] < item["thresholds"]["short_runway_m"]
+            for runway in airfield["runways"]
+        )
+        item_flags += compound_flags(item_flags, item_short, night, taf_deteriorating, item_fast)
+        go_no_go["severity"].append(flag_severity(item_flags, item.get("severity", {})))
+
+    workload = workload_score(
+        {
+            "crosswind_ratio": (
+                crosswind / profile["thresholds"]["max_crosswind_kt"]
+                if profile["thresholds"]["max_crosswind_kt"]
+                else 0
+            ),
+            "gust_ratio": (
+                (metar_decoded.get("gust_kt", 0) - metar_decoded.get("wind_speed_kt", 0))
+                / profile["thresholds"]["max_gust_spread_kt"]
+                if metar_decoded.get("gust_kt") and metar_decoded.get("wind_speed_kt")
+                else 0
+            ),
+            "da_ratio": (
+                (da.get("da_ft") or 0) / profile["thresholds"]["max_da_ft"]
+                if profile["thresholds"]["max_da_ft"]
+                else 0
+            ),
+            "convective": 1.0 if taf_convective else 0.0,
+            "night": 1.0 if night else 0.0,
+            "rapid_change": (
+                1.0 if abs(changes["details"].get("wind_speed_delta_kt", 0)) >= 10 else 0.0
+            ),
+        }
+    )
+    stability = stability_score(
+        {
+            "wind_shift": min((stats["wind_shift"]["last_deg"] or 0) / 60.0, 1.0),
+            "gust_spread": min(
+                (
+                    (metar_decoded.get("gust_kt", 0) - metar_decoded.get("wind_speed_kt", 0))
+                    / profile["thresholds"]["max_gust_spread_kt"]
+                    if metar_decoded.get("gust_kt") and metar_decoded.get("wind_speed_kt")
+                    else 0
+                ),
+                1.0,
+            ),
+            "metar_taf_mismatch": (
+                1.0
+                if (
+                    taf_convective
+                    and not any("TS" in code for code in metar_decoded.get("weather_codes", []))
+                )
+                else 0.0
+            ),
+            "qnh_fall": 1.0 if trend_fast else 0.0,
+            "speci": 0.0,
+        }
+    )
 
-def build_airfields(mode: str, record_history: bool = True) -> tuple[list[dict], dict, list[dict]]:
+    computed_airfield = {
+        **airfield,
+        "night_ops": {
+            "night_ops_allowed": airfield["night_ops_allowed"],
+            "lighting": airfield["lighting"],
+            "ppr_required": airfield["ppr_required"],
+            "ops_hours": airfield["ops_hours"],
+            "notes": airfield["notes"],
+        },
+        "night_ready": night_ready(airfield),
+        "metar": metar_decoded
+        | {"source": metar_source, "source_detail": _source_detail(metar_source)},
+        "taf": taf_decoded | {"source": taf_source, "source_detail": _source_detail(taf_source)},
+        "notams": notam_entries,
+        "computed": {
+            "wind_components_per_runway": components,
+            "runway_surface_conditions": runway_surface_conditions,
+            "density_altitude": da,
+            "qnh_trend": qnh_trend(columns),
+            "flags": all_flags,
+            "flag_explanations": flag_explanations,
+            "severity": severity,
+            "changes": changes,
+            "qnh_change_rate_hpa_per_hr": qnh_rate(columns),
+            "taf_time_to_expiry": taf_expiry,
+            "taf_outlook": taf_outlook,
+            "go_no_go": go_no_go,
+            "sun": {
+                "sunrise": sun.get("sunrise"),
+                "sunset": sun.get("sunset"),
+                "civil_twilight_start": twilight.get("sunrise"),
+                "civil_twilight_end": twilight.get("sunset"),
+                "is_night": night,
+            },
+            "workload": workload,
+            "stability": stability,
+            "trends": sparkline_series(columns, trend_window),
+            "trend_stats": stats,
+        },
+    }
+    # Hash what is published rather than the raw inputs: night, TAF expiry and outlook and
+    # GO/NO-GO move with the clock, so unchanged METAR/TAF text does not mean an unchanged
+    # page. The live fetch stamps change on every build and are left out.
+    computed_airfield["input_hash"] = digest(
+        {
+            **computed_airfield,
+            "metar": {
+                key: value
+                for key, value in computed_airfield["metar"].items()
+                if key not in LIVE_FETCH_KEYS
+            },
+            "profile": profile,
+            "profiles": profiles,
+            "aircraft": aircraft,
+            "mode": mode,
+        }
+    )
+    return computed_airfield, history
+
+
+@profiling.timed("airfields")
+def build_airfields(
+    mode: str,
+    record_history: bool = True,
+    jobs: int = 1,
+    history_retention: int = DEFAULT_RETENTION,
+    trend_window: int = TREND_WINDOW,
+    idents: Iterable[str] | None = None,
+) -> tuple[list[dict], dict, list[dict]]:
+    """Fetch and compute every aerodrome in the packs, or only those in ``idents``."""
     profiles = load_profiles()
     default_profile = next((p for p in profiles if p["licence_tier"] == "PPL"), profiles[0])
 
     aerodromes, _ = load_packs()
+    if idents is not None:
+        wanted = set(idents)
+        aerodromes = [airfield for airfield in aerodromes if airfield["ident"] in wanted]
     sample_adapter, live_adapter = _build_metar_taf_adapter(mode)
     notam_adapter = SampleNotamAdapter(SAMPLES_DIR / "notam")
 
-    airfields = []
+    idents = [airfield["ident"] for airfield in aerodromes]
+    with profiling.phase("fetch"):
+        metars = _fetch_all_with_fallback(idents, live_adapter, sample_adapter, "metar")
+        tafs = _fetch_all_with_fallback(idents, live_adapter, sample_adapter, "taf")
+    if live_adapter and live_adapter.cache:
+        for key, amount in live_adapter.cache.stats.items():
+            profiling.count(f"http_cache.{key}", amount)
+
     now = utc_now()
-    for airfield in aerodromes:
-        ident = airfield["ident"]
-        metar_raw, metar_source = _fetch_with_fallback(ident, live_adapter, sample_adapter, "metar")
-        taf_raw, taf_source = _fetch_with_fallback(ident, live_adapter, sample_adapter, "taf")
+    notams = []
+    for ident in idents:
         try:
-            notam_entries = decode_notam(notam_adapter.fetch(ident).lines)
+            notams.append(decode_notam(notam_adapter.fetch(ident).lines))
         except FileNotFoundError:
-            notam_entries = []
-        notam_lines = [entry["text"] for entry in notam_entries]
-        metar_decoded = decode_metar(metar_raw.raw)
-        if mode == "live_beta":
-            fetch_time = now.isoformat().replace("+00:00", "Z")
-            obs_time = _parse_iso(metar_decoded.get("observed_time_utc"))
-            latency = round((now - obs_time).total_seconds() / 60.0, 1) if obs_time else None
-            metar_decoded["fetch_time_utc"] = fetch_time
-            metar_decoded["latency_min"] = latency
-        taf_decoded = decode_taf(taf_raw.raw)
+            notams.append([])
+    with profiling.phase("history"), open_history_store(HISTORY_DIR, history_retention) as store:
+        histories = [store.tail(ident, trend_window) for ident in idents]
+
+    compute = partial(
+        profiling.run_profiled,
+        compute_airfield,
+        profile=default_profile,
+        profiles=profiles,
+        aircraft=load_aircraft(),
+        now=now,
+        mode=mode,
+        trend_window=trend_window,
+    )
+    inputs = (
+        aerodromes,
+        [metars[ident] for ident in idents],
+        [tafs[ident] for ident in idents],
+        notams,
+        histories,
+    )
+    with profiling.phase("compute"):
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                profiled = list(pool.map(compute, *inputs))
+        else:
+            profiled = list(map(compute, *inputs))
+
+    # Worker phases (decode, adapters, ...) are merged back; in parallel builds they are
+    # summed across processes, so they can exceed the wall time of "compute".
+    profiler = profiling.active()
+    results = []
+    for ident, (result, seconds, stats) in zip(idents, profiled):
+        profiler.merge(stats)
+        profiler.record_item("airfields", ident, seconds)
+        results.append(result)
+
+    airfields = [airfield for airfield, _ in results]
+    if record_history:
+        with profiling.phase("history"), open_history_store(
+            HISTORY_DIR, history_retention
+        ) as store:
+            for airfield, history in results:
+                store.append(airfield["ident"], history[-1])
 
-        components = []
-        runway_surface_conditions = []
-        for runway in airfield["runways"]:
-            comp = wind_components(
-                metar_decoded["wind_dir_deg"],
-                metar_decoded["wind_speed_kt"],
-                runway["magnetic_heading_deg"],
-            )
-            components.append({"runway": runway["designator"], **comp})
-            runway_surface_conditions.append(
-                {
-                    "runway": runway["designator"],
-                    "surface": runway.get("surface", "--"),
-                    "condition": _runway_condition_from_notams(runway["designator"], notam_lines),
-                }
-            )
+    return airfields, default_profile, profiles
 
-        crosswind = max((c["crosswind_kt"] or 0 for c in components), default=0)
-        da = density_altitude(
-            airfield["elevation_m"],
-            metar_decoded["qnh_hpa"],
-            metar_decoded["temp_c"],
-        )
-        ceiling_est = metar_decoded.get("ceiling_ft") or cloud_base_ft(
-            metar_decoded.get("temp_c"),
-            metar_decoded.get("dewpoint_c"),
-        )
 
-        history = load_history(ident)
-        previous = history[-1] if history else None
-        new_history_entry = {
-            "timestamp": metar_decoded["observed_time_utc"],
-            "wind_speed_kt": metar_decoded["wind_speed_kt"],
-            "wind_dir_deg": metar_decoded["wind_dir_deg"],
-            "qnh_hpa": metar_decoded["qnh_hpa"],
-            "temp_c": metar_decoded["temp_c"],
-            "dewpoint_c": metar_decoded["dewpoint_c"],
-            "visibility_m": metar_decoded["visibility_m"],
-            "ceiling_ft_est": ceiling_est,
+def route_path_idents(route: dict) -> list[str]:
+    return [route["dep"], *route.get("via", []), route["dest"]]
+
+
+def en_route_aerodromes(route: dict, index: SpatialIndex) -> list[dict]:
+    """Aerodromes within the route's ``corridor_nm`` of its track, in order along it."""
+    path_idents = [ident for ident in route_path_idents(route) if ident in index.points]
+    hits = index.corridor(
+        [index.points[ident] for ident in path_idents],
+        route.get("corridor_nm") or 0,
+        exclude=path_idents,
+    )
+    return [
+        {
+            "ident": hit["key"],
+            "leg": hit["leg"],
+            "offtrack_nm": round(hit["offtrack_nm"], 1),
+            "along_nm": round(hit["along_nm"], 1),
         }
-        history = append_history_entry(history, new_history_entry)
-        if record_history:
-            save_history(ident, history)
-
-        changes = detect_changes(previous, history[-1])
-        qnh_rate = None
-        hours = hours_between(
-            previous.get("timestamp") if previous else None,
-            history[-1]["timestamp"],
-        )
-        if hours and previous and previous.get("qnh_hpa") and history[-1].get("qnh_hpa"):
-            qnh_rate = round((history[-1]["qnh_hpa"] - previous["qnh_hpa"]) / hours, 2)
+        for hit in hits
+    ]
 
-        taf_valid_to = parse_taf_valid_to(taf_decoded["summary"]["valid_to"], now)
-        taf_expiry = time_to_expiry(taf_valid_to, now)
 
-        sun = sun_times(now.date(), airfield["latitude_deg"], airfield["longitude_deg"])
-        twilight = civil_twilight(now.date(), airfield["latitude_deg"], airfield["longitude_deg"])
-        night = is_night(now, twilight.get("sunset"), twilight.get("sunrise"))
+def nearest_alternates(route: dict, index: SpatialIndex, k: int = NEAREST_ALTERNATES) -> list[dict]:
+    """The ``k`` aerodromes nearest the destination, other than those on the route itself."""
+    if route["dest"] not in index.points:
+        return []
+    nearest = index.nearest(*index.points[route["dest"]], k, exclude=route_path_idents(route))
+    return [{"ident": ident, "distance_nm": round(distance, 1)} for distance, ident in nearest]
 
-        trend_fast = qnh_falling_fast(
-            history,
-            default_profile["thresholds"]["qnh_fall_fast_hpa_per_hr"],
-        )
-        flags, flag_explanations = compute_flags(
-            metar_decoded,
-            da,
-            components,
-            default_profile,
-            trend_fast,
-        )
-        runway_short = any(
-            runway["length_m"] < default_profile["thresholds"]["short_runway_m"]
-            for runway in airfield["runways"]
-        )
-        taf_deteriorating = "TS" in taf_decoded["raw"] or "TEMPO" in taf_decoded["raw"]
-        compounds = compound_flags(flags, runway_short, night, taf_deteriorating, trend_fast)
-        for compound in compounds:
-            if compound == "HIGH_DA_SHORT_RWY":
-                flag_explanations[compound] = {
-                    "density_altitude_ft": da.get("da_ft"),
-                    "short_runway_threshold_m": default_profile["thresholds"]["short_runway_m"],
-                    "note": "High DA combined with short runway increases performance risk.",
-                }
-            elif compound == "CROSSWIND_HIGH_GUSTY":
-                flag_explanations[compound] = {
-                    "crosswind_kt": crosswind,
-                    "gust_kt": metar_decoded.get("gust_kt"),
-                    "note": "Crosswind with gusts increases workload.",
-                }
-            elif compound == "LOW_CEILING_NIGHT":
-                flag_explanations[compound] = {
-                    "ceiling_ft": metar_decoded.get("ceiling_ft"),
-                    "night": night,
-                    "note": "Low ceiling during night conditions.",
-                }
-            elif compound == "RAPID_QNH_FALL_TAF_DETERIORATING":
-                flag_explanations[compound] = {
-                    "qnh_change_rate_hpa_per_hr": qnh_rate,
-                    "taf_hint": taf_decoded.get("raw"),
-                    "note": "Rapid QNH fall with deteriorating TAF.",
-                }
-            else:
-                flag_explanations[compound] = {
-                    "note": "Compound flag based on multiple conditions."
-                }
-        all_flags = flags + compounds
-        severity = flag_severity(all_flags, default_profile.get("severity", {}))
 
-        workload = workload_score(
-            {
-                "crosswind_ratio": crosswind
-                / default_profile["thresholds"]["max_crosswind_kt"]
-                if default_profile["thresholds"]["max_crosswind_kt"]
-                else 0,
-                "gust_ratio": (
-                    metar_decoded.get("gust_kt", 0)
-                    - metar_decoded.get("wind_speed_kt", 0)
-                )
-                / default_profile["thresholds"]["max_gust_spread_kt"]
-                if metar_decoded.get("gust_kt") and metar_decoded.get("wind_speed_kt")
-                else 0,
-                "da_ratio": (da.get("da_ft") or 0)
-                / default_profile["thresholds"]["max_da_ft"]
-                if default_profile["thresholds"]["max_da_ft"]
-                else 0,
-                "convective": 1.0 if "TS" in taf_decoded["raw"] else 0.0,
-                "night": 1.0 if night else 0.0,
-                "rapid_change": 1.0
-                if abs(changes["details"].get("wind_speed_delta_kt", 0)) >= 10
-                else 0.0,
-            }
-        )
-        stability = stability_score(
-            {
-                "wind_shift": min(abs(changes["details"].get("wind_dir_shift_deg", 0)) / 60.0, 1.0),
-                "gust_spread": min(
-                    (
-                        metar_decoded.get("gust_kt", 0)
-                        - metar_decoded.get("wind_speed_kt", 0)
-                    )
-                    / default_profile["thresholds"]["max_gust_spread_kt"]
-                    if metar_decoded.get("gust_kt") and metar_decoded.get("wind_speed_kt")
-                    else 0,
-                    1.0,
-                ),
-                "metar_taf_mismatch": 1.0
-                if (
-                    "TS" in taf_decoded["raw"]
-                    and "TS" not in metar_decoded.get("weather_codes", [])
-                )
-                else 0.0,
-                "qnh_fall": 1.0 if trend_fast else 0.0,
-                "speci": 0.0,
-            }
-        )
+def route_dependencies(route: dict, index: SpatialIndex | None = None) -> list[str]:
+    """Idents a route pack is computed from.
 
-        airfields.append(
-            {
-                **airfield,
-                "night_ops": {
-                    "night_ops_allowed": airfield["night_ops_allowed"],
-                    "lighting": airfield["lighting"],
-                    "ppr_required": airfield["ppr_required"],
-                    "ops_hours": airfield["ops_hours"],
-                    "notes": airfield["notes"],
-                },
-                "night_ready": night_ready(airfield),
-                "metar": metar_decoded
-                | {"source": metar_source, "source_detail": _source_detail(metar_source)},
-                "taf": taf_decoded
-                | {"source": taf_source, "source_detail": _source_detail(taf_source)},
-                "notams": notam_entries,
-                "computed": {
-                    "wind_components_per_runway": components,
-                    "runway_surface_conditions": runway_surface_conditions,
-                    "density_altitude": da,
-                    "qnh_trend": qnh_trend(history),
-                    "flags": all_flags,
-                    "flag_explanations": flag_explanations,
-                    "severity": severity,
-                    "changes": changes,
-                    "qnh_change_rate_hpa_per_hr": qnh_rate,
-                    "taf_time_to_expiry": taf_expiry,
-                    "sun": {
-                        "sunrise": sun.get("sunrise"),
-                        "sunset": sun.get("sunset"),
-                        "civil_twilight_start": twilight.get("sunrise"),
-                        "civil_twilight_end": twilight.get("sunset"),
-                        "is_night": night,
-                    },
-                    "workload": workload,
-                    "stability": stability,
-                    "trends": {
-                        "wind_speed": [item.get("wind_speed_kt") for item in history][-20:],
-                        "qnh": [item.get("qnh_hpa") for item in history][-20:],
-                        "temp": [item.get("temp_c") for item in history][-20:],
-                        "dewpoint": [item.get("dewpoint_c") for item in history][-20:],
-                        "visibility": [item.get("visibility_m") for item in history][-20:],
-                    },
-                },
-            }
-        )
+    Departure, via points, destination and alternates, plus the en-route aerodromes and
+    nearest alternates found through ``index`` when one is given.
+    """
+    idents = [*route_path_idents(route), *route.get("alternates", [])]
+    if index is not None:
+        idents += [item["ident"] for item in en_route_aerodromes(route, index)]
+        idents += [item["ident"] for item in nearest_alternates(route, index)]
+    return list(dict.fromkeys(idents))
 
-    return airfields, default_profile, profiles
+
+def route_aircraft(route: dict, aircraft: list[dict]) -> list[dict]:
+    """The route's ``aircraft_types`` that aircraft.yaml knows, in route order."""
+    by_type = {item["type"]: item for item in aircraft}
+    return [by_type[name] for name in route.get("aircraft_types", []) if name in by_type]
+
+
+def leg_paths(waypoints: list[dict]) -> list[list[tuple[float, float]]]:
+    """Each leg as great-circle points at most ``LEG_SAMPLE_SPACING_NM`` apart."""
+    coordinates = [(item["latitude_deg"], item["longitude_deg"]) for item in waypoints]
+    return [
+        path_points(start, end, LEG_SAMPLE_SPACING_NM)
+        for start, end in zip(coordinates, coordinates[1:])
+    ]
+
+
+def sample_route_winds(
+    grid: WindsGrid, legs: list[dict], paths: list[list[tuple[float, float]]], ends: list[dict]
+) -> list[dict]:
+    """Winds/temps along the route from ``grid``.
+
+    Each leg gets the table averaged along its own path as ``winds``; the return value is
+    the table averaged over the whole route, or over the known ``ends`` without legs.
+    """
+    route_points = (
+        paths[0][:1] if paths else [(item["latitude_deg"], item["longitude_deg"]) for item in ends]
+    )
+    for leg, path in zip(legs, paths):
+        leg["winds"] = grid.column(path)
+        route_points += path[1:]
+    return grid.column(route_points)
+
+
+def planning_aircraft(route: dict, aircraft: list[dict]) -> dict | None:
+    """The first of the route's ``aircraft_types`` known to aircraft.yaml, if any."""
+    return next(iter(route_aircraft(route, aircraft)), None)
+
+
+def cruise_optimum(
+    legs: list[dict], route: dict, winds: list[dict], hazards: list[dict], aircraft: dict | None
+) -> dict:
+    """Minimum-time and minimum-risk cruise levels for one aircraft on a route."""
+    aircraft = aircraft or {}
+    tas_kt = aircraft.get("cruise_tas_kt") or DEFAULT_TAS_KT
+    ceiling_ft = aircraft.get("service_ceiling_ft")
+    candidates = candidate_levels(route["cruise_levels_ft"], ceiling_ft)
+    return {
+        "aircraft": aircraft.get("type"),
+        "tas_kt": tas_kt,
+        "ceiling_ft": ceiling_ft,
+        **optimise_cruise_level(legs, winds, candidates, tas_kt, hazards),
+    }
+
+
+def _iso(moment: dt.datetime) -> str:
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def taf_at_eta_entry(airfield: dict, eta_minutes: float | None, departure: dt.datetime) -> dict:
+    """The TAF at an airfield for the arrival time, plus the worst case within an hour of it."""
+    if eta_minutes is None:
+        return {"ident": airfield["ident"], "eta": None, "in_validity": False}
+    eta = departure + dt.timedelta(minutes=eta_minutes)
+    timeline = TafTimeline.from_decoded(airfield["taf"], departure)
+    interval = timeline.conditions_at(eta)
+    window = timeline.worst_in(eta - ARRIVAL_WINDOW, eta + ARRIVAL_WINDOW)
+    return {
+        "ident": airfield["ident"],
+        "eta": _iso(eta),
+        "eta_minutes": eta_minutes,
+        "in_validity": interval is not None,
+        "prevailing": interval["prevailing"] if interval else None,
+        "worst_within_1h": window,
+    }
+
+
+def _with_flags(entry: dict, airfield: dict | None) -> dict:
+    computed = airfield["computed"] if airfield else {}
+    return {**entry, "flags": computed.get("flags"), "severity": computed.get("severity")}
 
 
-def build_routes(airfields: list[dict], profile: dict) -> list[dict]:
-    _, routes = load_packs()
+@profiling.timed("routes")
+def build_routes(
+    airfields: list[dict], profile: dict, route_ids: Iterable[str] | None = None
+) -> list[dict]:
+    """Build every route pack, or only those in ``route_ids``, from computed airfields."""
+    aerodromes, routes = load_packs()
+    index = SpatialIndex.from_aerodromes(aerodromes)
+    aircraft = load_aircraft()
+    if route_ids is not None:
+        wanted = set(route_ids)
+        routes = [route for route in routes if route["route_id"] in wanted]
     airfield_map = {airfield["ident"]: airfield for airfield in airfields}
 
     notam_adapter = SampleNotamAdapter(SAMPLES_DIR / "notam")
     sigmet_adapter = SampleSigmetAdapter(SAMPLES_DIR / "sigmet" / "sigmet.txt")
-    winds_adapter = SampleWindsTempsAdapter(SAMPLES_DIR / "winds_temps" / "winds_temps.json")
+    winds_adapter = SampleWindsGridAdapter(SAMPLES_DIR / "winds_temps" / "winds_grid.bin")
 
     now = utc_now()
+    # Plans depart at the top of the current hour so rebuilds within it are identical.
+    departure = now.replace(minute=0, second=0, microsecond=0)
     sigmet_lines = sigmet_adapter.fetch()
     sigmet_decoded = decode_sigmet(sigmet_lines)
-    winds = winds_adapter.fetch()
-
+    sigmet_index = SigmetIndex(sigmet_decoded, reference=now)
     built_routes = []
-    for route in routes:
-        dep = airfield_map.get(route["dep"])
-        dest = airfield_map.get(route["dest"])
-        via_idents = [ident for ident in route.get("via", []) if ident in airfield_map]
-        via_airfields = [airfield_map[ident] for ident in via_idents]
-        alternates = [
-            airfield_map[ident]
-            for ident in route.get("alternates", [])
-            if ident in airfield_map
-        ]
-
-        track = None
-        track_from = dep
-        track_to = via_airfields[0] if via_airfields else dest
-        if track_from and track_to:
-            track = bearing_deg(
-                track_from["latitude_deg"],
-                track_from["longitude_deg"],
-                track_to["latitude_deg"],
-                track_to["longitude_deg"],
+    with winds_adapter.fetch() as grid:
+        for route in routes:
+            dep = airfield_map.get(route["dep"])
+            dest = airfield_map.get(route["dest"])
+            via_idents = [ident for ident in route.get("via", []) if ident in airfield_map]
+            via_airfields = [airfield_map[ident] for ident in via_idents]
+            alternates = [
+                airfield_map[ident]
+                for ident in route.get("alternates", [])
+                if ident in airfield_map
+            ]
+
+            waypoints = [dep, *via_airfields, dest] if dep and dest else []
+            legs = route_legs(waypoints)
+            paths = leg_paths(waypoints)
+            winds = sample_route_winds(grid, legs, paths, [item for item in (dep, dest) if item])
+            freezing_level = freezing_level_ft(winds)
+            if freezing_level is not None:
+                freezing_level = int(round(freezing_level, -2))
+            track = legs[0]["track_deg"] if legs else None
+            planning = planning_aircraft(route, aircraft)
+            tas_kt = (planning or {}).get("cruise_tas_kt") or DEFAULT_TAS_KT
+            # Levels between those in the winds/temps table are interpolated, not dropped.
+            cruise_levels = [
+                level
+                for level in (
+                    interpolate_level(winds, level_ft) for level_ft in route["cruise_levels_ft"]
+                )
+                if level is not None
+            ]
+            plans = level_plans(legs, cruise_levels, tas_kt) if legs else []
+
+            wind_levels = []
+            for level, plan in itertools.zip_longest(cruise_levels, plans):
+                wind_levels.append(
+                    {
+                        **level,
+                        "headwind_kt": plan["mean_headwind_kt"] if plan else None,
+                        "ground_speed_kt": plan["mean_ground_speed_kt"] if plan else None,
+                    }
+                )
+            fastest = min(
+                (plan for plan in plans if plan["total_minutes"] is not None),
+                key=lambda plan: plan["total_minutes"],
+                default=None,
+            )
+            taf_at_eta = (
+                [
+                    taf_at_eta_entry(airfield, minutes, departure)
+                    for airfield, minutes in zip(waypoints[1:], fastest["eta_minutes"])
+                ]
+                if fastest
+                else []
             )
 
-        wind_levels = []
-        for level in winds["levels"]:
-            if level["level_ft"] not in route["cruise_levels_ft"]:
-                continue
-            if track is None:
-                wind_levels.append({**level, "headwind_kt": None, "ground_speed_kt": None})
-                continue
-            headwind = headwind_component(level["wind_dir_deg"], level["wind_speed_kt"], track)
-            gs = ground_speed_estimate(120, level["wind_dir_deg"], level["wind_speed_kt"], track)
-            wind_levels.append({**level, "headwind_kt": headwind, "ground_speed_kt": gs})
-
-        freezing_level = None
-        for level in winds["levels"]:
-            if level["temp_c"] <= 0:
-                freezing_level = level["level_ft"]
-                break
-
-        convective_risk = any("TS" in line for line in sigmet_lines)
-        turbulence_risk = any("TURB" in line for line in sigmet_lines)
-        icing_possible = any(0 >= level["temp_c"] >= -20 for level in wind_levels)
-
-        flags = []
-        if convective_risk:
-            flags.append("CONVECTIVE_RISK_HIGH")
-        if turbulence_risk:
-            flags.append("TURB_POSSIBLE (TRAINING)")
-        if icing_possible:
-            flags.append("ICING_POSSIBLE (TRAINING)")
-
-        severity = flag_severity(flags, profile.get("severity", {}))
-
-        route_idents = [route["dep"], *via_idents, route["dest"]]
-        notams = {
-            ident: decode_notam(notam_adapter.fetch(ident).lines)
-            for ident in dict.fromkeys(route_idents)
-        }
+            arrival = departure + dt.timedelta(minutes=fastest["total_minutes"] if fastest else 0)
+            # Only SIGMETs that meet a leg, overlap the route's levels and are in force en route.
+            on_route = sigmet_index.crossing(
+                paths,
+                departure,
+                arrival,
+                min(route["cruise_levels_ft"], default=None),
+                max(route["cruise_levels_ft"], default=None),
+            )
+            hazards = [item for item in on_route if item["base_ft"] is not None]
+
+            optimum = (
+                [
+                    cruise_optimum(legs, route, winds, hazards, item)
+                    for item in route_aircraft(route, aircraft) or [None]
+                ]
+                if legs
+                else []
+            )
 
-        route_workload = workload_score(
-            {
-                "crosswind_ratio": 0.0,
-                "gust_ratio": 0.0,
-                "da_ratio": 0.0,
-                "convective": 1.0 if convective_risk else 0.0,
-                "night": 1.0 if (dep and dep["computed"]["sun"]["is_night"]) else 0.0,
-                "rapid_change": 1.0 if turbulence_risk else 0.0,
-            }
-        )
-        route_stability = stability_score(
-            {
-                "wind_shift": 0.0,
-                "gust_spread": 0.0,
-                "metar_taf_mismatch": 1.0 if convective_risk else 0.0,
-                "qnh_fall": 0.0,
-                "speci": 0.0,
+            convective_risk = any(item["phenomenon"] == "TS" for item in on_route)
+            turbulence_risk = any(item["phenomenon"] == "TURB" for item in on_route)
+            icing_possible = any(0 >= level["temp_c"] >= -20 for level in wind_levels)
+
+            flags = []
+            if convective_risk:
+                flags.append("CONVECTIVE_RISK_HIGH")
+            if turbulence_risk:
+                flags.append("TURB_POSSIBLE (TRAINING)")
+            if icing_possible:
+                flags.append("ICING_POSSIBLE (TRAINING)")
+
+            severity = flag_severity(flags, profile.get("severity", {}))
+
+            route_idents = [route["dep"], *via_idents, route["dest"]]
+            notams = {
+                ident: decode_notam(notam_adapter.fetch(ident).lines)
+                for ident in dict.fromkeys(route_idents)
             }
-        )
 
-        def _taf_expiry(item: dict | None) -> dict:
-            if not item:
-                return {"hours": None, "urgency": "unknown"}
-            taf_valid_to = parse_taf_valid_to(item["taf"]["summary"]["valid_to"], now)
-            return time_to_expiry(taf_valid_to, now)
+            route_workload = workload_score(
+                {
+                    "crosswind_ratio": 0.0,
+                    "gust_ratio": 0.0,
+                    "da_ratio": 0.0,
+                    "convective": 1.0 if convective_risk else 0.0,
+                    "night": 1.0 if (dep and dep["computed"]["sun"]["is_night"]) else 0.0,
+                    "rapid_change": 1.0 if turbulence_risk else 0.0,
+                }
+            )
+            route_stability = stability_score(
+                {
+                    "wind_shift": 0.0,
+                    "gust_spread": 0.0,
+                    "metar_taf_mismatch": 1.0 if convective_risk else 0.0,
+                    "qnh_fall": 0.0,
+                    "speci": 0.0,
+                }
+            )
 
-        built_routes.append(
-            {
+            def _taf_expiry(item: dict | None) -> dict:
+                if not item:
+                    return {"hours": None, "urgency": "unknown"}
+                return time_to_expiry(TafTimeline.from_decoded(item["taf"], now).valid_to, now)
+
+            route_airfields = [item for item in [dep, *via_airfields, dest, *alternates] if item]
+            en_route = [
+                _with_flags(item, airfield_map.get(item["ident"]))
+                for item in en_route_aerodromes(route, index)
+            ]
+            suggested = [
+                _with_flags(item, airfield_map.get(item["ident"]))
+                for item in nearest_alternates(route, index)
+            ]
+            referenced = [
+                airfield_map[item["ident"]]
+                for item in [*en_route, *suggested]
+                if item["ident"] in airfield_map
+            ]
+            built = {
                 **route,
-                "airfields": [item for item in [dep, *via_airfields, dest, *alternates] if item],
+                "airfields": route_airfields,
+                "en_route": en_route,
+                "nearest_alternates": suggested,
                 "track_deg": track,
                 "upper_winds": wind_levels,
+                "plan": {
+                    "aircraft": planning["type"] if planning else None,
+                    "tas_kt": tas_kt,
+                    "departure": _iso(departure),
+                    "legs": [
+                        {
+                            "from": leg["from"],
+                            "to": leg["to"],
+                            "distance_nm": round(leg["distance_nm"], 1),
+                            "track_deg": round(leg["track_deg"], 1),
+                        }
+                        for leg in legs
+                    ],
+                    "levels": plans,
+                    "fastest_level_ft": fastest["level_ft"] if fastest else None,
+                },
+                "taf_at_eta": taf_at_eta,
+                "cruise_optimum": optimum,
                 "freezing_level_ft": freezing_level,
                 "sigmet_lines": [item["raw"] for item in sigmet_decoded],
-                "sigmet_time_to_expiry": time_to_expiry(None, now),
+                "sigmets_on_route": [
+                    {
+                        "raw": item["raw"],
+                        "phenomenon": item["phenomenon"],
+                        "base_ft": item["base_ft"],
+                        "top_ft": item["top_ft"],
+                        "area": item["area"]["type"],
+                        "legs": item["legs"],
+                    }
+                    for item in on_route
+                ],
+                "sigmet_time_to_expiry": time_to_expiry(
+                    min(
+                        (
+                            sigmet_index.valid_to(item["index"])
+                            for item in on_route
+                            if sigmet_index.valid_to(item["index"])
+                        ),
+                        default=None,
+                    ),
+                    now,
+                ),
                 "notams": {
-                    ident: [entry["text"] for entry in entries]
-                    for ident, entries in notams.items()
+                    ident: [entry["text"] for entry in entries] for ident, entries in notams.items()
                 },
                 "taf_time_to_expiry": {
                     "dep": _taf_expiry(dep),
@@ -731,33 +1027,59 @@ def build_routes(airfields: list[dict], profile: dict) -> list[dict]:
                     "stability": route_stability,
                 },
             }
-        )
+            # The route payload, with each airfield it draws on standing in as its own hash.
+            built["input_hash"] = digest(
+                {
+                    **built,
+                    "airfields": [item["input_hash"] for item in [*route_airfields, *referenced]],
+                }
+            )
+            built_routes.append(built)
 
     return built_routes
 
 
 def copy_sigwx(sigwx: dict) -> dict:
+    """Publish the SIGWX charts; returns their fingerprinted names for the route pages."""
     assets_dir = SITE_DIR / "assets"
-    assets_dir.mkdir(parents=True, exist_ok=True)
-    low_dest = assets_dir / sigwx["low"].name
-    high_dest = assets_dir / sigwx["high"].name
-    low_dest.write_text(sigwx["low"].read_text(encoding="utf-8"), encoding="utf-8")
-    high_dest.write_text(sigwx["high"].read_text(encoding="utf-8"), encoding="utf-8")
-    return {"low": sigwx["low"].name, "high": sigwx["high"].name}
+    return {
+        "low": publish_file(assets_dir, sigwx["low"]),
+        "high": publish_file(assets_dir, sigwx["high"]),
+    }
 
 
-def write_assets() -> None:
+def write_assets() -> dict[str, str]:
     assets_dir = SITE_DIR / "assets"
-    assets_dir.mkdir(parents=True, exist_ok=True)
-    (assets_dir / "style.css").write_text(_style_css(), encoding="utf-8")
-    (assets_dir / "app.js").write_text(_app_js(), encoding="utf-8")
+    return {
+        "style.css": publish_bytes(assets_dir, "style.css", _style_css().encode("utf-8")),
+        "app.js": publish_bytes(assets_dir, "app.js", _app_js().encode("utf-8")),
+    }
+
+
+def publish_assets() -> tuple[dict[str, str], dict]:
+    """Write the fingerprinted assets and ``assets/manifest.json``; drop superseded copies.
+
+    Returns the manifest (asset name → fingerprinted name), which every page rendered
+    afterwards links through, and the SIGWX names for the route pages.
+    """
+    sigwx = SampleSigwxAdapter(SAMPLES_DIR / "sigwx").fetch()
+    sigwx_paths = copy_sigwx(sigwx)
+    assets = {
+        **write_assets(),
+        sigwx["low"].name: sigwx_paths["low"],
+        sigwx["high"].name: sigwx_paths["high"],
+    }
+    write_json(SITE_DIR / "assets" / ASSET_MANIFEST, assets)
+    prune_stale(SITE_DIR / "assets", assets)
+    use_assets(assets)
+    return assets, sigwx_paths
 
 
 def build_tools_pages(mode_info: dict) -> None:
     tools_dir = SITE_DIR / "tools"
     tools_dir.mkdir(parents=True, exist_ok=True)
 
-    (tools_dir / "index.html").write_text(render_tools_index(mode_info), encoding="utf-8")
+    write_page(tools_dir / "index.html", render_tools_index(mode_info))
 
     isa_content = """
     <label>Altitude (ft) <input id="isa-alt" type="number" value="5000" /></label>
@@ -829,95 +1151,210 @@ def build_tools_pages(mode_info: dict) -> None:
     <div id="scenario-output" class="result"></div>
     """
 
-    (tools_dir / "isa.html").write_text(
-        render_tool_page("ISA Tool", isa_content, mode_info),
-        encoding="utf-8",
-    )
-    (tools_dir / "altimetry.html").write_text(
+    write_page(tools_dir / "isa.html", render_tool_page("ISA Tool", isa_content, mode_info))
+    write_page(
+        tools_dir / "altimetry.html",
         render_tool_page("Altimetry Tool", altimetry_content, mode_info),
-        encoding="utf-8",
     )
-    (tools_dir / "density-altitude.html").write_text(
+    write_page(
+        tools_dir / "density-altitude.html",
         render_tool_page("Density Altitude Tool", da_content, mode_info),
-        encoding="utf-8",
-    )
-    (tools_dir / "tas.html").write_text(
-        render_tool_page("IAS → TAS Tool", tas_content, mode_info),
-        encoding="utf-8",
     )
-    (tools_dir / "lapse-rate.html").write_text(
+    write_page(tools_dir / "tas.html", render_tool_page("IAS → TAS Tool", tas_content, mode_info))
+    write_page(
+        tools_dir / "lapse-rate.html",
         render_tool_page("Lapse Rate Tool", lapse_rate_content, mode_info),
-        encoding="utf-8",
     )
-    (tools_dir / "hypoxia.html").write_text(
+    write_page(
+        tools_dir / "hypoxia.html",
         render_tool_page("Gas laws & Hypoxia", hypoxia_content, mode_info),
-        encoding="utf-8",
     )
-    (tools_dir / "pressurisation.html").write_text(
+    write_page(
+        tools_dir / "pressurisation.html",
         render_tool_page("Pressurisation Simulator", press_content, mode_info),
-        encoding="utf-8",
     )
-    (tools_dir / "aircraft.html").write_text(
+    write_page(
+        tools_dir / "aircraft.html",
         render_tool_page("Training Aircraft Reference", aircraft_content, mode_info),
-        encoding="utf-8",
     )
-    (tools_dir / "scenario.html").write_text(
+    write_page(
+        tools_dir / "scenario.html",
         render_tool_page("Scenario Builder", scenario_content, mode_info),
-        encoding="utf-8",
     )
 
 
-def build_site(mode: str = "sample") -> None:
-    validate_all()
+def api_index(manifest: dict, mode_info: dict, default_profile: str) -> dict:
+    return {
+        "version": 2,
+        "mode": mode_info,
+        "default_profile": default_profile,
+        "airfields": manifest["api"]["airfields"],
+        "routes": manifest["api"]["routes"],
+    }
+
+
+def api_route(route: dict) -> dict:
+    """Route payload for the v2 API: airfields are referenced by ident, not embedded."""
+    return {**route, "airfields": [airfield["ident"] for airfield in route["airfields"]]}
+
+
+def build_site(
+    mode: str = "sample",
+    full: bool = False,
+    jobs: int = 1,
+    history_retention: int = DEFAULT_RETENTION,
+    trend_window: int = TREND_WINDOW,
+    legacy_latest: bool = False,
+    precompress: bool = False,
+) -> None:
+    """Build the static site.
+
+    Per-airfield and per-route pages are only re-rendered when their ``input_hash``
+    differs from the one recorded in ``site/api/_manifest.json`` (or ``full`` is set); the
+    hash covers the published payload, and routes cover every airfield they reference.
+
+    The v2 API under ``site/api/v2`` is minified, routes reference airfields by ident and
+    ``index.json`` maps every ident/route id to the digest of its file's bytes.
+    ``latest.json`` (everything in one file) is only written with ``legacy_latest``;
+    ``precompress`` adds ``.gz``/``.br`` siblings to the v2 files.
+
+    Trends and sparklines cover each airfield's last ``trend_window`` observations, at
+    most ``history_retention`` of which are kept.
+
+    Phase timings, per-airfield compute times and bytes/files written are recorded in
+    ``site/api/_build_stats.json``.
+    """
+    profiler = profiling.reset()
+    started = time.perf_counter()
+    with profiling.phase("validate"):
+        validate_all(DATA_DIR, CACHE_DIR / "yaml")
 
     mode_key = "sample" if mode in ("sample", "auto") else "live_beta"
     mode_info = build_mode_info(mode_key)
-    airfields, default_profile, profiles = build_airfields(mode)
+    airfields, default_profile, profiles = build_airfields(
+        mode, jobs=jobs, history_retention=history_retention, trend_window=trend_window
+    )
     routes = build_routes(airfields, default_profile)
+    assets, sigwx_paths = publish_assets()
+
+    manifest_path = SITE_DIR / "api" / "_manifest.json"
+    manifest = {
+        "code": code_digest(),
+        "mode": mode_key,
+        "assets": assets,
+        "airfields": {airfield["ident"]: airfield["input_hash"] for airfield in airfields},
+        "routes": {route["route_id"]: route["input_hash"] for route in routes},
+    }
+    previous = load_manifest(manifest_path)
+    if full or any(previous.get(key) != manifest[key] for key in ("code", "mode", "assets")):
+        previous = {}
+    changed_airfields = changed_keys(previous.get("airfields", {}), manifest["airfields"])
+    # Digests of the v2 files as written, carried over for items that are not rewritten.
+    api_digests = previous.get("api", {})
+    manifest["api"] = {
+        "airfields": dict(api_digests.get("airfields", {})),
+        "routes": dict(api_digests.get("routes", {})),
+    }
+    changed_airfields |= set(manifest["airfields"]) - set(manifest["api"]["airfields"])
+    changed_routes = (
+        changed_keys(previous.get("routes", {}), manifest["routes"])
+        | set(manifest["routes"]) - set(manifest["api"]["routes"])
+        | {
+            route["route_id"]
+            for route in routes
+            if any(item["ident"] in changed_airfields for item in route["airfields"])
+        }
+    )
 
-    sigwx_adapter = SampleSigwxAdapter(SAMPLES_DIR / "sigwx")
-    sigwx_paths = copy_sigwx(sigwx_adapter.fetch())
-
-    SITE_DIR.mkdir(parents=True, exist_ok=True)
-    write_assets()
     build_tools_pages(mode_info)
 
-    (SITE_DIR / "index.html").write_text(
-        render_home(airfields, default_profile["name"], mode_info),
-        encoding="utf-8",
-    )
-    (SITE_DIR / "routes.html").write_text(render_routes_index(routes, mode_info), encoding="utf-8")
+    v2_dir = SITE_DIR / "api" / "v2"
+    compress = available_compressions() if precompress else ()
+    latest_path = SITE_DIR / "api" / "latest.json"
+    site_changed = bool(changed_airfields or changed_routes or previous != manifest)
+    if site_changed:
+        write_page(
+            SITE_DIR / "index.html", render_home(airfields, default_profile["name"], mode_info)
+        )
+        write_page(SITE_DIR / "routes.html", render_routes_index(routes, mode_info))
+    if legacy_latest:
+        if site_changed or not latest_path.exists():
+            write_json(latest_path, {"mode": mode_info, "airfields": airfields, "routes": routes})
+    else:
+        latest_path.unlink(missing_ok=True)
 
     airfield_dir = SITE_DIR / "airfield"
     airfield_dir.mkdir(parents=True, exist_ok=True)
     for airfield in airfields:
-        (airfield_dir / f"{airfield['ident']}.html").write_text(
-            render_airfield_page(airfield, mode_info),
-            encoding="utf-8",
+        if airfield["ident"] not in changed_airfields:
+            continue
+        write_page(
+            airfield_dir / f"{airfield['ident']}.html", render_airfield_page(airfield, mode_info)
+        )
+        write_json(SITE_DIR / "api" / "airfield" / f"{airfield['ident']}.json", airfield)
+        manifest["api"]["airfields"][airfield["ident"]] = write_json(
+            v2_dir / "airfield" / f"{airfield['ident']}.json",
+            airfield,
+            minify=True,
+            compress=compress,
         )
 
     route_dir = SITE_DIR / "route"
     route_dir.mkdir(parents=True, exist_ok=True)
     for route in routes:
-        (route_dir / f"{route['route_id']}.html").write_text(
+        if route["route_id"] not in changed_routes:
+            continue
+        write_page(
+            route_dir / f"{route['route_id']}.html",
             render_route_page(route, sigwx_paths, mode_info),
-            encoding="utf-8",
+        )
+        write_json(SITE_DIR / "api" / "route" / f"{route['route_id']}.json", route)
+        manifest["api"]["routes"][route["route_id"]] = write_json(
+            v2_dir / "route" / f"{route['route_id']}.json",
+            api_route(route),
+            minify=True,
+            compress=compress,
+        )
+
+    for kind, current in (("airfields", manifest["airfields"]), ("routes", manifest["routes"])):
+        manifest["api"][kind] = {
+            key: value for key, value in manifest["api"][kind].items() if key in current
+        }
+    if site_changed:
+        write_json(
+            v2_dir / "index.json",
+            api_index(manifest, mode_info, default_profile["name"]),
+            minify=True,
+            compress=compress,
         )
 
-    write_json(
-        SITE_DIR / "api" / "latest.json",
-        {"mode": mode_info, "airfields": airfields, "routes": routes},
-    )
     write_json(SITE_DIR / "api" / "profiles.json", profiles)
     write_json(SITE_DIR / "api" / "aircraft.json", load_aircraft())
+    write_json(manifest_path, manifest)
 
-    for airfield in airfields:
-        write_json(SITE_DIR / "api" / "airfield" / f"{airfield['ident']}.json", airfield)
-    for route in routes:
-        write_json(SITE_DIR / "api" / "route" / f"{route['route_id']}.json", route)
+    profiler.add_time("build", time.perf_counter() - started)
+    stats = profiler.to_dict()
+    write_json(
+        SITE_DIR / "api" / "_build_stats.json",
+        {
+            "generated_at": utc_now().isoformat().replace("+00:00", "Z"),
+            "mode": mode_key,
+            "jobs": jobs,
+            "changed": {
+                "airfields": len(changed_airfields),
+                "routes": len(changed_routes),
+                "files": stats["counters"].get("files_changed", 0),
+            },
+            "phases": stats["phases"],
+            "counters": stats["counters"],
+            "peak_rss_kb": profiling.peak_rss_kb(),
+            "airfields": stats["items"].get("airfields", {}),
+        },
+    )
 
 
 def render_snapshot_page(snapshot_id: str, mode_info: dict) -> str:
+    """Snapshots outlive every asset fingerprint, so they link the unhashed ``style.css``."""
     return f"""
 <!doctype html>
 <html lang="en">
@@ -944,9 +1381,32 @@ def render_snapshot_page(snapshot_id: str, mode_info: dict) -> str:
   </main>
   <script>
     const snapshotId = "{snapshot_id}";
+    const objects = new Map();
+    async function fetchJson(url) {{
+      const res = await fetch(url);
+      return res.json();
+    }}
+    // Snapshots share stored objects: {{"$ref": hash}} stands for objects/<hash>.json.
+    async function resolve(value) {{
+      if (Array.isArray(value)) {{
+        return Promise.all(value.map(resolve));
+      }}
+      if (!value || typeof value !== 'object') {{
+        return value;
+      }}
+      const keys = Object.keys(value);
+      if (keys.length === 1 && typeof value.$ref === 'string') {{
+        if (!objects.has(value.$ref)) {{
+          const url = `../api/snapshots/objects/${{value.$ref}}.json`;
+          objects.set(value.$ref, fetchJson(url).then(resolve));
+        }}
+        return objects.get(value.$ref);
+      }}
+      const items = await Promise.all(keys.map(async (key) => [key, await resolve(value[key])]));
+      return Object.fromEntries(items);
+    }}
     async function loadSnapshot() {{
-      const res = await fetch(`../api/snapshots/${{snapshotId}}.json`);
-      const data = await res.json();
+      const data = await resolve(await fetchJson(`../api/snapshots/${{snapshotId}}.json`));
       const content = document.getElementById('snapshot-content');
       content.innerHTML = `
         <h3>Snapshot ${{snapshotId}}</h3>
@@ -974,22 +1434,26 @@ def build_snapshot(
 ) -> None:
     mode_key = "live_beta" if source == "live_beta" else "sample"
     mode_info = build_mode_info(mode_key)
-    airfields, _, profiles = build_airfields(mode_key, record_history=False)
-    routes = build_routes(airfields, profiles[0])
-
-    profile = next((p for p in profiles if p["name"] == profile_name), profiles[0])
 
+    # Only fetch and compute what the snapshot shows, however large the packs are.
     payload: dict
     if snapshot_type == "airfield":
-        target = next((a for a in airfields if a["ident"] == ident), None)
-        if not target:
+        airfields, _, profiles = build_airfields(mode_key, record_history=False, idents=[ident])
+        if not airfields:
             raise ValueError("Unknown airfield for snapshot")
-        payload = {"airfield": target}
+        payload = {"airfield": airfields[0]}
     else:
-        target = next((r for r in routes if r["route_id"] == ident), None)
-        if not target:
+        aerodromes, pack_routes = load_packs()
+        route = next((r for r in pack_routes if r["route_id"] == ident), None)
+        if not route:
             raise ValueError("Unknown route for snapshot")
-        payload = {"route": target}
+        index = SpatialIndex.from_aerodromes(aerodromes)
+        airfields, _, profiles = build_airfields(
+            mode_key, record_history=False, idents=route_dependencies(route, index)
+        )
+        payload = {"route": build_routes(airfields, profiles[0], route_ids=[ident])[0]}
+
+    profile = next((p for p in profiles if p["name"] == profile_name), profiles[0])
 
     snapshot = {
         "id": snapshot_id,
@@ -999,11 +1463,10 @@ def build_snapshot(
         "payload": payload,
     }
 
-    write_json(SITE_DIR / "api" / "snapshots" / f"{snapshot_id}.json", snapshot)
+    write_snapshot(SITE_DIR / "api" / "snapshots", snapshot)
     (SITE_DIR / "snapshot").mkdir(parents=True, exist_ok=True)
-    (SITE_DIR / "snapshot" / f"{snapshot_id}.html").write_text(
-        render_snapshot_page(snapshot_id, mode_info),
-        encoding="utf-8",
+    write_text(
+        SITE_DIR / "snapshot" / f"{snapshot_id}.html", render_snapshot_page(snapshot_id, mode_info)
     )
 
 
@@ -1242,20 +1705,36 @@ function filterCards(inputId, selector) {
 filterCards('airfield-search', '.card[data-ident]');
 filterCards('route-search', '.card[data-route]');
 
+let apiIndex = null;
+
+function loadApiIndex() {
+  if (!apiIndex) {
+    apiIndex = fetch(`${basePath}api/v2/index.json`).then(r => r.json());
+  }
+  return apiIndex;
+}
+
+async function loadApiItem(kind, id) {
+  const index = await loadApiIndex();
+  const hash = (kind === 'airfield' ? index.airfields : index.routes)[id];
+  if (!hash) return null;
+  const url = `${basePath}api/v2/${kind}/${encodeURIComponent(id)}.json?v=${hash}`;
+  return fetch(url).then(r => (r.ok ? r.json() : null)).catch(() => null);
+}
+
 async function buildScenarioCard() {
   const profileId = document.getElementById('scenario-profile').value;
   const airfieldId = document.getElementById('scenario-airfield').value;
   const routeId = document.getElementById('scenario-route').value;
   const aircraftId = document.getElementById('scenario-aircraft').value;
 
-  const latest = await fetch(`${basePath}api/latest.json`).then(r => r.json());
   const profiles = await fetch(`${basePath}api/profiles.json`).then(r => r.json());
   const aircraft = await fetch(`${basePath}api/aircraft.json`).then(r => r.json());
+  const airfield = await loadApiItem('airfield', airfieldId);
+  const route = await loadApiItem('route', routeId);
 
   const profile = profiles.find(p => p.name === profileId);
   const aircraftInfo = aircraft.find(a => a.type === aircraftId);
-  const airfield = latest.airfields.find(a => a.ident === airfieldId);
-  const route = latest.routes.find(r => r.route_id === routeId);
 
   const output = document.getElementById('scenario-output');
   const title = route ? `Route ${route.route_id}` : `Airfield ${airfield.ident}`;
@@ -1277,21 +1756,20 @@ async function buildScenarioCard() {
 }
 
 async function populateScenario() {
-  const latest = await fetch(`${basePath}api/latest.json`).then(r => r.json());
-  const profiles = await fetch(`${basePath}api/profiles.json`).then(r => r.json());
-  const aircraft = await fetch(`${basePath}api/aircraft.json`).then(r => r.json());
-
   const profileSelect = document.getElementById('scenario-profile');
   const airfieldSelect = document.getElementById('scenario-airfield');
   const routeSelect = document.getElementById('scenario-route');
   const aircraftSelect = document.getElementById('scenario-aircraft');
+  if (!profileSelect) return;
 
-  if (profileSelect) {
-    profiles.forEach(p => profileSelect.add(new Option(p.name, p.name)));
-    latest.airfields.forEach(a => airfieldSelect.add(new Option(a.ident, a.ident)));
-    latest.routes.forEach(r => routeSelect.add(new Option(r.route_id, r.route_id)));
-    aircraft.forEach(a => aircraftSelect.add(new Option(a.type, a.type)));
-  }
+  const index = await loadApiIndex();
+  const profiles = await fetch(`${basePath}api/profiles.json`).then(r => r.json());
+  const aircraft = await fetch(`${basePath}api/aircraft.json`).then(r => r.json());
+
+  profiles.forEach(p => profileSelect.add(new Option(p.name, p.name)));
+  Object.keys(index.airfields).forEach(ident => airfieldSelect.add(new Option(ident, ident)));
+  Object.keys(index.routes).forEach(id => routeSelect.add(new Option(id, id)));
+  aircraft.forEach(a => aircraftSelect.add(new Option(a.type, a.type)));
 }
 
 async function initGoNoGo() {
@@ -1300,56 +1778,57 @@ async function initGoNoGo() {
   const aircraftSelect = document.getElementById('aircraft-select');
   if (!output || !profileSelect || !aircraftSelect) return;
 
-  const latest = await fetch(`${basePath}api/latest.json`).then(r => r.json());
+  const ident = output.getAttribute('data-airfield');
+  const airfield = await loadApiItem('airfield', ident).catch(() => null);
   const profiles = await fetch(`${basePath}api/profiles.json`).then(r => r.json());
   const aircraft = await fetch(`${basePath}api/aircraft.json`).then(r => r.json());
-  const ident = output.getAttribute('data-airfield');
-  const airfield = latest.airfields.find(a => a.ident === ident);
-  if (!airfield) {
+  const table = airfield && airfield.computed.go_no_go;
+  if (!table) {
     output.textContent = 'Unable to load selected airfield.';
     return;
   }
 
-  profiles.forEach(p => profileSelect.add(new Option(p.name, p.name)));
-  aircraft.forEach(a => aircraftSelect.add(new Option(a.type, a.type)));
+  table.profiles.forEach(name => profileSelect.add(new Option(name, name)));
+  table.aircraft.forEach(type => aircraftSelect.add(new Option(type, type)));
 
   const evaluate = () => {
-    const profile = profiles.find(p => p.name === profileSelect.value) || profiles[0];
-    const selectedAircraft = aircraft.find(a => a.type === aircraftSelect.value) || aircraft[0];
+    const profileIndex = Math.max(table.profiles.indexOf(profileSelect.value), 0);
+    const aircraftIndex = Math.max(table.aircraft.indexOf(aircraftSelect.value), 0);
+    const profile = profiles.find(p => p.name === table.profiles[profileIndex]);
+    const selectedAircraft = aircraft.find(a => a.type === table.aircraft[aircraftIndex]);
     const limits = profile.thresholds;
     const maxCrosswind = Math.min(
       limits.max_crosswind_kt || 0,
       selectedAircraft.demonstrated_crosswind_kt || limits.max_crosswind_kt || 0,
     );
-    const metar = airfield.metar;
-    const densityAltitude = airfield.computed.density_altitude.da_ft || 0;
-    const maxCrosswindSeen = Math.max(
-      ...airfield.computed.wind_components_per_runway.map(c => c.crosswind_kt || 0),
-      0,
-    );
+    const bits = table.matrix[profileIndex][aircraftIndex];
+    const inputs = table.inputs;
     const reasons = [];
 
-    if (maxCrosswindSeen > maxCrosswind) {
-      reasons.push(`Crosswind ${maxCrosswindSeen} kt > limit ${maxCrosswind} kt`);
+    if (bits & table.reason_bits.crosswind) {
+      reasons.push(`Crosswind ${inputs.crosswind_kt} kt > limit ${maxCrosswind} kt`);
     }
-    if ((metar.visibility_m || 99999) < (limits.min_vis_m || 0)) {
-      reasons.push(`Visibility ${metar.visibility_m} m < profile min ${limits.min_vis_m} m`);
+    if (bits & table.reason_bits.visibility) {
+      reasons.push(`Visibility ${inputs.visibility_m} m < profile min ${limits.min_vis_m} m`);
     }
-    if (metar.ceiling_ft !== null && metar.ceiling_ft < (limits.min_ceiling_ft || 0)) {
-      reasons.push(`Ceiling ${metar.ceiling_ft} ft < profile min ${limits.min_ceiling_ft} ft`);
+    if (bits & table.reason_bits.ceiling) {
+      reasons.push(`Ceiling ${inputs.ceiling_ft} ft < profile min ${limits.min_ceiling_ft} ft`);
     }
-    if ((densityAltitude || 0) > (limits.max_da_ft || 99999)) {
-      reasons.push(`DA ${densityAltitude} ft > profile max ${limits.max_da_ft} ft`);
+    if (bits & table.reason_bits.density_altitude) {
+      reasons.push(`DA ${inputs.da_ft} ft > profile max ${limits.max_da_ft} ft`);
     }
 
-    const verdict = reasons.length ? 'NO-GO' : 'GO (training advisory)';
+    const verdict = bits ? 'NO-GO' : 'GO (training advisory)';
+    const severity = table.severity[profileIndex];
     const mtowNote = selectedAircraft.notes || 'Verify actual MTOW and POH limits.';
     output.innerHTML = `
       <p><strong>Verdict:</strong> ${verdict}</p>
       <p><strong>Profile:</strong> ${profile.name} (${profile.licence_tier})</p>
+      <p><strong>Profile severity:</strong> ${severity.level}
+        (${severity.flags.join(', ') || 'LOW_RISK'})</p>
       <p><strong>Aircraft:</strong> ${selectedAircraft.type}</p>
       <p><strong>Crosswind limit used:</strong> ${maxCrosswind} kt</p>
-      <p><strong>Density altitude now:</strong> ${densityAltitude} ft</p>
+      <p><strong>Density altitude now:</strong> ${inputs.da_ft} ft</p>
       <p><strong>MTOW/POH note:</strong> ${mtowNote}</p>
       <p><strong>Reasons:</strong> ${reasons.join('; ')
         || 'Within selected profile/aircraft limits.'}</p>
@@ -1404,7 +1883,7 @@ renderSparkline();
 """
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--mode",
@@ -1412,25 +1891,99 @@ def parse_args() -> argparse.Namespace:
         choices=["sample", "auto", "live_beta"],
         help="Build mode",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-render every page even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for the per-airfield compute step",
+    )
+    parser.add_argument(
+        "--history-retention",
+        type=int,
+        default=DEFAULT_RETENTION,
+        help="Observations kept per airfield in the history store",
+    )
+    parser.add_argument(
+        "--trend-window",
+        type=int,
+        default=TREND_WINDOW,
+        help="Latest observations per airfield that trends and sparklines cover",
+    )
+    parser.add_argument(
+        "--legacy-latest",
+        action="store_true",
+        help="Also write the monolithic api/latest.json compatibility file",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Write .gz (and .br when brotli is installed) siblings for the v2 API",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=None,
+        help="Data dir to build from (e.g. one written by src.build.synthetic)",
+    )
+    parser.add_argument(
+        "--site-dir",
+        type=Path,
+        default=None,
+        help="Output dir for the site (default: site/)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the per-phase timing table after the build",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="PATH",
+        default=None,
+        help="Run the build under cProfile and dump pstats to PATH",
+    )
     parser.add_argument("--snapshot", action="store_true", help="Create snapshot artifacts only")
     parser.add_argument("--snapshot-type", choices=["airfield", "route"], default="airfield")
     parser.add_argument("--snapshot-ident", default="")
     parser.add_argument("--snapshot-profile", default="PPL")
     parser.add_argument("--snapshot-source", choices=["sample", "live_beta"], default="sample")
     parser.add_argument("--snapshot-id", default="")
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if not 2 <= args.trend_window <= args.history_retention:
+        parser.error("--trend-window must be between 2 and --history-retention")
+    return args
 
 
 if __name__ == "__main__":
     args = parse_args()
-    if args.snapshot:
-        snap_id = args.snapshot_id or f"snap-{utc_now().strftime('%Y%m%d%H%M%S')}"
-        build_snapshot(
-            args.snapshot_type,
-            args.snapshot_ident,
-            args.snapshot_profile,
-            args.snapshot_source,
-            snap_id,
-        )
-    else:
-        build_site(args.mode)
+    if args.data_dir:
+        use_data_dir(args.data_dir)
+    if args.site_dir:
+        SITE_DIR = args.site_dir
+    with profiling.cprofile(args.cprofile):
+        if args.snapshot:
+            snap_id = args.snapshot_id or f"snap-{utc_now().strftime('%Y%m%d%H%M%S')}"
+            build_snapshot(
+                args.snapshot_type,
+                args.snapshot_ident,
+                args.snapshot_profile,
+                args.snapshot_source,
+                snap_id,
+            )
+        else:
+            build_site(
+                args.mode,
+                full=args.full,
+                jobs=args.jobs,
+                history_retention=args.history_retention,
+                trend_window=args.trend_window,
+                legacy_latest=args.legacy_latest,
+                precompress=args.precompress,
+            )
+    if args.profile:
+        print(profiling.active().summary())
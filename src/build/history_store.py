@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+HISTORY_FIELDS = (
+    "wind_speed_kt",
+    "wind_dir_deg",
+    "qnh_hpa",
+    "temp_c",
+    "dewpoint_c",
+    "visibility_m",
+    "ceiling_ft_est",
+)
+DEFAULT_RETENTION = 200
+DB_NAME = "history.sqlite3"
+
+_COLUMNS = ", ".join(f"{field} NUMERIC" for field in HISTORY_FIELDS)
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS history (
+    ident TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    {_COLUMNS},
+    PRIMARY KEY (ident, timestamp)
+) WITHOUT ROWID
+"""
+
+
+class HistoryStore:
+    """Single SQLite file holding METAR history for every ident.
+
+    Rows are keyed by ``(ident, timestamp)`` so re-appending an observation is a no-op,
+    and the primary key index lets ``tail`` read the last N rows without touching the rest.
+    """
+
+    def __init__(self, path: Path, retention: int = DEFAULT_RETENTION) -> None:
+        self.path = path
+        self.retention = retention
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(_SCHEMA)
+
+    def __enter__(self) -> HistoryStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def tail(self, ident: str, count: int) -> list[dict]:
+        rows = self.conn.execute(
+            f"SELECT timestamp, {', '.join(HISTORY_FIELDS)} FROM history "
+            "WHERE ident = ? ORDER BY timestamp DESC LIMIT ?",
+            (ident, count),
+        ).fetchall()
+        return [
+            {"timestamp": row[0], **dict(zip(HISTORY_FIELDS, row[1:]))} for row in reversed(rows)
+        ]
+
+    def append(self, ident: str, entry: dict) -> bool:
+        """Store ``entry`` unless its timestamp is already recorded; returns True if added."""
+        cursor = self.conn.execute(
+            f"INSERT OR IGNORE INTO history (ident, timestamp, {', '.join(HISTORY_FIELDS)}) "
+            f"VALUES (?, ?{', ?' * len(HISTORY_FIELDS)})",
+            (ident, entry.get("timestamp") or "", *(entry.get(f) for f in HISTORY_FIELDS)),
+        )
+        if cursor.rowcount:
+            self._prune(ident)
+        return bool(cursor.rowcount)
+
+    def _prune(self, ident: str) -> None:
+        self.conn.execute(
+            "DELETE FROM history WHERE ident = ? AND timestamp < ("
+            "SELECT timestamp FROM history WHERE ident = ? "
+            "ORDER BY timestamp DESC LIMIT 1 OFFSET ?)",
+            (ident, ident, self.retention - 1),
+        )
+
+    def import_json(self, history_dir: Path) -> int:
+        """One-shot import of legacy ``<ident>.json`` history files; returns rows added."""
+        added = 0
+        for path in sorted(history_dir.glob("*.json")):
+            for entry in json.loads(path.read_text(encoding="utf-8")):
+                added += self.append(path.stem, entry)
+        self.conn.commit()
+        return added
+
+
+def open_history_store(history_dir: Path, retention: int = DEFAULT_RETENTION) -> HistoryStore:
+    """Open the store under ``history_dir``, migrating legacy JSON files on first use."""
+    path = history_dir / DB_NAME
+    is_new = not path.exists()
+    store = HistoryStore(path, retention)
+    if is_new:
+        store.import_json(history_dir)
+    return store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate JSON history into the SQLite store")
+    parser.add_argument("history_dir", type=Path)
+    parser.add_argument("--retention", type=int, default=DEFAULT_RETENTION)
+    parser.add_argument(
+        "--remove-json",
+        action="store_true",
+        help="Delete the legacy JSON files after importing them",
+    )
+    args = parser.parse_args()
+    with HistoryStore(args.history_dir / DB_NAME, args.retention) as store:
+        added = store.import_json(args.history_dir)
+    print(f"Imported {added} history entries into {args.history_dir / DB_NAME}")
+    if args.remove_json:
+        for path in args.history_dir.glob("*.json"):
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
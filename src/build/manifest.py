@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+
+def digest(value: Any) -> str:
+    """Stable short hash of any JSON-serialisable value."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def content_digest(payload: bytes) -> str:
+    """Short hash of the bytes of a written file."""
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def code_digest(src_dir: Path = SRC_DIR) -> str:
+    """Hash of the build code itself, so a code change invalidates every cached page."""
+    sha = hashlib.sha256()
+    for path in sorted(src_dir.rglob("*.py")):
+        sha.update(path.relative_to(src_dir).as_posix().encode("utf-8"))
+        sha.update(path.read_bytes())
+    return sha.hexdigest()[:16]
+
+
+def load_manifest(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+
+
+def changed_keys(previous: dict[str, str], current: dict[str, str]) -> set[str]:
+    return {key for key, value in current.items() if previous.get(key) != value}
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Sequence, TextIO
+
+from src.profiling import count, phase
+
+CHUNK_SIZE = 1 << 20
+
+
+def _same_file(path: Path, other: Path) -> bool:
+    """Byte-for-byte comparison that gives up at the first differing size or chunk."""
+    try:
+        if path.stat().st_size != other.stat().st_size:
+            return False
+    except FileNotFoundError:
+        return False
+    with path.open("rb") as left, other.open("rb") as right:
+        while True:
+            chunk = left.read(CHUNK_SIZE)
+            if chunk != right.read(CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
+def _same_bytes(path: Path, payload: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(payload):
+            return False
+        return path.read_bytes() == payload
+    except FileNotFoundError:
+        return False
+
+
+def _same_chunks(path: Path, chunks: Sequence[str]) -> bool:
+    try:
+        existing = memoryview(path.read_bytes())
+    except FileNotFoundError:
+        return False
+    offset = 0
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        if existing[offset : offset + len(data)] != data:
+            return False
+        offset += len(data)
+    return offset == len(existing)
+
+
+def _record(path: Path, changed: bool) -> None:
+    count("files_written")
+    count("bytes_written", path.stat().st_size)
+    if changed:
+        count("files_changed")
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "wb") -> Iterator[IO]:
+    """Open a temporary sibling of ``path`` and rename it over ``path`` once the block ends.
+
+    Readers (e.g. a Pages deploy picking up the tree) see the old file or the complete new
+    one, never a partial write. If the new contents match the existing file it is left
+    untouched, keeping its mtime for deploys and caches. On error the temporary file is
+    removed and ``path`` is left as it was.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _temp_path(path)
+    if "b" in mode:
+        handle = tmp_path.open(mode)
+    else:
+        handle = tmp_path.open(mode, encoding="utf-8", newline="\n")
+    try:
+        yield handle
+        handle.close()
+        if _same_file(tmp_path, path):
+            tmp_path.unlink()
+            changed = False
+        else:
+            os.replace(tmp_path, path)
+            changed = True
+    except BaseException:
+        handle.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _record(path, changed)
+
+
+def write_bytes(path: Path, payload: bytes) -> None:
+    """Write one site file unless it already holds ``payload``, counting it either way."""
+    with phase("write"):
+        if _same_bytes(path, payload):
+            _record(path, changed=False)
+            return
+        with atomic_open(path) as handle:
+            handle.write(payload)
+
+
+def write_text(path: Path, text: str) -> None:
+    write_bytes(path, text.encode("utf-8"))
+
+
+def write_page(path: Path, chunks: Sequence[str]) -> None:
+    """Stream a rendered page's chunks into ``path`` unless it already holds that page."""
+    with phase("write"):
+        if _same_chunks(path, chunks):
+            _record(path, changed=False)
+            return
+        with atomic_open(path, "w") as handle:
+            handle.writelines(chunks)
+
+
+@contextmanager
+def open_text(path: Path) -> Iterator[TextIO]:
+    """Open one site file for a renderer to stream into, replaced only if it changed.
+
+    The renderer's own phase covers the writes it makes while producing the page.
+    """
+    with atomic_open(path, "w") as handle:
+        yield handle
+
+
+def copy_file(source: Path, path: Path) -> None:
+    """Copy a static asset into the site unless an identical copy is already there."""
+    with phase("write"):
+        if _same_file(source, path):
+            _record(path, changed=False)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _temp_path(path)
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        _record(path, changed=True)
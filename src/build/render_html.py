@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterable
 
+from src.profiling import timed
+
 COLOR_CLASSES = {
     "OK": "status-ok",
     "CAUTION": "status-caution",
@@ -9,23 +12,39 @@ COLOR_CLASSES = {
     "UNKNOWN": "status-unknown",
 }
 
+# Asset name → fingerprinted name, filled from the build's asset manifest.
+ASSETS: dict[str, str] = {}
 
-def page_wrapper(
-    title: str,
-    body: str,
-    mode_info: dict,
-    active_tab: str = "airfields",
-    prefix: str = "",
-) -> str:
-    return f"""
+# A rendered page: literal chunks written to the file one after another.
+Page = tuple[str, ...]
+
+
+def use_assets(manifest: dict[str, str]) -> None:
+    """Link the fingerprinted asset names in ``manifest`` from every page rendered after."""
+    ASSETS.clear()
+    ASSETS.update(manifest)
+    _chrome.cache_clear()
+
+
+def asset_url(name: str) -> str:
+    return ASSETS.get(name, name)
+
+
+@lru_cache(maxsize=64)
+def _chrome(
+    mode_class: str, mode_label: str, mode_text: str, active_tab: str, prefix: str
+) -> tuple[str, str, str]:
+    """The page shell around the title and body, built once per mode, tab and prefix."""
+    head = f"""
 <!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <meta name="base-path" content="{prefix}" />
-  <title>{title}</title>
-  <link rel="stylesheet" href="{prefix}assets/style.css" />
+  <title>"""
+    header = f"""</title>
+  <link rel="stylesheet" href="{prefix}assets/{asset_url('style.css')}" />
 </head>
 <body>
   <header>
@@ -37,28 +56,43 @@ def page_wrapper(
       <a class="{_active(active_tab, 'tools')}" href="{prefix}tools/index.html">Tools</a>
     </nav>
     <div class="mode-row">
-      <span class="mode-banner {mode_info['class']}">
-        <span class="icon">●</span>{mode_info['label']} — {mode_info['text']}
+      <span class="mode-banner {mode_class}">
+        <span class="icon">●</span>{mode_label} — {mode_text}
       </span>
       <label class="mode-select">Mode
         <select disabled>
-          <option selected>{mode_info['label']}</option>
+          <option selected>{mode_label}</option>
           <option>LIVE_BETA</option>
         </select>
       </label>
     </div>
   </header>
   <main class="container">
-    {body}
+    """
+    footer = f"""
   </main>
   <footer>
     <p>Training/augmentation only. Verify with SAWS/ATC/AIP/NOTAM office and POH/AFM.</p>
     <p>Computed values are approximations.</p>
   </footer>
-  <script src="{prefix}assets/app.js"></script>
+  <script src="{prefix}assets/{asset_url('app.js')}"></script>
 </body>
 </html>
 """
+    return head, header, footer
+
+
+def page_wrapper(
+    title: str,
+    body: str,
+    mode_info: dict,
+    active_tab: str = "airfields",
+    prefix: str = "",
+) -> Page:
+    head, header, footer = _chrome(
+        mode_info["class"], mode_info["label"], mode_info["text"], active_tab, prefix
+    )
+    return head, title, header, body, footer
 
 
 def _active(active: str, tab: str) -> str:
@@ -89,6 +123,86 @@ def _format_ceiling(ceiling_ft: int | None, layers: list[dict]) -> str:
     return "--"
 
 
+def _format_taf_periods(periods: list[dict]) -> str:
+    rows = []
+    for period in periods:
+        conditions = period["conditions"]
+        label = period["change"]
+        if period.get("probability"):
+            label = f"PROB{period['probability']}"
+        wind = "--"
+        if "wind_speed_kt" in conditions:
+            wind = f"{conditions['wind_dir_deg'] or 'VRB'}/{conditions['wind_speed_kt']} kt"
+            if conditions.get("gust_kt"):
+                wind += f" G{conditions['gust_kt']}"
+        rows.append(
+            "<tr>"
+            f"<td>{label}</td>"
+            f"<td>{period['from']}{'–' + period['to'] if period.get('to') else ''}</td>"
+            f"<td>{wind}</td>"
+            f"<td>{conditions.get('visibility_m', '--')}</td>"
+            f"<td>{', '.join(conditions.get('weather_codes', [])) or '--'}</td>"
+            f"<td>{_format_cloud_layers(conditions.get('cloud_layers', []))}</td>"
+            "</tr>"
+        )
+    return "".join(rows)
+
+
+def _format_taf_outlook(outlook: dict | None) -> str:
+    if not outlook:
+        return "No forecast for the remaining validity."
+    worst = outlook["worst"]
+    parts = [
+        f"vis {worst['visibility_m'] if worst['visibility_m'] is not None else '--'} m",
+        f"ceiling {worst['ceiling_ft'] if worst['ceiling_ft'] is not None else 'none'}",
+    ]
+    if worst["weather_codes"]:
+        parts.append(", ".join(worst["weather_codes"]))
+    if outlook["deteriorating"]:
+        parts.append("deteriorating")
+    return "; ".join(parts)
+
+
+def _format_eta(arrival: dict) -> str:
+    return f"{arrival['eta'][11:16]}Z" if arrival.get("eta") else "--"
+
+
+def _format_taf_at_eta(arrival: dict) -> str:
+    if not arrival["in_validity"]:
+        return f"{arrival['ident']} {_format_eta(arrival)} outside TAF validity"
+    worst = arrival["worst_within_1h"]
+    weather = ", ".join(worst["weather_codes"]) or "nil weather"
+    return (
+        f"{arrival['ident']} {_format_eta(arrival)} vis {worst['visibility_m'] or '--'} m, "
+        f"ceiling {worst['ceiling_ft'] or '--'} ft, {weather}"
+    )
+
+
+def _format_level_profile(profile: dict | None) -> str:
+    if not profile:
+        return "--"
+    levels = " → ".join(f"{level} ft" for level in dict.fromkeys(profile["levels_ft"]))
+    hazards = sorted({name for names in profile["hazards"] for name in names})
+    if not hazards:
+        return f"{levels}, {profile['total_minutes']} min, no hazards"
+    return (
+        f"{levels}, {profile['total_minutes']} min, "
+        f"{profile['hazard_minutes']} min in {', '.join(hazards)}"
+    )
+
+
+def _format_sigmet_legs(sigmet: dict | None, plan: dict) -> str:
+    if sigmet is None:
+        return "Clear of the route's legs and levels"
+    legs = plan.get("legs", [])
+    crossed = ", ".join(
+        f"{legs[index]['from']} → {legs[index]['to']}"
+        for index in sigmet["legs"]
+        if index < len(legs)
+    )
+    return f"On route: {crossed}" if sigmet["area"] == "polygon" else "FIR-wide"
+
+
 def _carb_icing_risk(temp_c: int | None, dewpoint_c: int | None) -> tuple[str, str]:
     if temp_c is None or dewpoint_c is None:
         return "Unknown", "Need temperature and dewpoint."
@@ -168,8 +282,8 @@ def route_cards(routes: Iterable[dict]) -> str:
     return "\n".join(cards)
 
 
-
-def render_home(airfields: list[dict], profile_name: str, mode_info: dict) -> str:
+@timed("render.home")
+def render_home(airfields: list[dict], profile_name: str, mode_info: dict) -> Page:
     body = f"""
     <section class="summary">
       <h2>Airfields overview</h2>
@@ -187,7 +301,8 @@ def render_home(airfields: list[dict], profile_name: str, mode_info: dict) -> st
     )
 
 
-def render_routes_index(routes: list[dict], mode_info: dict) -> str:
+@timed("render.routes_index")
+def render_routes_index(routes: list[dict], mode_info: dict) -> Page:
     body = f"""
     <section class="summary">
       <h2>ATPL route packs</h2>
@@ -206,24 +321,27 @@ def render_routes_index(routes: list[dict], mode_info: dict) -> str:
     )
 
 
-def render_airfield_page(airfield: dict, mode_info: dict) -> str:
+@timed("render.airfield")
+def render_airfield_page(airfield: dict, mode_info: dict) -> Page:
     metar = airfield["metar"]
     taf = airfield["taf"]
-    cloud_layers = _format_cloud_layers(metar.get("cloud_layers", []))
-    ceiling = _format_ceiling(metar.get("ceiling_ft"), metar.get("cloud_layers", []))
-    variable_wind = _format_variable_wind(metar.get("variable_wind"))
+    computed = airfield["computed"]
+    layers = metar.get("cloud_layers", [])
     carb_risk, carb_note = _carb_icing_risk(metar.get("temp_c"), metar.get("dewpoint_c"))
-    notam_items = "".join(
-        f"<li><strong>{item['id']}</strong> {item['text']}</li>"
-        for item in airfield.get("notams", [])
-    ) or "<li>No NOTAM sample available.</li>"
+    notam_items = (
+        "".join(
+            f"<li><strong>{item['id']}</strong> {item['text']}</li>"
+            for item in airfield.get("notams", [])
+        )
+        or "<li>No NOTAM sample available.</li>"
+    )
     runway_surface_rows = "".join(
         "<tr>"
         f"<td>{item['runway']}</td>"
         f"<td>{item['surface']}</td>"
         f"<td>{item['condition']}</td>"
         "</tr>"
-        for item in airfield["computed"].get("runway_surface_conditions", [])
+        for item in computed.get("runway_surface_conditions", [])
     )
     runways = "".join(
         (
@@ -234,25 +352,31 @@ def render_airfield_page(airfield: dict, mode_info: dict) -> str:
             f"<td>{c['tailwind_kt']}</td>"
             "</tr>"
         )
-        for c in airfield["computed"]["wind_components_per_runway"]
+        for c in computed["wind_components_per_runway"]
     )
-    flags = airfield["computed"]["flags"] or ["LOW_RISK"]
-    explanations = airfield["computed"]["flag_explanations"]
+    flags = computed["flags"] or ["LOW_RISK"]
+    explanations = computed["flag_explanations"]
     flags_html = "".join(
         f"<details><summary>{flag}</summary><pre>{explanations.get(flag, {})}</pre></details>"
         for flag in flags
     )
-    trend_data = airfield["computed"]["trends"]
+    trend_data = computed["trends"]
     night = airfield["night_ops"]
-    changes = airfield["computed"]["changes"]
-    taf_expiry = airfield["computed"]["taf_time_to_expiry"]
-    sun = airfield["computed"]["sun"]
-    workload = airfield["computed"]["workload"]
-    stability = airfield["computed"]["stability"]
+    changes = computed["changes"]
+    taf_expiry = computed["taf_time_to_expiry"]
+    sun = computed["sun"]
+    workload = computed["workload"]
+    stability = computed["stability"]
+
+    variable_wind = _format_variable_wind(metar.get("variable_wind"))
+    ceiling = _format_ceiling(metar.get("ceiling_ft"), layers)
+    taf_key_changes = ", ".join(taf["summary"]["key_changes"]) or "None"
+    taf_outlook = _format_taf_outlook(computed.get("taf_outlook"))
+    airspace_class = airfield["airspace_context"].get("class", "--")
 
     body = f"""
     <section class="summary">
-      <h2>{airfield['ident']} — {airfield.get('name','')}</h2>
+      <h2>{airfield['ident']} — {airfield.get('name', '')}</h2>
       <p><strong>Raw METAR:</strong> {metar['raw']}</p>
       <p>Observed: {metar['observed_time_utc'] or 'Unknown'} ({metar['source']})</p>
       <p>Data source: {metar.get('source_detail', 'Unknown')}</p>
@@ -269,7 +393,7 @@ def render_airfield_page(airfield: dict, mode_info: dict) -> str:
         <tr><th>Variable wind</th><td>{variable_wind}</td></tr>
         <tr><th>Visibility</th><td>{metar['visibility_m'] or '--'} m</td></tr>
         <tr><th>Weather</th><td>{', '.join(metar['weather_codes']) or '--'}</td></tr>
-        <tr><th>Clouds</th><td>{cloud_layers}</td></tr>
+        <tr><th>Clouds</th><td>{_format_cloud_layers(layers)}</td></tr>
         <tr><th>Ceiling</th><td>{ceiling}</td></tr>
         <tr><th>Temperature</th><td>{metar['temp_c'] or '--'} °C</td></tr>
         <tr><th>Dewpoint</th><td>{metar['dewpoint_c'] or '--'} °C</td></tr>
@@ -281,7 +405,14 @@ def render_airfield_page(airfield: dict, mode_info: dict) -> str:
       <h3>TAF summary</h3>
       <p><strong>Raw TAF:</strong> {taf['raw']}</p>
       <p>Valid: {taf['summary']['valid_from']} → {taf['summary']['valid_to']}</p>
-      <p>Key changes: {', '.join(taf['summary']['key_changes']) or 'None'}</p>
+      <p>Key changes: {taf_key_changes}</p>
+      <table>
+        <tr><th>Period</th><th>Time</th><th>Wind</th><th>Vis (m)</th><th>Weather</th>
+          <th>Cloud</th></tr>
+        {_format_taf_periods(taf.get('periods', []))}
+      </table>
+      <p>Worst case for the rest of the TAF:
+        {taf_outlook}</p>
       <p>Time to TAF expiry:
         <span class="urgency-{taf_expiry['urgency']}">{taf_expiry['hours'] or '--'} hours</span></p>
     </section>
@@ -358,7 +489,7 @@ def render_airfield_page(airfield: dict, mode_info: dict) -> str:
       <ul>
         <li>CTR: {airfield['airspace_context']['ctr']}</li>
         <li>TMA: {airfield['airspace_context']['tma']}</li>
-        <li>Class: {airfield['airspace_context'].get('class', '--')}</li>
+        <li>Class: {airspace_class}</li>
         <li>Circuit: {airfield['circuit']['direction']} /
           {airfield['circuit']['height_ft_agl']} ft AGL</li>
         <li>Noise abatement: {airfield.get('noise_abatement_notes', '--')}</li>
@@ -398,10 +529,10 @@ def render_airfield_page(airfield: dict, mode_info: dict) -> str:
     <section class="section">
       <h3>Trends</h3>
       <div class="trend" data-trend='{trend_data}'></div>
-      <div class="sparkline" data-spark='{trend_data["wind_speed"]}'></div>
-      <div class="sparkline" data-spark='{trend_data["qnh"]}'></div>
-      <div class="sparkline" data-spark='{trend_data["temp"]}'></div>
-      <div class="sparkline" data-spark='{trend_data["dewpoint"]}'></div>
+      <div class="sparkline" data-spark='{trend_data['wind_speed']}'></div>
+      <div class="sparkline" data-spark='{trend_data['qnh']}'></div>
+      <div class="sparkline" data-spark='{trend_data['temp']}'></div>
+      <div class="sparkline" data-spark='{trend_data['dewpoint']}'></div>
     </section>
 
     <section class="section">
@@ -410,15 +541,12 @@ def render_airfield_page(airfield: dict, mode_info: dict) -> str:
     </section>
     """
     return page_wrapper(
-        f"{airfield['ident']} briefing",
-        body,
-        mode_info,
-        active_tab="airfields",
-        prefix="../",
+        f"{airfield['ident']} briefing", body, mode_info, active_tab="airfields", prefix="../"
     )
 
 
-def render_route_page(route: dict, sigwx_paths: dict, mode_info: dict) -> str:
+@timed("render.route")
+def render_route_page(route: dict, sigwx_paths: dict, mode_info: dict) -> Page:
     metar_rows = "".join(
         (
             "<tr>"
@@ -441,28 +569,87 @@ def render_route_page(route: dict, sigwx_paths: dict, mode_info: dict) -> str:
         )
         for level in route["upper_winds"]
     )
+    en_route_rows = "".join(
+        (
+            "<tr>"
+            f"<td>{item['ident']}</td>"
+            f"<td>{item['offtrack_nm']}</td>"
+            f"<td>{', '.join(item['flags'] or []) or '--'}</td>"
+            "</tr>"
+        )
+        for item in route.get("en_route", [])
+    )
+    nearest = ", ".join(
+        f"{item['ident']} ({item['distance_nm']} NM)"
+        for item in route.get("nearest_alternates", [])
+    )
+    plan = route.get("plan") or {"legs": [], "levels": []}
+    fastest = next(
+        (item for item in plan["levels"] if item["level_ft"] == plan.get("fastest_level_ft")),
+        None,
+    )
+    arrivals = route.get("taf_at_eta", [])
+    leg_rows = "".join(
+        (
+            "<tr>"
+            f"<td>{leg['from']} → {leg['to']}</td>"
+            f"<td>{leg['distance_nm']}</td>"
+            f"<td>{leg['track_deg']}°</td>"
+            f"<td>{fastest['ground_speed_kt'][index] if fastest else '--'}</td>"
+            f"<td>{fastest['leg_minutes'][index] if fastest else '--'}</td>"
+            f"<td>{_format_eta(arrivals[index]) if index < len(arrivals) else '--'}</td>"
+            "</tr>"
+        )
+        for index, leg in enumerate(plan["legs"])
+    )
+    optimum_rows = "".join(
+        (
+            "<tr>"
+            f"<td>{item['aircraft'] or 'Generic'} ({item['tas_kt']} kt"
+            f"{', ceiling ' + str(item['ceiling_ft']) + ' ft' if item['ceiling_ft'] else ''})</td>"
+            f"<td>{_format_level_profile(item['min_time'])}</td>"
+            f"<td>{_format_level_profile(item['min_risk'])}</td>"
+            "</tr>"
+        )
+        for item in route.get("cruise_optimum", [])
+    )
+    plan_basis = (
+        f"{plan.get('aircraft') or 'Generic'} at {plan.get('tas_kt', '--')} kt TAS, "
+        f"fastest level {fastest['level_ft'] if fastest else '--'} ft"
+    )
+    on_route = {item["raw"]: item for item in route.get("sigmets_on_route", [])}
     sigmet_cards = "".join(
-        f"<div class='card'><p>{line}</p></div>" for line in route["sigmet_lines"]
+        f"<div class='card'><p>{line}</p><p><strong>{_format_sigmet_legs(on_route.get(line), plan)}"
+        "</strong></p></div>"
+        for line in route["sigmet_lines"]
     )
     notam_cards = "".join(
         f"<div class='card'><strong>{ident}</strong><p>{'<br/>'.join(lines)}</p></div>"
         for ident, lines in route["notams"].items()
     )
+    summary = route["summary"]
 
     route_path = " → ".join([route["dep"], *route.get("via", []), route["dest"]])
     aircraft = ", ".join(route.get("aircraft_types", [])) or "All"
+    flag_badges = "".join(f'<span class="badge">{flag}</span>' for flag in summary["flags"])
+    en_route_rows = en_route_rows or "<tr><td colspan='3'>None in corridor</td></tr>"
+    leg_rows = leg_rows or "<tr><td colspan='6'>No legs</td></tr>"
+    optimum_rows = optimum_rows or "<tr><td colspan='3'>No levels evaluated</td></tr>"
+    taf_at_eta = "; ".join(_format_taf_at_eta(item) for item in arrivals) or "--"
+    taf_expiry = route["taf_time_to_expiry"]
+
     body = f"""
     <section class="summary">
       <h2>{route['route_id']} — {route_path}</h2>
       <p>Track: {route['track_deg'] or 'Unknown'}° | Corridor: {route['corridor_nm']} NM</p>
       <p>Aircraft: {aircraft}</p>
       <div class="badge-row">
-        {''.join(f'<span class="badge">{flag}</span>' for flag in route['summary']['flags'])}
+        {flag_badges}
       </div>
-      <p>Workload: {route['summary']['workload']['category']}
-        ({route['summary']['workload']['score']})</p>
-      <p>Stability: {route['summary']['stability']['category']}
-        ({route['summary']['stability']['score']})</p>
+      <p>Workload: {summary['workload']['category']}
+        ({summary['workload']['score']})</p>
+      <p>Stability: {summary['stability']['category']}
+        ({summary['stability']['score']})</p>
     </section>
 
     <section class="section">
@@ -471,8 +658,17 @@ def render_route_page(route: dict, sigwx_paths: dict, mode_info: dict) -> str:
         <tr><th>Aerodrome</th><th>METAR</th><th>TAF</th></tr>
         {metar_rows}
       </table>
-      <p>TAF expiry: Dep {route['taf_time_to_expiry']['dep']['hours'] or '--'}h |
-        Dest {route['taf_time_to_expiry']['dest']['hours'] or '--'}h</p>
+      <p>TAF expiry: Dep {taf_expiry['dep']['hours'] or '--'}h |
+        Dest {taf_expiry['dest']['hours'] or '--'}h</p>
+    </section>
+
+    <section class="section">
+      <h3>En-route aerodromes</h3>
+      <table class="table">
+        <tr><th>Aerodrome</th><th>Off track (NM)</th><th>Flags</th></tr>
+        {en_route_rows}
+      </table>
+      <p>Nearest alternates: {nearest or '--'}</p>
     </section>
 
     <section class="section">
@@ -490,6 +686,21 @@ def render_route_page(route: dict, sigwx_paths: dict, mode_info: dict) -> str:
       <p>Freezing level estimate: {route['freezing_level_ft'] or 'Unknown'} ft</p>
     </section>
 
+    <section class="section">
+      <h3>Legs</h3>
+      <p>{plan_basis}</p>
+      <table class="table">
+        <tr><th>Leg</th><th>Distance (NM)</th><th>Track</th><th>Ground speed (kt)</th>
+          <th>Time (min)</th><th>ETA</th></tr>
+        {leg_rows}
+      </table>
+      <p>TAF at ETA: {taf_at_eta}</p>
+      <table class="table">
+        <tr><th>Aircraft</th><th>Minimum time</th><th>Minimum risk</th></tr>
+        {optimum_rows}
+      </table>
+    </section>
+
     <section class="section">
       <h3>SIGMET / AIRMET</h3>
       <div class="grid">{sigmet_cards}</div>
@@ -508,15 +719,12 @@ def render_route_page(route: dict, sigwx_paths: dict, mode_info: dict) -> str:
     </section>
     """
     return page_wrapper(
-        f"{route['route_id']} route pack",
-        body,
-        mode_info,
-        active_tab="routes",
-        prefix="../",
+        f"{route['route_id']} route pack", body, mode_info, active_tab="routes", prefix="../"
     )
 
 
-def render_tools_index(mode_info: dict) -> str:
+@timed("render.tools")
+def render_tools_index(mode_info: dict) -> Page:
     body = """
     <section class="summary">
       <h2>Training Tools</h2>
@@ -547,7 +755,8 @@ def render_tools_index(mode_info: dict) -> str:
     )
 
 
-def render_tool_page(title: str, content: str, mode_info: dict) -> str:
+@timed("render.tools")
+def render_tool_page(title: str, content: str, mode_info: dict) -> Page:
     body = f"""
     <section class="summary">
       <h2>{title}</h2>
@@ -1,10 +1,62 @@
 from __future__ import annotations
 
+import gzip
 import json
 from pathlib import Path
 from typing import Any
 
+from src.build.manifest import content_digest
+from src.build.output import open_text, write_bytes
+from src.profiling import phase
 
-def write_json(path: Path, data: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+try:
+    import brotli
+except ImportError:  # optional: only needed for .br siblings
+    brotli = None
+
+COMPRESSIONS = ("gz", "br")
+INDENTED = json.JSONEncoder(indent=2)
+
+
+def available_compressions() -> tuple[str, ...]:
+    return tuple(name for name in COMPRESSIONS if name != "br" or brotli is not None)
+
+
+def write_compressed(path: Path, payload: bytes, encodings: tuple[str, ...]) -> None:
+    """Write precompressed ``<path>.gz``/``<path>.br`` siblings for static hosting."""
+    for encoding in encodings:
+        if encoding == "gz":
+            # mtime=0 keeps the output byte-identical across builds.
+            data = gzip.compress(payload, compresslevel=9, mtime=0)
+        elif encoding == "br" and brotli is not None:
+            data = brotli.compress(payload)
+        else:
+            continue
+        write_bytes(path.with_name(f"{path.name}.{encoding}"), data)
+
+
+def write_json(
+    path: Path,
+    data: Any,
+    *,
+    minify: bool = False,
+    compress: tuple[str, ...] = (),
+) -> str | None:
+    """Write ``data`` as JSON, atomically.
+
+    Indented output (``latest.json``, snapshots) is streamed with ``iterencode`` so the full
+    document never exists as one string; CPython only uses its C encoder for unindented
+    one-shot dumps anyway. Minified output keeps the one-shot encoder and is held as bytes,
+    which the precompressed siblings need; its ``content_digest`` is returned.
+    """
+    if not minify:
+        with phase("encode"), open_text(path) as handle:
+            handle.writelines(INDENTED.iterencode(data))
+        return None
+    with phase("encode"):
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    write_bytes(path, payload)
+    if compress:
+        with phase("compress"):
+            write_compressed(path, payload, compress)
+    return content_digest(payload)
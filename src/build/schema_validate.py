@@ -2,11 +2,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from src.yaml_loader import load_yaml
+from src.yaml_loader import load_yaml_path
 
 ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = ROOT / "data"
-PACKS_DIR = DATA_DIR / "packs"
 
 
 def _require_keys(item: dict, keys: list[str], label: str) -> None:
@@ -15,8 +14,7 @@ def _require_keys(item: dict, keys: list[str], label: str) -> None:
             raise ValueError(f"Missing {key} in {label}")
 
 
-def validate_aerodromes(path: Path) -> None:
-    data = load_yaml(path.read_text(encoding="utf-8"))
+def validate_aerodromes(data: dict) -> None:
     for item in data.get("aerodromes", []):
         _require_keys(
             item,
@@ -37,8 +35,7 @@ def validate_aerodromes(path: Path) -> None:
             )
 
 
-def validate_routes(path: Path) -> None:
-    data = load_yaml(path.read_text(encoding="utf-8"))
+def validate_routes(data: dict) -> None:
     for route in data.get("routes", []):
         _require_keys(
             route,
@@ -47,8 +44,7 @@ def validate_routes(path: Path) -> None:
         )
 
 
-def validate_profiles(path: Path) -> None:
-    data = load_yaml(path.read_text(encoding="utf-8"))
+def validate_profiles(data: dict) -> None:
     for profile in data.get("profiles", []):
         _require_keys(
             profile,
@@ -70,22 +66,27 @@ def validate_profiles(path: Path) -> None:
         )
 
 
-def validate_aircraft(path: Path) -> None:
-    data = load_yaml(path.read_text(encoding="utf-8"))
+def validate_aircraft(data: dict) -> None:
     for item in data.get("aircraft", []):
         _require_keys(item, ["type", "demonstrated_crosswind_kt", "notes"], "aircraft")
 
 
-def validate_all() -> None:
-    validate_aerodromes(DATA_DIR / "aerodromes.yaml")
-    validate_routes(DATA_DIR / "routes.yaml")
-    validate_profiles(DATA_DIR / "profiles.yaml")
-    validate_aircraft(DATA_DIR / "aircraft.yaml")
+def validate_all(data_dir: Path = DATA_DIR, cache_dir: Path | None = None) -> None:
+    """Validate every data file, parsed through the same memoised loader the build uses."""
 
-    for pack in PACKS_DIR.glob("*/aerodromes.yaml"):
-        validate_aerodromes(pack)
-    for pack_routes in PACKS_DIR.glob("*/routes.yaml"):
-        validate_routes(pack_routes)
+    def load(path: Path) -> dict:
+        return load_yaml_path(path, cache_dir)
+
+    validate_aerodromes(load(data_dir / "aerodromes.yaml"))
+    validate_routes(load(data_dir / "routes.yaml"))
+    validate_profiles(load(data_dir / "profiles.yaml"))
+    validate_aircraft(load(data_dir / "aircraft.yaml"))
+
+    packs_dir = data_dir / "packs"
+    for pack in packs_dir.glob("*/aerodromes.yaml"):
+        validate_aerodromes(load(pack))
+    for pack_routes in packs_dir.glob("*/routes.yaml"):
+        validate_routes(load(pack_routes))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+"""Content-addressed storage for snapshots under ``site/api/snapshots/``.
+
+A snapshot's ``<id>.json`` is a small manifest. Every object or array in it whose encoding
+is at least ``MIN_CHUNK_BYTES`` is stored once as ``objects/<hash>.json`` and replaced by
+``{"$ref": "<hash>"}``, bottom-up, so unchanged parts (profiles, runways, lighting, the
+airfields embedded in routes, ...) are shared by every snapshot that contains them.
+
+``python -m src.build.snapshot_store compact site/api/snapshots`` converts full-copy
+snapshots to this layout and drops unreferenced objects; ``measure`` reports the stored
+size against the size of the fully expanded snapshots.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from src.build.output import write_bytes
+from src.build.render_json import write_json
+
+OBJECTS_DIR = "objects"
+MIN_CHUNK_BYTES = 256
+REF = "$ref"
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(REF), str)
+
+
+def split(value: Any, objects: dict[str, bytes]) -> Any:
+    """``value`` with large objects/arrays replaced by refs; their encodings go to ``objects``."""
+    if isinstance(value, dict):
+        value = {key: split(item, objects) for key, item in value.items()}
+    elif isinstance(value, list):
+        value = [split(item, objects) for item in value]
+    else:
+        return value
+    encoded = _encode(value)
+    if len(encoded) < MIN_CHUNK_BYTES:
+        return value
+    key = hashlib.sha256(encoded).hexdigest()[:20]
+    objects[key] = encoded
+    return {REF: key}
+
+
+def write_snapshot(snapshots_dir: Path, snapshot: dict) -> int:
+    """Store ``snapshot`` as ``<id>.json`` plus any objects not already stored.
+
+    Returns the bytes of new objects written, i.e. what this snapshot adds to the repo on top
+    of its manifest.
+    """
+    objects: dict[str, bytes] = {}
+    manifest = {key: split(value, objects) for key, value in snapshot.items()}
+    added = 0
+    for key, encoded in objects.items():
+        path = snapshots_dir / OBJECTS_DIR / f"{key}.json"
+        if not path.exists():
+            write_bytes(path, encoded)
+            added += len(encoded)
+    write_json(snapshots_dir / f"{snapshot['id']}.json", manifest)
+    return added
+
+
+def resolve(value: Any, snapshots_dir: Path, cache: dict[str, Any] | None = None) -> Any:
+    """Reassemble ``value`` by loading every ref it contains, recursively."""
+    cache = {} if cache is None else cache
+    if _is_ref(value):
+        key = value[REF]
+        if key not in cache:
+            path = snapshots_dir / OBJECTS_DIR / f"{key}.json"
+            cache[key] = resolve(json.loads(path.read_text(encoding="utf-8")), snapshots_dir, cache)
+        return cache[key]
+    if isinstance(value, dict):
+        return {key: resolve(item, snapshots_dir, cache) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, snapshots_dir, cache) for item in value]
+    return value
+
+
+def load_snapshot(snapshots_dir: Path, snapshot_id: str) -> dict:
+    """The full snapshot, whether stored as a manifest or as a legacy full copy."""
+    path = snapshots_dir / f"{snapshot_id}.json"
+    return resolve(json.loads(path.read_text(encoding="utf-8")), snapshots_dir)
+
+
+def _manifests(snapshots_dir: Path) -> list[Path]:
+    return sorted(snapshots_dir.glob("*.json"))
+
+
+def _refs(value: Any, found: set[str], snapshots_dir: Path) -> None:
+    if _is_ref(value):
+        key = value[REF]
+        if key not in found:
+            found.add(key)
+            path = snapshots_dir / OBJECTS_DIR / f"{key}.json"
+            _refs(json.loads(path.read_text(encoding="utf-8")), found, snapshots_dir)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _refs(item, found, snapshots_dir)
+    elif isinstance(value, list):
+        for item in value:
+            _refs(item, found, snapshots_dir)
+
+
+def stored_bytes(snapshots_dir: Path) -> int:
+    return sum(path.stat().st_size for path in snapshots_dir.rglob("*.json"))
+
+
+def expanded_bytes(snapshots_dir: Path) -> int:
+    """Size the snapshots would take as indented full copies (the pre-store layout)."""
+    return sum(
+        len(json.dumps(load_snapshot(snapshots_dir, path.stem), indent=2).encode("utf-8"))
+        for path in _manifests(snapshots_dir)
+    )
+
+
+def compact(snapshots_dir: Path) -> dict[str, int]:
+    """Re-store every snapshot through ``write_snapshot`` and delete unreferenced objects."""
+    before = stored_bytes(snapshots_dir)
+    manifests = _manifests(snapshots_dir)
+    for path in manifests:
+        write_snapshot(snapshots_dir, load_snapshot(snapshots_dir, path.stem))
+
+    referenced: set[str] = set()
+    for path in manifests:
+        _refs(json.loads(path.read_text(encoding="utf-8")), referenced, snapshots_dir)
+    removed = 0
+    for path in sorted((snapshots_dir / OBJECTS_DIR).glob("*.json")):
+        if path.stem not in referenced:
+            path.unlink()
+            removed += 1
+    return {
+        "snapshots": len(manifests),
+        "objects": len(referenced),
+        "removed_objects": removed,
+        "bytes_before": before,
+        "bytes_after": stored_bytes(snapshots_dir),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["compact", "measure"])
+    parser.add_argument("snapshots_dir", type=Path, nargs="?", default=Path("site/api/snapshots"))
+    args = parser.parse_args()
+    if args.command == "compact":
+        result = compact(args.snapshots_dir)
+        print(
+            f"Compacted {result['snapshots']} snapshots into {result['objects']} objects "
+            f"({result['removed_objects']} unreferenced removed): "
+            f"{result['bytes_before']:,} → {result['bytes_after']:,} bytes"
+        )
+    else:
+        stored = stored_bytes(args.snapshots_dir)
+        expanded = expanded_bytes(args.snapshots_dir)
+        ratio = expanded / stored if stored else 0.0
+        print(
+            f"{len(_manifests(args.snapshots_dir))} snapshots: {stored:,} bytes stored, "
+            f"{expanded:,} bytes as full copies ({ratio:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
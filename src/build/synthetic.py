@@ -0,0 +1,326 @@
+"""Synthetic data directories for scale-testing the build.
+
+``python -m src.build.synthetic OUT --aerodromes 1000 --routes 300`` writes a complete data
+dir (profiles, aircraft, shared samples and one synthetic country pack with matching
+METAR/TAF/NOTAM samples and history) that passes ``validate_all``. Build it with
+``python -m src.build.build_site --data-dir OUT --site-dir OUT/site --profile``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import shutil
+import string
+from pathlib import Path
+
+from src.build.history_store import open_history_store
+
+ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT / "data"
+COUNTRY = "SY"
+SURFACES = ("ASPH", "ASPH", "ASPH", "TAR", "GRASS")
+OPS_HOURS = ("H24", "Daylight", "HR")
+CRUISE_LEVELS_FT = (3000, 5000, 7000, 9000, 11000, 12000, 18000, 24000, 30000)
+WEATHER = ("-RA", "RA", "+TSRA", "BR", "FG", "VCSH", "-SHRA", "HZ", "-DZ", "TSRA")
+COVERS = ("FEW", "SCT", "BKN", "OVC")
+NOTAM_SUBJECTS = (
+    "RWY {rwy} CLSD 1200-1400 UTC DAILY DUE WIP.",
+    "RWY {rwy} WET. BRAKING ACTION MEDIUM.",
+    "TWY A CLSD BETWEEN A2-A4.",
+    "PAPI RWY {rwy} U/S.",
+    "BIRD CONCENTRATION IN VICINITY OF AD.",
+)
+SHARED_SAMPLES = ("sigmet", "sigwx", "winds_temps")
+
+
+def synthetic_idents(count: int, prefix: str = "S") -> list[str]:
+    """Distinct four-letter idents ``<prefix>AAA``, ``<prefix>AAB``, ... (up to 17,576)."""
+    letters = string.ascii_uppercase
+    if count > len(letters) ** 3:
+        raise ValueError(f"At most {len(letters) ** 3} synthetic idents per prefix")
+    return [
+        prefix + letters[index // 676] + letters[index // 26 % 26] + letters[index % 26]
+        for index in range(count)
+    ]
+
+
+def synthetic_aerodrome(ident: str, rng: random.Random) -> dict:
+    heading = rng.randrange(10, 190, 10)
+    length = rng.randrange(800, 4000, 50)
+    surface = rng.choice(SURFACES)
+    lit = "no" if surface == "GRASS" else rng.choice(("yes", "yes", "no"))
+    return {
+        "ident": ident,
+        "name": f"Synthetic {ident}",
+        "elevation_m": rng.randint(0, 2200),
+        "latitude_deg": round(rng.uniform(-34.5, 4.5), 4),
+        "longitude_deg": round(rng.uniform(11.0, 40.5), 4),
+        "night_ops_allowed": lit,
+        "lighting": {"runway_edge": lit, "threshold": lit, "taxiway": lit, "apron": lit},
+        "ppr_required": rng.choice(("yes", "no", "no")),
+        "ops_hours": "Daylight" if lit == "no" else rng.choice(OPS_HOURS),
+        "notes": "Synthetic scale-test aerodrome.",
+        "airspace_context": {
+            "ctr": rng.choice(("yes", "no")),
+            "tma": rng.choice(("yes", "no")),
+            "class": rng.choice(("C", "D", "G")),
+        },
+        "circuit": {"direction": rng.choice(("L", "R")), "height_ft_agl": 1000},
+        "noise_abatement_notes": "Synthetic.",
+        "runways": [
+            {
+                "designator": f"{heading // 10:02d}",
+                "magnetic_heading_deg": heading,
+                "length_m": length,
+                "surface": surface,
+            },
+            {
+                "designator": f"{heading // 10 + 18:02d}",
+                "magnetic_heading_deg": heading + 180,
+                "length_m": length,
+                "surface": surface,
+            },
+        ],
+    }
+
+
+def synthetic_route(idents: list[str], rng: random.Random) -> dict:
+    dep, dest, *others = rng.sample(idents, min(len(idents), 6))
+    via = others[: rng.choice((0, 0, 1, 2))]
+    alternates = others[len(via) : len(via) + rng.choice((1, 2))]
+    levels = sorted(rng.sample(CRUISE_LEVELS_FT, rng.randint(3, 6)))
+    route = {
+        "route_id": f"{dep}-{dest}",
+        "dep": dep,
+        "dest": dest,
+        "alternates": alternates,
+        "corridor_nm": rng.choice((15, 25, 35, 50)),
+        "cruise_levels_ft": levels,
+    }
+    if via:
+        route["via"] = via
+    return route
+
+
+def _temp(value: int) -> str:
+    return f"M{-value:02d}" if value < 0 else f"{value:02d}"
+
+
+def synthetic_metar(ident: str, observed: dt.datetime, rng: random.Random) -> str:
+    speed = rng.randint(0, 30)
+    parts = [ident, observed.strftime("%d%H%MZ")]
+    direction = "VRB" if speed < 3 else f"{rng.randrange(10, 370, 10):03d}"
+    gust = f"G{speed + rng.randint(8, 18):02d}" if speed > 12 and rng.random() < 0.3 else ""
+    parts.append(f"{direction}{speed:02d}{gust}KT")
+    if rng.random() < 0.3:
+        parts.append("CAVOK")
+    else:
+        parts.append(rng.choice(("9999", "9999", "8000", "5000", "3000", "1500", "0800")))
+        parts.extend(rng.sample(WEATHER, rng.choice((0, 0, 0, 1, 2))))
+        base = rng.randint(3, 30)
+        for _ in range(rng.choice((0, 1, 1, 2, 3))):
+            parts.append(f"{rng.choice(COVERS)}{base:03d}")
+            base += rng.randint(5, 40)
+    temp = rng.randint(-5, 38)
+    parts.append(f"{_temp(temp)}/{_temp(temp - rng.randint(0, 20))}")
+    parts.append(f"Q{rng.randint(995, 1030)}")
+    parts.append("NOSIG")
+    return " ".join(parts)
+
+
+def synthetic_taf(ident: str, issued: dt.datetime, rng: random.Random) -> str:
+    start = issued + dt.timedelta(hours=1)
+    end = start + dt.timedelta(hours=24)
+    tempo_start = start + dt.timedelta(hours=rng.randint(2, 8))
+    change = start + dt.timedelta(hours=rng.randint(10, 20))
+
+    def period(moment: dt.datetime) -> str:
+        return moment.strftime("%d%H")
+
+    wind = f"{rng.randrange(10, 370, 10):03d}{rng.randint(3, 20):02d}KT"
+    parts = [
+        "TAF",
+        ident,
+        issued.strftime("%d%H%MZ"),
+        f"{period(start)}/{period(end)}",
+        wind,
+        "9999",
+        f"SCT{rng.randint(15, 40):03d}",
+    ]
+    roll = rng.random()
+    if roll < 0.3:
+        parts += [
+            "PROB30 TEMPO",
+            f"{period(tempo_start)}/{period(tempo_start + dt.timedelta(hours=4))}",
+            f"3000 +TSRA BKN{rng.randint(6, 15):03d}CB",
+        ]
+    elif roll < 0.6:
+        parts += [
+            "TEMPO",
+            f"{period(tempo_start)}/{period(tempo_start + dt.timedelta(hours=4))}",
+            f"4000 SHRA BKN{rng.randint(10, 25):03d}",
+        ]
+    if rng.random() < 0.5:
+        parts += [change.strftime("FM%d%H%M"), f"{rng.randrange(10, 370, 10):03d}10KT CAVOK"]
+    return " ".join(parts)
+
+
+def synthetic_notams(airfield: dict, rng: random.Random) -> list[str]:
+    runway = airfield["runways"][0]["designator"]
+    subjects = rng.sample(NOTAM_SUBJECTS, rng.randint(1, 3))
+    return [
+        f"A{rng.randint(1000, 9999)}/{airfield['ident']} {subject.format(rwy=runway)}"
+        for subject in subjects
+    ]
+
+
+def synthetic_history(observed: dt.datetime, hours: int, rng: random.Random) -> list[dict]:
+    """Hourly history entries ending an hour before ``observed`` with a random QNH drift."""
+    qnh = rng.randint(1000, 1025)
+    entries = []
+    for offset in range(hours, 0, -1):
+        qnh += rng.choice((-1, 0, 0, 1))
+        temp = rng.randint(5, 30)
+        entries.append(
+            {
+                "timestamp": (observed - dt.timedelta(hours=offset))
+                .isoformat()
+                .replace("+00:00", "Z"),
+                "wind_speed_kt": rng.randint(0, 25),
+                "wind_dir_deg": rng.randrange(10, 370, 10),
+                "qnh_hpa": qnh,
+                "temp_c": temp,
+                "dewpoint_c": temp - rng.randint(0, 15),
+                "visibility_m": rng.choice((9999, 9999, 8000, 5000)),
+                "ceiling_ft_est": rng.choice((None, 1500, 3000, 4500)),
+            }
+        )
+    return entries
+
+
+def _yaml_scalar(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, list):
+        return "[" + ", ".join(_yaml_scalar(item) for item in value) + "]"
+    return f'"{value}"'
+
+
+def _yaml_mapping(data: dict, indent: int, lines: list[str]) -> None:
+    pad = " " * indent
+    for key, value in data.items():
+        if isinstance(value, dict):
+            lines.append(f"{pad}{key}:")
+            _yaml_mapping(value, indent + 2, lines)
+        elif isinstance(value, list) and value and isinstance(value[0], dict):
+            lines.append(f"{pad}{key}:")
+            for item in value:
+                item_lines: list[str] = []
+                _yaml_mapping(item, indent + 4, item_lines)
+                item_lines[0] = f"{pad}  - {item_lines[0].lstrip()}"
+                lines.extend(item_lines)
+        else:
+            lines.append(f"{pad}{key}: {_yaml_scalar(value)}")
+
+
+def dump_yaml(data: dict) -> str:
+    """Serialise ``data`` in the subset of YAML that ``load_yaml`` reads.
+
+    Items of a list of mappings must start with a scalar key (``ident``, ``route_id``, ...).
+    """
+    lines: list[str] = []
+    _yaml_mapping(data, 0, lines)
+    return "\n".join(lines) + "\n"
+
+
+def write_synthetic_data(
+    out_dir: Path,
+    aerodromes: int,
+    routes: int,
+    *,
+    seed: int = 0,
+    history_hours: int = 12,
+    now: dt.datetime | None = None,
+) -> dict:
+    """Write a self-contained data dir with one synthetic pack and return its counts."""
+    rng = random.Random(seed)
+    now = (now or dt.datetime.now(dt.timezone.utc)).replace(minute=0, second=0, microsecond=0)
+    observed = now - dt.timedelta(minutes=30)
+
+    for name in ("profiles.yaml", "aircraft.yaml"):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(DATA_DIR / name, out_dir / name)
+    (out_dir / "aerodromes.yaml").write_text("aerodromes: []\n", encoding="utf-8")
+    (out_dir / "routes.yaml").write_text("routes: []\n", encoding="utf-8")
+    samples_dir = out_dir / "samples"
+    for name in SHARED_SAMPLES:
+        shutil.copytree(DATA_DIR / "samples" / name, samples_dir / name, dirs_exist_ok=True)
+
+    idents = synthetic_idents(aerodromes)
+    airfields = [synthetic_aerodrome(ident, rng) for ident in idents]
+    route_items: dict[str, dict] = {}
+    # Bounded retries: asking for more routes than distinct dep/dest pairs must still end.
+    for _ in range(routes * 10 if len(idents) > 1 else 0):
+        if len(route_items) >= routes:
+            break
+        route = synthetic_route(idents, rng)
+        route_items.setdefault(route["route_id"], route)
+
+    pack_dir = out_dir / "packs" / COUNTRY
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    pack = {
+        "country": COUNTRY,
+        "reference_note": "Synthetic scale-test data.",
+        "aerodromes": airfields,
+    }
+    (pack_dir / "aerodromes.yaml").write_text(dump_yaml(pack), encoding="utf-8")
+    (pack_dir / "routes.yaml").write_text(
+        dump_yaml({"routes": list(route_items.values())}), encoding="utf-8"
+    )
+
+    for kind in ("metar", "taf", "notam"):
+        (samples_dir / kind).mkdir(parents=True, exist_ok=True)
+    with open_history_store(out_dir / "history") as store:
+        for airfield in airfields:
+            ident = airfield["ident"]
+            (samples_dir / "metar" / f"{ident}.txt").write_text(
+                synthetic_metar(ident, observed, rng), encoding="utf-8"
+            )
+            (samples_dir / "taf" / f"{ident}.txt").write_text(
+                synthetic_taf(ident, now - dt.timedelta(hours=1), rng), encoding="utf-8"
+            )
+            (samples_dir / "notam" / f"{ident}.txt").write_text(
+                "\n".join(synthetic_notams(airfield, rng)), encoding="utf-8"
+            )
+            for entry in synthetic_history(observed, history_hours, rng):
+                store.append(ident, entry)
+
+    return {"aerodromes": len(airfields), "routes": len(route_items)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir", type=Path, help="Data dir to create (or update)")
+    parser.add_argument("--aerodromes", type=int, default=1000)
+    parser.add_argument("--routes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history-hours", type=int, default=12)
+    args = parser.parse_args()
+    counts = write_synthetic_data(
+        args.out_dir,
+        args.aerodromes,
+        args.routes,
+        seed=args.seed,
+        history_hours=args.history_hours,
+    )
+    print(
+        f"Wrote {counts['aerodromes']} aerodromes and {counts['routes']} routes to {args.out_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
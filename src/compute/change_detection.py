@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 
-def _category_vis(vis_m: int | None) -> str:
+def category_vis(vis_m: int | None) -> str:
     if vis_m is None:
         return "unknown"
     if vis_m < 1000:
@@ -11,7 +11,7 @@ def _category_vis(vis_m: int | None) -> str:
     return "normal"
 
 
-def _category_ceiling(ceiling_ft: int | None) -> str:
+def category_ceiling(ceiling_ft: int | None) -> str:
     if ceiling_ft is None:
         return "unknown"
     if ceiling_ft < 500:
@@ -36,12 +36,12 @@ def detect_changes(previous: dict | None, current: dict) -> dict:
         )
         - ((previous.get("temp_c") or 0) - (previous.get("dewpoint_c") or 0)),
         "ceiling_category": {
-            "from": _category_ceiling(previous.get("ceiling_ft_est")),
-            "to": _category_ceiling(current.get("ceiling_ft_est")),
+            "from": category_ceiling(previous.get("ceiling_ft_est")),
+            "to": category_ceiling(current.get("ceiling_ft_est")),
         },
         "visibility_category": {
-            "from": _category_vis(previous.get("visibility_m")),
-            "to": _category_vis(current.get("visibility_m")),
+            "from": category_vis(previous.get("visibility_m")),
+            "to": category_vis(current.get("visibility_m")),
         },
     }
     summary = (
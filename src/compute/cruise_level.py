@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+from src.compute.route import leg_track_units
+from src.compute.winds_grid import at_level, column_rows, freezing_level_ft
+
+LEVEL_STEP_FT = 1000
+# Nominal cost of a climb or descent between legs, so a profile only steps for a real gain.
+LEVEL_CHANGE_MINUTES = 2.0
+ICING_MIN_TEMP_C = -20.0
+ICING = "ICING"
+HAZARD_WEIGHTS = {"TS": 3.0, "TURB": 2.0, "ICE": 2.0, ICING: 1.0}
+
+
+def candidate_levels(
+    cruise_levels_ft: Iterable[int], ceiling_ft: float | None = None, step_ft: int = LEVEL_STEP_FT
+) -> list[int]:
+    """The route's cruise levels plus every ``step_ft`` between them, up to ``ceiling_ft``."""
+    levels = set(cruise_levels_ft)
+    if not levels:
+        return []
+    levels.update(range(math.ceil(min(levels) / step_ft) * step_ft, max(levels) + 1, step_ft))
+    return sorted(level for level in levels if ceiling_ft is None or level <= ceiling_ft)
+
+
+def level_hazards(
+    level_ft: float,
+    temp_c: float,
+    freezing_ft: float | None,
+    hazards: Iterable[dict],
+    leg: int | None = None,
+) -> list[str]:
+    """Phenomena whose vertical band contains ``level_ft``, plus icing above the freezing level.
+
+    A hazard may carry ``legs``, the leg indices it affects; without it, it affects every leg.
+    """
+    found = [
+        hazard["phenomenon"]
+        for hazard in hazards
+        if hazard["base_ft"] <= level_ft <= hazard["top_ft"]
+        and (leg is None or "legs" not in hazard or leg in hazard["legs"])
+    ]
+    if freezing_ft is not None and level_ft >= freezing_ft and temp_c >= ICING_MIN_TEMP_C:
+        found.append(ICING)
+    return found
+
+
+def _best_profile(
+    levels: list[int],
+    minutes: list[list[float]],
+    exposure: list[list[float]],
+    risk_first: bool,
+    change_minutes: float,
+) -> list[int] | None:
+    """Level index per leg minimising (time, exposure), or (exposure, time) if ``risk_first``.
+
+    Dynamic programming over legs: staying at a level is free, changing costs
+    ``change_minutes``, so each leg only needs the cheapest way to reach every level.
+    """
+
+    def cell(row: int, leg: int) -> tuple[float, float]:
+        if math.isinf(minutes[row][leg]):
+            return math.inf, math.inf
+        pair = (minutes[row][leg], exposure[row][leg])
+        return pair[::-1] if risk_first else pair
+
+    def add(first: tuple[float, float], second: tuple[float, float]) -> tuple[float, float]:
+        return first[0] + second[0], first[1] + second[1]
+
+    change = (0.0, change_minutes) if risk_first else (change_minutes, 0.0)
+    rows = range(len(levels))
+    legs = len(minutes[0]) if minutes else 0
+    if not legs:
+        return None
+    costs = [cell(row, 0) for row in rows]
+    parents: list[list[int]] = []
+    for leg in range(1, legs):
+        cheapest = min(rows, key=costs.__getitem__)
+        via_change = add(costs[cheapest], change)
+        step_parents = []
+        step_costs = []
+        for row in rows:
+            parent = row if costs[row] <= via_change else cheapest
+            step_parents.append(parent)
+            step_costs.append(add(min(costs[row], via_change), cell(row, leg)))
+        parents.append(step_parents)
+        costs = step_costs
+    row = min(rows, key=costs.__getitem__)
+    if math.isinf(costs[row][0]):
+        return None
+    profile = [row]
+    for step_parents in reversed(parents):
+        row = step_parents[row]
+        profile.append(row)
+    return profile[::-1]
+
+
+def optimise_cruise_level(
+    legs: list[dict],
+    table: list[dict],
+    candidates_ft: Iterable[int],
+    tas_kt: float,
+    hazards: Iterable[dict] = (),
+    change_minutes: float = LEVEL_CHANGE_MINUTES,
+) -> dict:
+    """Minimum-time and minimum-risk level profiles (a level per leg) over ``candidates_ft``.
+
+    Every candidate inside the winds/temps column is evaluated on every leg; a leg with its
+    own ``winds`` table (sampled along its path) uses that instead of ``table``. Risk is
+    hazard exposure: the minutes spent at a level inside a hazard's band (SIGMET/AIRMET FL
+    bands, and icing between the freezing level and -20 °C), weighted by ``HAZARD_WEIGHTS``.
+    Candidates should already be limited to the aircraft's ceiling.
+    """
+    hazards = list(hazards)
+    freezing_ft = freezing_level_ft(table)
+    units = leg_track_units(legs)
+    shared = column_rows(table)
+    leg_rows = [column_rows(leg["winds"]) if leg.get("winds") else shared for leg in legs]
+    leg_freezing = [
+        freezing_level_ft(leg["winds"]) if leg.get("winds") else freezing_ft for leg in legs
+    ]
+    levels: list[int] = []
+    minutes: list[list[float]] = []
+    exposure: list[list[float]] = []
+    found: list[list[list[str]]] = []
+    for level_ft in candidates_ft:
+        points = [at_level(rows, level_ft) for rows in leg_rows]
+        if not points or None in points:
+            continue
+        row_minutes = []
+        row_exposure = []
+        row_found = []
+        for index, (leg, (cos_t, sin_t), (north, east, temp_c)) in enumerate(
+            zip(legs, units, points)
+        ):
+            speed = tas_kt - (north * cos_t + east * sin_t)
+            leg_minutes = 60 * leg["distance_nm"] / speed if speed > 0 else math.inf
+            names = level_hazards(level_ft, temp_c, leg_freezing[index], hazards, index)
+            weight = sum(HAZARD_WEIGHTS.get(name, 1.0) for name in names)
+            row_minutes.append(leg_minutes)
+            row_exposure.append(weight * leg_minutes if weight else 0.0)
+            row_found.append(names)
+        levels.append(level_ft)
+        minutes.append(row_minutes)
+        exposure.append(row_exposure)
+        found.append(row_found)
+
+    def describe(profile: list[int] | None) -> dict | None:
+        if profile is None:
+            return None
+        return {
+            "levels_ft": [levels[row] for row in profile],
+            "total_minutes": round(sum(minutes[row][leg] for leg, row in enumerate(profile)), 1),
+            "hazard_minutes": round(
+                sum(minutes[row][leg] for leg, row in enumerate(profile) if found[row][leg]), 1
+            ),
+            "hazard_exposure": round(sum(exposure[row][leg] for leg, row in enumerate(profile)), 1),
+            "hazards": [found[row][leg] for leg, row in enumerate(profile)],
+            "level_changes": sum(
+                1 for first, second in zip(profile, profile[1:]) if first != second
+            ),
+        }
+
+    return {
+        "freezing_level_ft": int(round(freezing_ft, -2)) if freezing_ft is not None else None,
+        "evaluated_levels": levels,
+        "min_time": describe(_best_profile(levels, minutes, exposure, False, change_minutes)),
+        "min_risk": describe(_best_profile(levels, minutes, exposure, True, change_minutes)),
+    }
@@ -2,16 +2,16 @@ from __future__ import annotations
 
 import math
 
+from src.compute.spatial import haversine_nm
+from src.compute.winds_grid import at_level, column_rows, wind_vector
+
 
 def bearing_deg(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     lat1_r = math.radians(lat1)
     lat2_r = math.radians(lat2)
     dlon = math.radians(lon2 - lon1)
     x = math.sin(dlon) * math.cos(lat2_r)
-    y = (
-        math.cos(lat1_r) * math.sin(lat2_r)
-        - math.sin(lat1_r) * math.cos(lat2_r) * math.cos(dlon)
-    )
+    y = math.cos(lat1_r) * math.sin(lat2_r) - math.sin(lat1_r) * math.cos(lat2_r) * math.cos(dlon)
     bearing = math.degrees(math.atan2(x, y))
     return (bearing + 360) % 360
 
@@ -29,3 +29,87 @@ def ground_speed_estimate(
 ) -> float:
     headwind = headwind_component(wind_dir_deg, wind_speed_kt, track_deg)
     return round(true_airspeed_kt - headwind, 1)
+
+
+def route_legs(waypoints: list[dict]) -> list[dict]:
+    """Great-circle distance and initial track of every leg between consecutive waypoints."""
+    return [
+        {
+            "from": start["ident"],
+            "to": end["ident"],
+            "distance_nm": haversine_nm(
+                start["latitude_deg"],
+                start["longitude_deg"],
+                end["latitude_deg"],
+                end["longitude_deg"],
+            ),
+            "track_deg": bearing_deg(
+                start["latitude_deg"],
+                start["longitude_deg"],
+                end["latitude_deg"],
+                end["longitude_deg"],
+            ),
+        }
+        for start, end in zip(waypoints, waypoints[1:])
+    ]
+
+
+def leg_track_units(legs: list[dict]) -> list[tuple[float, float]]:
+    """Each leg's track as a (north, east) unit vector."""
+    return [
+        (math.cos(math.radians(leg["track_deg"])), math.sin(math.radians(leg["track_deg"])))
+        for leg in legs
+    ]
+
+
+def level_plans(legs: list[dict], levels: list[dict], tas_kt: float) -> list[dict]:
+    """Headwind, ground speed, leg time and cumulative ETA for every level × leg.
+
+    ``headwind_component`` is ``speed * cos(wind - track)``, which splits into the wind's
+    north/east components dotted with the track's unit vector. Both are computed once, so
+    each cell of the table is one multiply-add. A leg with its own ``winds`` table (sampled
+    along its path) takes the level's wind from that instead. Legs a level cannot make good
+    (ground speed at or below zero) get ``None`` times from that leg on.
+    """
+    track_units = leg_track_units(legs)
+    leg_rows = [column_rows(leg["winds"]) if leg.get("winds") else None for leg in legs]
+    distances = [leg["distance_nm"] for leg in legs]
+    total_distance = sum(distances)
+    plans = []
+    for level in levels:
+        shared = wind_vector(level)
+        headwinds = []
+        for rows, (cos_t, sin_t) in zip(leg_rows, track_units):
+            point = at_level(rows, level["level_ft"]) if rows else None
+            north, east = point[:2] if point else shared
+            headwinds.append(north * cos_t + east * sin_t)
+        speeds = [tas_kt - headwind for headwind in headwinds]
+        minutes: list[float | None] = []
+        etas: list[float | None] = []
+        elapsed: float | None = 0.0
+        for distance, speed in zip(distances, speeds):
+            leg_minutes = 60 * distance / speed if speed > 0 else None
+            minutes.append(leg_minutes)
+            if elapsed is not None:
+                elapsed = elapsed + leg_minutes if leg_minutes is not None else None
+            etas.append(elapsed)
+        mean_speed = 60 * total_distance / elapsed if elapsed else None
+        plans.append(
+            {
+                "level_ft": level["level_ft"],
+                "temp_c": level.get("temp_c"),
+                "headwind_kt": [_round(headwind) for headwind in headwinds],
+                "ground_speed_kt": [_round(speed) for speed in speeds],
+                "leg_minutes": [_round(value) for value in minutes],
+                "eta_minutes": [_round(value) for value in etas],
+                "total_minutes": _round(elapsed),
+                "mean_ground_speed_kt": _round(mean_speed),
+                "mean_headwind_kt": _round(tas_kt - mean_speed if mean_speed else None),
+            }
+        )
+    return plans
+
+
+def _round(value: float | None) -> float | None:
+    # + 0.0 turns the -0.0 that round() can produce into 0.0.
+    return None if value is None else round(value, 1) + 0.0
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+from typing import Iterable
+
+from src.compute.spatial import segment_meets_polygon
+from src.compute.taf_timeline import resolve_taf_time
+
+Point = tuple[float, float]
+
+
+def band_overlaps(sigmet: dict, base_ft: float | None, top_ft: float | None) -> bool:
+    """Whether a SIGMET's FL band meets ``base_ft``..``top_ft``; no band meets everything."""
+    if sigmet["base_ft"] is None or base_ft is None or top_ft is None:
+        return True
+    return sigmet["base_ft"] <= top_ft and base_ft <= sigmet["top_ft"]
+
+
+class SigmetIndex:
+    """Decoded SIGMETs/AIRMETs bucketed by the grid cells their polygons cover.
+
+    A route query only tests the SIGMETs in cells its legs pass through, so its cost follows
+    the hazards near the route rather than the number issued. SIGMETs for a whole FIR
+    (no ``WI`` polygon) have no boundary to test against and meet every route. Polygon
+    edges and legs are straight lines in lat/lon, as they are drawn on the charts; pass
+    legs already split into short pieces (``path_points``) to follow the great circle.
+    """
+
+    def __init__(
+        self,
+        sigmets: Iterable[dict],
+        reference: dt.datetime | None = None,
+        cell_deg: float = 1.0,
+    ) -> None:
+        self.cell_deg = cell_deg
+        self.sigmets = list(sigmets)
+        self.polygons: dict[int, list[Point]] = {}
+        self.fir_wide: list[int] = []
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        self.windows: list[tuple[dt.datetime | None, dt.datetime | None]] = []
+        for index, sigmet in enumerate(self.sigmets):
+            area = sigmet["area"]
+            if area["type"] == "polygon":
+                polygon = [tuple(point) for point in area["points"]]
+                self.polygons[index] = polygon
+                lats = [lat for lat, _ in polygon]
+                lons = [lon for _, lon in polygon]
+                for cell in self._cells(min(lats), max(lats), min(lons), max(lons)):
+                    self.cells.setdefault(cell, []).append(index)
+            else:
+                self.fir_wide.append(index)
+            self.windows.append(self._window(sigmet, reference))
+
+    @staticmethod
+    def _window(
+        sigmet: dict, reference: dt.datetime | None
+    ) -> tuple[dt.datetime | None, dt.datetime | None]:
+        if reference is None or not sigmet["valid_from"] or not sigmet["valid_to"]:
+            return None, None
+        start = resolve_taf_time(sigmet["valid_from"], reference)
+        end = resolve_taf_time(sigmet["valid_to"], start or reference)
+        return start, end
+
+    def _cells(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float):
+        for row in range(
+            math.floor(lat_min / self.cell_deg), math.floor(lat_max / self.cell_deg) + 1
+        ):
+            for column in range(
+                math.floor(lon_min / self.cell_deg), math.floor(lon_max / self.cell_deg) + 1
+            ):
+                yield row, column
+
+    def valid_to(self, index: int) -> dt.datetime | None:
+        return self.windows[index][1]
+
+    def in_force(self, index: int, start: dt.datetime | None, end: dt.datetime | None) -> bool:
+        """Whether SIGMET ``index`` is valid at some time in ``start``..``end``.
+
+        SIGMETs without a validity group, and queries without times, always are.
+        """
+        valid_from, valid_to = self.windows[index]
+        if start is None or end is None or valid_from is None or valid_to is None:
+            return True
+        return valid_from <= end and start <= valid_to
+
+    def crossing(
+        self,
+        paths: list[list[Point]],
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        base_ft: float | None = None,
+        top_ft: float | None = None,
+    ) -> list[dict]:
+        """SIGMETs met by any leg path, in force in ``start``..``end`` and inside the band.
+
+        Each is returned with ``index`` (its position in the index) and ``legs``, the
+        indices of the paths it meets.
+        """
+        legs_by_sigmet: dict[int, list[int]] = {
+            index: list(range(len(paths))) for index in self.fir_wide
+        }
+        for leg, path in enumerate(paths):
+            for first, second in zip(path, path[1:]):
+                candidates = {
+                    index
+                    for cell in self._cells(
+                        min(first[0], second[0]),
+                        max(first[0], second[0]),
+                        min(first[1], second[1]),
+                        max(first[1], second[1]),
+                    )
+                    for index in self.cells.get(cell, ())
+                }
+                for index in candidates:
+                    legs = legs_by_sigmet.setdefault(index, [])
+                    if legs and legs[-1] == leg:
+                        continue
+                    if segment_meets_polygon(first, second, self.polygons[index]):
+                        legs.append(leg)
+        return [
+            {**self.sigmets[index], "index": index, "legs": legs}
+            for index, legs in sorted(legs_by_sigmet.items())
+            if (legs or index in self.fir_wide)
+            and self.in_force(index, start, end)
+            and band_overlaps(self.sigmets[index], base_ft, top_ft)
+        ]
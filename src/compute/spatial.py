@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+EARTH_RADIUS_NM = 3440.065
+NM_PER_DEG_LAT = 60.0
+
+
+def haversine_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1_r = math.radians(lat1)
+    lat2_r = math.radians(lat2)
+    dlat = lat2_r - lat1_r
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_r) * math.cos(lat2_r) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _initial_bearing_rad(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1_r = math.radians(lat1)
+    lat2_r = math.radians(lat2)
+    dlon = math.radians(lon2 - lon1)
+    x = math.sin(dlon) * math.cos(lat2_r)
+    y = math.cos(lat1_r) * math.sin(lat2_r) - math.sin(lat1_r) * math.cos(lat2_r) * math.cos(dlon)
+    return math.atan2(x, y)
+
+
+def midpoint(start: tuple[float, float], end: tuple[float, float]) -> tuple[float, float]:
+    """Great-circle midpoint of two lat/lon points."""
+    lat1, lon1 = math.radians(start[0]), math.radians(start[1])
+    lat2, dlon = math.radians(end[0]), math.radians(end[1] - start[1])
+    bx = math.cos(lat2) * math.cos(dlon)
+    by = math.cos(lat2) * math.sin(dlon)
+    lat = math.atan2(math.sin(lat1) + math.sin(lat2), math.hypot(math.cos(lat1) + bx, by))
+    lon = lon1 + math.atan2(by, math.cos(lat1) + bx)
+    return math.degrees(lat), (math.degrees(lon) + 540) % 360 - 180
+
+
+def path_points(
+    start: tuple[float, float], end: tuple[float, float], spacing_nm: float
+) -> list[tuple[float, float]]:
+    """Great-circle points from ``start`` to ``end``, ``spacing_nm`` apart at most."""
+    distance = haversine_nm(*start, *end)
+    if distance == 0:
+        return [start, end]
+    steps = max(1, math.ceil(distance / spacing_nm))
+    lat1, lon1 = math.radians(start[0]), math.radians(start[1])
+    lat2, lon2 = math.radians(end[0]), math.radians(end[1])
+    angular = distance / EARTH_RADIUS_NM
+    points = []
+    for step in range(steps + 1):
+        fraction = step / steps
+        a = math.sin((1 - fraction) * angular) / math.sin(angular)
+        b = math.sin(fraction * angular) / math.sin(angular)
+        x = a * math.cos(lat1) * math.cos(lon1) + b * math.cos(lat2) * math.cos(lon2)
+        y = a * math.cos(lat1) * math.sin(lon1) + b * math.cos(lat2) * math.sin(lon2)
+        z = a * math.sin(lat1) + b * math.sin(lat2)
+        points.append(
+            (math.degrees(math.atan2(z, math.hypot(x, y))), math.degrees(math.atan2(y, x)))
+        )
+    return points
+
+
+def distance_to_leg_nm(
+    lat: float, lon: float, start: tuple[float, float], end: tuple[float, float]
+) -> tuple[float, float]:
+    """Distance from a point to the great-circle leg ``start``→``end``, and how far along it.
+
+    Uses the cross-track distance where the point's foot lies on the leg and the distance
+    to the nearer end otherwise. The along-track value is clamped to the leg.
+    """
+    leg_nm = haversine_nm(*start, *end)
+    to_point_nm = haversine_nm(*start, lat, lon)
+    if leg_nm == 0 or to_point_nm == 0:
+        return to_point_nm, 0.0
+    angular = to_point_nm / EARTH_RADIUS_NM
+    offset = _initial_bearing_rad(*start, lat, lon) - _initial_bearing_rad(*start, *end)
+    cross = math.asin(max(-1.0, min(1.0, math.sin(angular) * math.sin(offset))))
+    along_nm = math.acos(max(-1.0, min(1.0, math.cos(angular) / math.cos(cross))))
+    along_nm *= EARTH_RADIUS_NM
+    if math.cos(offset) < 0:
+        return to_point_nm, 0.0
+    if along_nm > leg_nm:
+        return haversine_nm(*end, lat, lon), leg_nm
+    return abs(cross) * EARTH_RADIUS_NM, along_nm
+
+
+class SpatialIndex:
+    """Fixed lat/lon grid over named points for radius, nearest and corridor queries.
+
+    Each query only visits the cells overlapping its search area and then checks exact
+    haversine distances, so its cost follows the number of nearby points rather than the
+    size of the packs. Cells are ``cell_deg`` square; longitude wraps at the antimeridian.
+    """
+
+    def __init__(self, points: Iterable[tuple[str, float, float]], cell_deg: float = 1.0) -> None:
+        self.cell_deg = cell_deg
+        self.columns = math.ceil(360 / cell_deg)
+        self.points: dict[str, tuple[float, float]] = {}
+        self.cells: dict[tuple[int, int], list[str]] = {}
+        for key, lat, lon in points:
+            self.points[key] = (lat, lon)
+            self.cells.setdefault(self._cell(lat, lon), []).append(key)
+
+    @classmethod
+    def from_aerodromes(cls, aerodromes: Iterable[dict], cell_deg: float = 1.0) -> SpatialIndex:
+        return cls(
+            ((item["ident"], item["latitude_deg"], item["longitude_deg"]) for item in aerodromes),
+            cell_deg,
+        )
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg) % self.columns
+
+    def _candidates(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float):
+        rows = range(math.floor(lat_min / self.cell_deg), math.floor(lat_max / self.cell_deg) + 1)
+        if lon_max - lon_min >= 360:
+            columns: Iterable[int] = range(self.columns)
+        else:
+            first = math.floor(lon_min / self.cell_deg)
+            last = math.floor(lon_max / self.cell_deg)
+            columns = {column % self.columns for column in range(first, last + 1)}
+        for row in rows:
+            for column in columns:
+                yield from self.cells.get((row, column), ())
+
+    def _box(self, lat: float, lon: float, radius_nm: float) -> tuple[float, float, float, float]:
+        dlat = radius_nm / NM_PER_DEG_LAT
+        lat_min, lat_max = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        widest = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+        if lat_min <= -90 or lat_max >= 90 or widest * 180 * NM_PER_DEG_LAT <= radius_nm:
+            return lat_min, lat_max, -180.0, 180.0
+        dlon = radius_nm / (NM_PER_DEG_LAT * widest)
+        return lat_min, lat_max, lon - dlon, lon + dlon
+
+    def within(
+        self, lat: float, lon: float, radius_nm: float, exclude: Iterable[str] = ()
+    ) -> list[tuple[float, str]]:
+        """``(distance_nm, key)`` for every point within ``radius_nm``, nearest first."""
+        skip = set(exclude)
+        found = []
+        for key in self._candidates(*self._box(lat, lon, radius_nm)):
+            if key in skip:
+                continue
+            distance = haversine_nm(lat, lon, *self.points[key])
+            if distance <= radius_nm:
+                found.append((distance, key))
+        return sorted(found)
+
+    def nearest(
+        self, lat: float, lon: float, k: int = 1, exclude: Iterable[str] = ()
+    ) -> list[tuple[float, str]]:
+        """The ``k`` points nearest to ``lat``/``lon``, searching outwards by doubling radius."""
+        skip = set(exclude)
+        if k <= 0 or len(self.points) <= len(skip & self.points.keys()):
+            return []
+        radius_nm = self.cell_deg * NM_PER_DEG_LAT
+        while True:
+            found = self.within(lat, lon, radius_nm, skip)
+            if len(found) >= k or radius_nm >= math.pi * EARTH_RADIUS_NM:
+                return found[:k]
+            radius_nm *= 2
+
+    def corridor(
+        self, path: list[tuple[float, float]], half_width_nm: float, exclude: Iterable[str] = ()
+    ) -> list[dict]:
+        """Points within ``half_width_nm`` of the polyline ``path``, ordered along it.
+
+        Each hit carries the leg it is closest to, its distance off track and its distance
+        along the whole path.
+        """
+        skip = set(exclude)
+        best: dict[str, dict] = {}
+        along_start = 0.0
+        for leg, (start, end) in enumerate(zip(path, path[1:])):
+            leg_nm = haversine_nm(*start, *end)
+            # Every point of the leg is within leg_nm / 2 of its great-circle midpoint.
+            box = self._box(*midpoint(start, end), leg_nm / 2 + half_width_nm)
+            for key in set(self._candidates(*box)):
+                if key in skip:
+                    continue
+                offtrack, along = distance_to_leg_nm(*self.points[key], start, end)
+                if offtrack <= half_width_nm and (
+                    key not in best or offtrack < best[key]["offtrack_nm"]
+                ):
+                    best[key] = {
+                        "key": key,
+                        "leg": leg,
+                        "offtrack_nm": offtrack,
+                        "along_nm": along_start + along,
+                    }
+            along_start += leg_nm
+        return sorted(best.values(), key=lambda hit: (hit["along_nm"], hit["key"]))
+
+
+def point_in_polygon(lat: float, lon: float, polygon: list[tuple[float, float]]) -> bool:
+    """Even-odd test with the polygon's edges as straight lines in lat/lon."""
+    inside = False
+    for (lat1, lon1), (lat2, lon2) in zip(polygon, polygon[1:] + polygon[:1]):
+        if (lat1 > lat) != (lat2 > lat):
+            if lon < lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1):
+                inside = not inside
+    return inside
+
+
+def _orientation(a: tuple[float, float], b: tuple[float, float], c: tuple[float, float]) -> float:
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _segments_cross(
+    a: tuple[float, float], b: tuple[float, float], c: tuple[float, float], d: tuple[float, float]
+) -> bool:
+    first, second = _orientation(a, b, c), _orientation(a, b, d)
+    third, fourth = _orientation(c, d, a), _orientation(c, d, b)
+    if ((first > 0) != (second > 0) or first == 0 or second == 0) and (
+        (third > 0) != (fourth > 0) or third == 0 or fourth == 0
+    ):
+        # Collinear touches still need the segments' boxes to overlap.
+        return (
+            min(a[0], b[0]) <= max(c[0], d[0])
+            and min(c[0], d[0]) <= max(a[0], b[0])
+            and min(a[1], b[1]) <= max(c[1], d[1])
+            and min(c[1], d[1]) <= max(a[1], b[1])
+        )
+    return False
+
+
+def segment_meets_polygon(
+    start: tuple[float, float], end: tuple[float, float], polygon: list[tuple[float, float]]
+) -> bool:
+    """Whether the lat/lon segment ``start``→``end`` touches or enters ``polygon``."""
+    if point_in_polygon(*start, polygon) or point_in_polygon(*end, polygon):
+        return True
+    return any(
+        _segments_cross(start, end, first, second)
+        for first, second in zip(polygon, polygon[1:] + polygon[:1])
+    )
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import datetime as dt
+from bisect import bisect_left, bisect_right
+
+TEMPORARY_CHANGES = {"TEMPO", "PROB", "BECMG"}
+# ICAO Annex 3 significant-change thresholds for TAF visibility and cloud base.
+VIS_THRESHOLDS_M = (150, 350, 600, 800, 1500, 3000, 5000)
+CEILING_THRESHOLDS_FT = (100, 200, 500, 1000, 1500)
+
+
+def resolve_taf_time(group: str, reference: dt.datetime) -> dt.datetime | None:
+    """Turn a ``DDHH`` or ``DDHHMM`` group into the UTC datetime nearest ``reference``.
+
+    The day is placed in the reference month or the one either side of it, whichever is
+    closest, so a validity that began yesterday stays in this month and a day far behind
+    the reference rolls into the next. Hour 24 means midnight at the end of the day.
+    """
+    if not group or len(group) not in (4, 6) or not group.isdigit():
+        return None
+
+    day = int(group[:2])
+    hour = int(group[2:4])
+    minute = int(group[4:6]) if len(group) == 6 else 0
+    if day < 1 or day > 31 or hour < 0 or hour > 24 or minute > 59:
+        return None
+
+    candidates = []
+    for offset in (-1, 0, 1):
+        months = reference.year * 12 + reference.month - 1 + offset
+        try:
+            resolved = dt.datetime(
+                months // 12, months % 12 + 1, day, hour % 24, minute, tzinfo=dt.timezone.utc
+            )
+        except ValueError:
+            continue
+        candidates.append(resolved + dt.timedelta(days=1) if hour == 24 else resolved)
+    if not candidates:
+        return None
+    return min(candidates, key=lambda moment: abs(moment - reference))
+
+
+def is_convective(conditions: dict) -> bool:
+    return any("TS" in code for code in conditions.get("weather_codes", [])) or any(
+        layer.get("type") == "CB" for layer in conditions.get("cloud_layers", [])
+    )
+
+
+def _min(values) -> int | None:
+    known = [value for value in values if value is not None]
+    return min(known) if known else None
+
+
+def _max(values) -> int | None:
+    known = [value for value in values if value is not None]
+    return max(known) if known else None
+
+
+def worst_of(candidates: list[dict]) -> dict:
+    """Element-wise worst case over several sets of forecast conditions."""
+    weather: list[str] = []
+    for conditions in candidates:
+        for code in conditions.get("weather_codes", []):
+            if code not in weather:
+                weather.append(code)
+    return {
+        "wind_speed_kt": _max(c.get("wind_speed_kt") for c in candidates),
+        "gust_kt": _max(c.get("gust_kt") for c in candidates),
+        "visibility_m": _min(c.get("visibility_m") for c in candidates),
+        "ceiling_ft": _min(c.get("ceiling_ft") for c in candidates),
+        "weather_codes": weather,
+        "convective": any(c.get("convective") or is_convective(c) for c in candidates),
+    }
+
+
+class TafTimeline:
+    """Time index over the decoded periods of one TAF.
+
+    The validity is cut into elementary intervals at every period boundary. Each interval
+    stores the prevailing conditions (base forecast, then FM replacements and completed
+    BECMG changes) and the worst case including any TEMPO/PROB/in-progress BECMG overlay,
+    so point and window lookups are a bisect over the interval starts.
+    """
+
+    def __init__(self, intervals: list[dict]) -> None:
+        self.intervals = intervals
+        self.starts = [interval["start"] for interval in intervals]
+
+    @property
+    def valid_from(self) -> dt.datetime | None:
+        return self.starts[0] if self.starts else None
+
+    @property
+    def valid_to(self) -> dt.datetime | None:
+        return self.intervals[-1]["end"] if self.intervals else None
+
+    @classmethod
+    def from_decoded(cls, taf: dict, reference: dt.datetime) -> TafTimeline:
+        periods = taf.get("periods") or []
+        if not periods:
+            return cls([])
+        base = periods[0]
+        valid_from = resolve_taf_time(base["from"], reference)
+        valid_to = resolve_taf_time(base["to"], valid_from) if valid_from else None
+        if not valid_from or not valid_to or valid_to <= valid_from:
+            return cls([])
+
+        changes = []
+        for period in periods[1:]:
+            start = resolve_taf_time(period["from"], valid_from)
+            end = resolve_taf_time(period["to"], valid_from) if period["to"] else None
+            if start is None or (period["to"] and end is None):
+                continue
+            changes.append({**period, "start": start, "end": end})
+        changes.sort(key=lambda change: change["start"])
+
+        # FM periods run until the next FM group or the end of validity.
+        fm_changes = [change for change in changes if change["change"] == "FM"]
+        for current, following in zip(fm_changes, fm_changes[1:] + [None]):
+            current["end"] = following["start"] if following else valid_to
+
+        boundaries = {valid_from, valid_to}
+        for change in changes:
+            boundaries.update(
+                moment for moment in (change["start"], change["end"]) if moment is not None
+            )
+        cuts = sorted(moment for moment in boundaries if valid_from <= moment <= valid_to)
+
+        intervals = []
+        for start, end in zip(cuts, cuts[1:]):
+            prevailing = dict(base["conditions"])
+            since = valid_from
+            for change in fm_changes:
+                if change["start"] <= start:
+                    prevailing = dict(change["conditions"])
+                    since = change["start"]
+            for change in changes:
+                if (
+                    change["change"] == "BECMG"
+                    and since <= change["start"]
+                    and change["end"] <= start
+                ):
+                    prevailing.update(change["conditions"])
+            possible = [
+                {
+                    "change": change["change"],
+                    "probability": change["probability"],
+                    "conditions": {**prevailing, **change["conditions"]},
+                }
+                for change in changes
+                if change["change"] in TEMPORARY_CHANGES
+                and change["start"] <= start
+                and change["end"] > start
+            ]
+            intervals.append(
+                {
+                    "start": start,
+                    "end": end,
+                    "prevailing": prevailing,
+                    "possible": possible,
+                    "worst": worst_of([prevailing, *(item["conditions"] for item in possible)]),
+                }
+            )
+        return cls(intervals)
+
+    def conditions_at(self, moment: dt.datetime) -> dict | None:
+        """The interval covering ``moment``, or None outside the TAF validity."""
+        index = bisect_right(self.starts, moment) - 1
+        if index < 0 or moment >= self.intervals[index]["end"]:
+            return None
+        return self.intervals[index]
+
+    def worst_in(self, start: dt.datetime, end: dt.datetime) -> dict | None:
+        """Worst forecast conditions anywhere in ``[start, end)``, or None if disjoint."""
+        first = max(bisect_right(self.starts, start) - 1, 0)
+        last = bisect_left(self.starts, end)
+        candidates = [
+            interval["worst"]
+            for interval in self.intervals[first:last]
+            if interval["end"] > start and interval["start"] < end
+        ]
+        return worst_of(candidates) if candidates else None
+
+    def outlook(self, now: dt.datetime) -> dict | None:
+        """Worst case over the rest of the validity and whether it is a deterioration.
+
+        A TAF whose validity has not started yet is assessed from its first hour.
+        """
+        if not self.intervals or now >= self.valid_to:
+            return None
+        start = max(now, self.valid_from)
+        current = self.conditions_at(start)["prevailing"]
+        worst = self.worst_in(start, self.valid_to)
+        return {
+            "from": start.isoformat().replace("+00:00", "Z"),
+            "to": self.valid_to.isoformat().replace("+00:00", "Z"),
+            "worst": worst,
+            "deteriorating": deteriorates(current, worst),
+        }
+
+
+def _band(value: int | None, thresholds: tuple[int, ...]) -> int:
+    return len(thresholds) if value is None else bisect_right(thresholds, value)
+
+
+def deteriorates(current: dict, worst: dict) -> bool:
+    """True when ``worst`` adds convection or falls through a significant-change threshold."""
+    if worst["convective"] and not is_convective(current):
+        return True
+    if _band(worst["visibility_m"], VIS_THRESHOLDS_M) < _band(
+        current.get("visibility_m"), VIS_THRESHOLDS_M
+    ):
+        return True
+    return _band(worst["ceiling_ft"], CEILING_THRESHOLDS_FT) < _band(
+        current.get("ceiling_ft"), CEILING_THRESHOLDS_FT
+    )
@@ -0,0 +1,170 @@
+"""Trend statistics over one station's recent history, held as per-field columns.
+
+The history window is converted once into ``array('d')`` columns (NaN for missing values),
+and each statistic walks those columns in plain Python. That is one station at a time,
+called from ``compute_airfield``. Nothing here is vectorised or batched across stations;
+the build parallelises across stations with its process pool instead.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import math
+from array import array
+from dataclasses import dataclass
+
+from src.compute.change_detection import category_vis
+
+NAN = math.nan
+
+TREND_FIELDS = {
+    "wind_speed": "wind_speed_kt",
+    "wind_dir": "wind_dir_deg",
+    "qnh": "qnh_hpa",
+    "temp": "temp_c",
+    "dewpoint": "dewpoint_c",
+    "visibility": "visibility_m",
+    "ceiling": "ceiling_ft_est",
+}
+SPARKLINE_FIELDS = ("wind_speed", "qnh", "temp", "dewpoint", "visibility")
+
+
+def _column(values) -> array:
+    return array("d", (NAN if value is None else float(value) for value in values))
+
+
+def _hours(timestamp: str | None) -> float:
+    if not timestamp:
+        return NAN
+    parsed = dt.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    return parsed.timestamp() / 3600.0
+
+
+def _value(value: float) -> int | float | None:
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+@dataclass
+class HistoryColumns:
+    """Column-per-field view of one station's history; missing values are NaN."""
+
+    hours: array
+    fields: dict[str, array]
+
+    @classmethod
+    def from_entries(cls, entries: list[dict]) -> HistoryColumns:
+        return cls(
+            hours=_column(_hours(entry.get("timestamp")) for entry in entries),
+            fields={
+                name: _column(entry.get(key) for entry in entries)
+                for name, key in TREND_FIELDS.items()
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def tail(self, name: str, window: int) -> list[int | float | None]:
+        return [_value(value) for value in self.fields[name][-window:]]
+
+
+def deltas(values: array) -> array:
+    """Difference between consecutive points (NaN where either side is missing)."""
+    return array("d", (b - a for a, b in zip(values, values[1:])))
+
+
+def rates_per_hour(values: array, hours: array, min_hours: float = 0.0) -> array:
+    """Change per hour between consecutive points.
+
+    Gaps shorter than ``min_hours`` are treated as ``min_hours`` long; zero-length or
+    unknown gaps give NaN.
+    """
+    rates = array("d")
+    for delta, gap in zip(deltas(values), deltas(hours)):
+        gap = max(gap, min_hours)
+        rates.append(delta / gap if gap > 0 else NAN)
+    return rates
+
+
+def circular_shifts(directions: array) -> array:
+    """Signed direction change between consecutive points, wrapped to [-180, 180)."""
+    return array("d", ((delta + 180.0) % 360.0 - 180.0 for delta in deltas(directions)))
+
+
+def spread(temps: array, dewpoints: array) -> array:
+    return array("d", (temp - dew for temp, dew in zip(temps, dewpoints)))
+
+
+def category_transitions(values: array, categorise) -> list[dict]:
+    """Points where ``categorise`` changes between consecutive known values."""
+    transitions = []
+    previous = None
+    for index, value in enumerate(values):
+        if math.isnan(value):
+            continue
+        category = categorise(value)
+        if previous is not None and category != previous:
+            transitions.append({"index": index, "from": previous, "to": category})
+        previous = category
+    return transitions
+
+
+def _last(values: array) -> float | None:
+    if not values or math.isnan(values[-1]):
+        return None
+    return values[-1]
+
+
+def qnh_trend(columns: HistoryColumns) -> str:
+    delta = _last(deltas(columns.fields["qnh"]))
+    if delta is None:
+        return "steady"
+    if delta > 1:
+        return "rising"
+    if delta < -1:
+        return "falling"
+    return "steady"
+
+
+def qnh_rate(columns: HistoryColumns) -> float | None:
+    """QNH change per hour over the latest interval."""
+    rate = _last(rates_per_hour(columns.fields["qnh"], columns.hours))
+    return round(rate, 2) if rate is not None else None
+
+
+def qnh_falling_fast(columns: HistoryColumns, threshold: float) -> bool:
+    """Latest QNH fall per hour, with sub-hour intervals counted as a full hour."""
+    rate = _last(rates_per_hour(columns.fields["qnh"], columns.hours, min_hours=1.0))
+    if rate is None:
+        # Untimed reports: fall back to the raw change between the last two points.
+        rate = _last(deltas(columns.fields["qnh"]))
+    return rate is not None and rate <= -threshold
+
+
+def wind_shift_stats(columns: HistoryColumns) -> dict:
+    shifts = [abs(value) for value in circular_shifts(columns.fields["wind_dir"])]
+    known = [value for value in shifts if not math.isnan(value)]
+    return {
+        "last_deg": round(shifts[-1], 1) if shifts and not math.isnan(shifts[-1]) else None,
+        "max_deg": round(max(known), 1) if known else None,
+        "mean_deg": round(sum(known) / len(known), 1) if known else None,
+    }
+
+
+def sparkline_series(columns: HistoryColumns, window: int) -> dict:
+    """Sparkline series for the last ``window`` points of every trend field."""
+    return {name: columns.tail(name, window) for name in SPARKLINE_FIELDS}
+
+
+def trend_stats(columns: HistoryColumns) -> dict:
+    """Whole-window change statistics that complement the latest-interval deltas."""
+    spread_change = _last(deltas(spread(columns.fields["temp"], columns.fields["dewpoint"])))
+    return {
+        "wind_shift": wind_shift_stats(columns),
+        "spread_change_c": _value(spread_change) if spread_change is not None else None,
+        "visibility_transitions": category_transitions(
+            columns.fields["visibility"], lambda value: category_vis(int(value))
+        ),
+    }
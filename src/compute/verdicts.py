@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+REASON_BITS = {
+    "crosswind": 1,
+    "visibility": 2,
+    "ceiling": 4,
+    "density_altitude": 8,
+}
+
+
+def verdict_inputs(metar: dict, components: list[dict], da: dict) -> dict:
+    """The per-airfield values every profile/aircraft verdict is judged on."""
+    return {
+        "crosswind_kt": max((c["crosswind_kt"] or 0 for c in components), default=0),
+        "visibility_m": metar.get("visibility_m"),
+        "ceiling_ft": metar.get("ceiling_ft"),
+        "da_ft": da.get("da_ft") or 0,
+    }
+
+
+def crosswind_limit(profile: dict, aircraft: dict) -> int:
+    """Lower of the profile limit and the aircraft's demonstrated crosswind."""
+    profile_limit = profile["thresholds"].get("max_crosswind_kt") or 0
+    return min(profile_limit, aircraft.get("demonstrated_crosswind_kt") or profile_limit)
+
+
+def _profile_bits(inputs: dict, thresholds: dict) -> int:
+    bits = 0
+    visibility = inputs["visibility_m"]
+    if visibility is not None and visibility < (thresholds.get("min_vis_m") or 0):
+        bits |= REASON_BITS["visibility"]
+    ceiling = inputs["ceiling_ft"]
+    if ceiling is not None and ceiling < (thresholds.get("min_ceiling_ft") or 0):
+        bits |= REASON_BITS["ceiling"]
+    if inputs["da_ft"] > (thresholds.get("max_da_ft") or 99999):
+        bits |= REASON_BITS["density_altitude"]
+    return bits
+
+
+def verdict_matrix(inputs: dict, profiles: list[dict], aircraft: list[dict]) -> dict:
+    """GO/NO-GO for every profile × aircraft pair as a compact bitmask table.
+
+    ``matrix[p][a]`` is 0 for GO, otherwise the OR of ``REASON_BITS`` that failed. Only the
+    crosswind limit depends on the aircraft, so the visibility/ceiling/DA checks run once per
+    profile row and each cell adds a single comparison.
+    """
+    crosswind_bit = REASON_BITS["crosswind"]
+    matrix = []
+    for profile in profiles:
+        row_bits = _profile_bits(inputs, profile["thresholds"])
+        matrix.append(
+            [
+                row_bits
+                | (crosswind_bit if inputs["crosswind_kt"] > crosswind_limit(profile, item) else 0)
+                for item in aircraft
+            ]
+        )
+    return {
+        "profiles": [profile["name"] for profile in profiles],
+        "aircraft": [item["type"] for item in aircraft],
+        "reason_bits": REASON_BITS,
+        "inputs": inputs,
+        "matrix": matrix,
+    }
@@ -0,0 +1,265 @@
+"""Winds and temperatures aloft as a lat × lon × level grid, interpolated at any point.
+
+The on-disk format is an 8-byte magic, a little-endian uint32 header length, a JSON header
+(``lats``, ``lons``, ``levels_ft``, ``fields``, ``source``), padding to a 4-byte boundary,
+then float32 values in ``[lat][lon][level][field]`` order. ``WindsGrid.load`` memory-maps
+the values, so opening a grid costs the header parse and a query only touches the eight
+grid cells around it. Wind is stored as north/east components so interpolation works on
+vectors rather than on direction and speed.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Sequence
+
+MAGIC = b"WINDGRD1"
+FIELDS = ("wind_north_kt", "wind_east_kt", "temp_c")
+
+Vector = tuple[float, float, float]
+
+
+def wind_vector(level: dict) -> tuple[float, float]:
+    """(north, east) components of the direction the wind blows *from*, in knots.
+
+    Dotted with a track unit vector this gives the headwind component.
+    """
+    wind = math.radians(level["wind_dir_deg"])
+    return level["wind_speed_kt"] * math.cos(wind), level["wind_speed_kt"] * math.sin(wind)
+
+
+def level_entry(level_ft: float, north: float, east: float, temp_c: float, **extra) -> dict:
+    """A winds/temps table row from wind components."""
+    return {
+        "level_ft": level_ft,
+        "wind_dir_deg": round(math.degrees(math.atan2(east, north))) % 360,
+        "wind_speed_kt": round(math.hypot(north, east), 1),
+        "temp_c": round(temp_c, 1),
+        **extra,
+    }
+
+
+def column_rows(table: list[dict]) -> list[tuple[float, float, float, float]]:
+    """The winds/temps levels as sorted ``(level_ft, north, east, temp_c)`` rows."""
+    return sorted((level["level_ft"], *wind_vector(level), level["temp_c"]) for level in table)
+
+
+def at_level(rows: list[tuple[float, float, float, float]], level_ft: float) -> Vector | None:
+    """Wind vector and temperature at ``level_ft``; None outside the rows."""
+    index = bisect.bisect_left(rows, (level_ft,))
+    if index < len(rows) and rows[index][0] == level_ft:
+        return rows[index][1:]
+    if index == 0 or index == len(rows):
+        return None
+    lower, upper = rows[index - 1], rows[index]
+    weight = (level_ft - lower[0]) / (upper[0] - lower[0])
+    return tuple(low + (high - low) * weight for low, high in zip(lower[1:], upper[1:]))
+
+
+def interpolate_level(table: list[dict], level_ft: float) -> dict | None:
+    """Wind and temperature at ``level_ft``, linear between the table levels either side.
+
+    The wind is interpolated as a vector rather than as direction and speed, so a veer
+    between two levels turns the short way. Levels outside the table give None.
+    """
+    for level in table:
+        if level["level_ft"] == level_ft:
+            return {**level, "interpolated": False}
+    point = at_level(column_rows(table), level_ft)
+    if point is None:
+        return None
+    return level_entry(level_ft, *point, interpolated=True)
+
+
+def freezing_level_ft(table: list[dict]) -> float | None:
+    """Lowest height of the 0 °C isotherm, interpolated between table levels."""
+    rows = column_rows(table)
+    if not rows:
+        return None
+    if rows[0][3] <= 0:
+        return rows[0][0]
+    for lower, upper in zip(rows, rows[1:]):
+        if upper[3] <= 0:
+            return lower[0] + (upper[0] - lower[0]) * lower[3] / (lower[3] - upper[3])
+    return None
+
+
+def _bracket(axis: Sequence[float], value: float) -> tuple[int, int, float]:
+    """Indices either side of ``value`` on an ascending axis and the weight of the upper one.
+
+    Values beyond either end clamp to it.
+    """
+    if value <= axis[0]:
+        return 0, 0, 0.0
+    if value >= axis[-1]:
+        return len(axis) - 1, len(axis) - 1, 0.0
+    upper = bisect.bisect_right(axis, value)
+    lower = upper - 1
+    return lower, upper, (value - axis[lower]) / (axis[upper] - axis[lower])
+
+
+class WindsGrid:
+    """Trilinear interpolation over a regular-or-not lat/lon/level grid of float32 values."""
+
+    def __init__(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float],
+        levels_ft: Sequence[float],
+        values: Sequence[float],
+        source: str = "SAMPLE",
+    ) -> None:
+        if len(values) != len(lats) * len(lons) * len(levels_ft) * len(FIELDS):
+            raise ValueError("Grid values do not match its lat/lon/level axes")
+        if not all(list(axis) == sorted(set(axis)) for axis in (lats, lons, levels_ft)):
+            raise ValueError("Grid axes must be strictly ascending")
+        self.lats = tuple(lats)
+        self.lons = tuple(lons)
+        self.levels_ft = tuple(levels_ft)
+        self.values = values
+        self.source = source
+        self._mapped: mmap.mmap | None = None
+
+    @classmethod
+    def load(cls, path: Path) -> WindsGrid:
+        with path.open("rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a winds grid")
+            (length,) = struct.unpack("<I", handle.read(4))
+            header = json.loads(handle.read(length))
+            offset = -(-(len(MAGIC) + 4 + length) // 4) * 4
+            if sys.byteorder == "little":
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                values: Sequence[float] = memoryview(mapped)[offset:].cast("f")
+            else:
+                handle.seek(offset)
+                values = array("f", handle.read())
+                values.byteswap()
+                mapped = None
+        grid = cls(header["lats"], header["lons"], header["levels_ft"], values, header["source"])
+        grid._mapped = mapped
+        return grid
+
+    def write(self, path: Path) -> None:
+        header = json.dumps(
+            {
+                "lats": self.lats,
+                "lons": self.lons,
+                "levels_ft": self.levels_ft,
+                "fields": FIELDS,
+                "source": self.source,
+            }
+        ).encode("utf-8")
+        start = len(MAGIC) + 4 + len(header)
+        values = array("f", self.values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(
+            MAGIC
+            + struct.pack("<I", len(header))
+            + header
+            + b"\0" * (-start % 4)
+            + values.tobytes()
+        )
+
+    def close(self) -> None:
+        if self._mapped is not None:
+            self.values.release()
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self) -> WindsGrid:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _cell(self, lat_index: int, lon_index: int, level_index: int) -> int:
+        return ((lat_index * len(self.lons) + lon_index) * len(self.levels_ft) + level_index) * 3
+
+    def vector(self, lat: float, lon: float, level_ft: float) -> Vector | None:
+        """(north, east, temp_c) at a point; None above or below the grid's levels.
+
+        Horizontally the nearest grid edge stands in for points outside the grid.
+        """
+        levels = self.levels_ft
+        if not levels[0] <= level_ft <= levels[-1]:
+            return None
+        lat0, lat1, lat_w = _bracket(self.lats, lat)
+        lon0, lon1, lon_w = _bracket(self.lons, lon)
+        lev0, lev1, lev_w = _bracket(levels, level_ft)
+        values = self.values
+        total = [0.0, 0.0, 0.0]
+        for lat_index, w_lat in ((lat0, 1 - lat_w), (lat1, lat_w)):
+            for lon_index, w_lon in ((lon0, 1 - lon_w), (lon1, lon_w)):
+                for level_index, w_level in ((lev0, 1 - lev_w), (lev1, lev_w)):
+                    weight = w_lat * w_lon * w_level
+                    if weight:
+                        cell = self._cell(lat_index, lon_index, level_index)
+                        total[0] += weight * values[cell]
+                        total[1] += weight * values[cell + 1]
+                        total[2] += weight * values[cell + 2]
+        return total[0], total[1], total[2]
+
+    def sample(self, lat: float, lon: float, level_ft: float) -> dict | None:
+        """The winds/temps table row at a point and level."""
+        point = self.vector(lat, lon, level_ft)
+        return None if point is None else level_entry(level_ft, *point)
+
+    def column(
+        self, points: Iterable[tuple[float, float]], levels_ft: Iterable[float] | None = None
+    ) -> list[dict]:
+        """A winds/temps table averaged over ``points``, at the grid's levels by default.
+
+        Wind is averaged as a vector, so the result is the mean wind along a path.
+        """
+        points = list(points)
+        table = []
+        for level_ft in self.levels_ft if levels_ft is None else levels_ft:
+            found = [self.vector(lat, lon, level_ft) for lat, lon in points]
+            found = [item for item in found if item is not None]
+            if found:
+                mean = [sum(values) / len(found) for values in zip(*found)]
+                table.append(level_entry(level_ft, *mean))
+        return table
+
+    @classmethod
+    def from_column(
+        cls,
+        table: list[dict],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        reference: tuple[float, float],
+        source: str = "SAMPLE",
+    ) -> WindsGrid:
+        """Spread one column over a grid, matching it exactly at ``reference``.
+
+        Away from the reference the wind strengthens 4% per degree towards the pole, veers
+        2° per degree east and the air cools 0.4 °C per degree polewards: enough structure
+        for routes in different places to see different winds in sample mode.
+        """
+        rows = column_rows(table)
+        ref_lat, ref_lon = reference
+        values = array("f")
+        for lat in lats:
+            poleward = abs(lat) - abs(ref_lat)
+            for lon in lons:
+                turn = math.radians(2.0 * (lon - ref_lon))
+                scale = max(0.0, 1 + 0.04 * poleward)
+                for _, north, east, temp_c in rows:
+                    values.extend(
+                        (
+                            scale * (north * math.cos(turn) - east * math.sin(turn)),
+                            scale * (north * math.sin(turn) + east * math.cos(turn)),
+                            temp_c - 0.4 * poleward,
+                        )
+                    )
+        return cls(lats, lons, [row[0] for row in rows], values, source)
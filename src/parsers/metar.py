@@ -2,28 +2,66 @@ from __future__ import annotations
 
 import datetime as dt
 import re
+from functools import lru_cache
 
-WIND_RE = re.compile(r"(?P<dir>\d{3}|VRB)(?P<speed>\d{2})(G(?P<gust>\d{2}))?KT")
-VAR_WIND_RE = re.compile(r"(?P<from>\d{3})V(?P<to>\d{3})")
-VIS_RE = re.compile(r"\b(?P<vis>\d{4})\b")
-TEMP_RE = re.compile(r"(?P<temp>M?\d{2})/(?P<dew>M?\d{2})")
-QNH_RE = re.compile(r"Q(?P<qnh>\d{4})")
-TIME_RE = re.compile(r"(?P<day>\d{2})(?P<hour>\d{2})(?P<min>\d{2})Z")
-CLOUD_RE = re.compile(r"(?P<cover>FEW|SCT|BKN|OVC)(?P<base>\d{3})")
-WEATHER_CODES = {
-    "TS",
-    "RA",
-    "SH",
+WEATHER_DESCRIPTORS = ("MI", "PR", "BC", "DR", "BL", "SH", "TS", "FZ")
+WEATHER_PHENOMENA = (
     "DZ",
+    "RA",
     "SN",
+    "SG",
+    "IC",
+    "PL",
+    "GR",
+    "GS",
+    "UP",
     "BR",
     "FG",
+    "FU",
+    "VA",
+    "DU",
+    "SA",
     "HZ",
-    "GR",
-    "GS",
+    "PO",
     "SQ",
-    "VA",
+    "FC",
+    "SS",
+    "DS",
+)
+WEATHER_CODES = set(WEATHER_DESCRIPTORS) | set(WEATHER_PHENOMENA)
+
+_DESCRIPTOR = "|".join(WEATHER_DESCRIPTORS)
+_PHENOMENON = "|".join(WEATHER_PHENOMENA)
+
+# One alternative per METAR group. Each alternative is wrapped in a named group, so after a
+# single scan ``match.lastgroup`` says which kind of group every recognised token is.
+GROUP_PATTERNS = {
+    "time": r"\d{6}Z",
+    "wind": r"(?P<wind_dir>\d{3}|VRB)(?P<wind_speed>\d{2,3})(?:G(?P<gust>\d{2,3}))?KT",
+    "var_wind": r"(?P<var_from>\d{3})V(?P<var_to>\d{3})",
+    "cavok": r"CAVOK",
+    "vis": r"(?P<vis_m>\d{4})(?:NDV)?",
+    "vis_sm": r"(?P<sm_more>P)?(?:(?P<sm_whole>\d{1,2})|(?P<sm_num>\d)/(?P<sm_den>\d{1,2}))SM",
+    "vis_sm_whole": r"(?P<sm_prefix>\d)",
+    "dir_vis": r"\d{4}(?:N|NE|E|SE|S|SW|W|NW)",
+    "rvr": r"R\d{2}[LCR]?/[PM]?\d{4}(?:V[PM]?\d{4})?(?:FT)?[UDN]?",
+    "weather": rf"(?:[+-]|VC)?(?:(?:{_DESCRIPTOR})(?:{_PHENOMENON})*|(?:{_PHENOMENON})+)",
+    "cloud": r"(?P<cover>FEW|SCT|BKN|OVC|VV)(?P<base>\d{3})(?:CB|TCU|///)?",
+    "no_cloud": r"NSC|SKC|CLR|NCD",
+    "temp": r"(?P<temp_c>M?\d{2})/(?P<dew_c>M?\d{2})?",
+    "qnh": r"Q(?P<qnh_hpa>\d{4})",
+    "altimeter": r"A(?P<inhg>\d{4})",
 }
+GROUP_RE = re.compile(
+    r"(?<!\S)(?:"
+    + "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in GROUP_PATTERNS.items())
+    + r")(?!\S)"
+)
+HEADER_RE = re.compile(r"\s*(?:(?:METAR|SPECI)\s+)?(?:COR\s+)?(?P<station>[A-Z0-9]{4})(?!\S)")
+END_RE = re.compile(r"(?<!\S)(?P<marker>RMK|NOSIG|BECMG|TEMPO)(?!\S)")
+
+HPA_PER_INHG = 33.8639
+METRES_PER_SM = 1609.344
 
 
 def _parse_temp(value: str) -> int:
@@ -32,69 +70,110 @@ def _parse_temp(value: str) -> int:
     return int(value)
 
 
-def _parse_time(raw: str) -> str:
-    match = TIME_RE.search(raw)
-    if not match:
+@lru_cache(maxsize=4096)
+def _observation_time(group: str, reference: dt.datetime) -> str:
+    """Place a DDHHMMZ group in the month of ``reference``, or the previous one on rollover."""
+    day, hour, minute = int(group[0:2]), int(group[2:4]), int(group[4:6])
+    year, month = reference.year, reference.month
+    if day > reference.day + 1:
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    try:
+        obs = dt.datetime(year, month, day, hour, minute, tzinfo=dt.timezone.utc)
+    except ValueError:
         return ""
-    now = dt.datetime.utcnow()
-    obs = dt.datetime(
-        year=now.year,
-        month=now.month,
-        day=int(match.group("day")),
-        hour=int(match.group("hour")),
-        minute=int(match.group("min")),
-        tzinfo=dt.timezone.utc,
-    )
     return obs.isoformat().replace("+00:00", "Z")
 
 
-def decode_metar(raw: str) -> dict:
-    wind_dir = None
-    wind_speed = None
-    gust = None
-    wind_match = WIND_RE.search(raw)
-    if wind_match:
-        if wind_match.group("dir") != "VRB":
-            wind_dir = int(wind_match.group("dir"))
-        wind_speed = int(wind_match.group("speed"))
-        if wind_match.group("gust"):
-            gust = int(wind_match.group("gust"))
+def tokenize_metar(raw: str) -> tuple[list[re.Match], str]:
+    """Classify the groups of a report body in one left-to-right scan.
 
+    Returns the recognised groups (``match.lastgroup`` is the group kind; unknown tokens are
+    skipped) and the remarks text. The body ends at ``RMK`` or the first trend marker, so
+    forecast and remark contents are never mistaken for current conditions.
+    """
+    header = HEADER_RE.match(raw)
+    start = header.end() if header else 0
+    end = len(raw)
+    remarks = ""
+    marker = END_RE.search(raw, start)
+    if marker:
+        end = marker.start()
+        rmk = marker if marker.group("marker") == "RMK" else raw.find(" RMK", marker.end())
+        if rmk is marker:
+            remarks = raw[marker.end() :].strip()
+        elif rmk != -1:
+            remarks = raw[rmk + 4 :].strip()
+    return list(GROUP_RE.finditer(raw, start, end)), remarks
+
+
+def decode_metar(raw: str, reference: dt.datetime | None = None) -> dict:
+    """Decode a METAR in one left-to-right pass over its groups.
+
+    ``reference`` supplies the year and month for the day-of-month timestamp; callers
+    decoding many reports should pass it once rather than letting each call read the clock.
+    """
+    wind_dir = wind_speed = gust = None
     var_wind = None
-    var_match = VAR_WIND_RE.search(raw)
-    if var_match:
-        var_wind = {"from": int(var_match.group("from")), "to": int(var_match.group("to"))}
-
-    vis_match = VIS_RE.search(raw)
-    visibility_m = int(vis_match.group("vis")) if vis_match else None
-
-    cloud_layers = []
-    for cover, base in CLOUD_RE.findall(raw):
-        cloud_layers.append({"cover": cover, "base_ft": int(base) * 100})
+    visibility_m = None
+    weather: list[str] = []
+    cloud_layers: list[dict] = []
+    temp_c = dew_c = None
+    qnh_hpa = None
+    observed_time = ""
+    whole_miles = 0
+
+    groups, remarks = tokenize_metar(raw)
+    for match in groups:
+        kind = match.lastgroup
+        if kind == "wind":
+            if wind_speed is None:
+                if match.group("wind_dir") != "VRB":
+                    wind_dir = int(match.group("wind_dir"))
+                wind_speed = int(match.group("wind_speed"))
+                if match.group("gust"):
+                    gust = int(match.group("gust"))
+        elif kind == "var_wind":
+            var_wind = {"from": int(match.group("var_from")), "to": int(match.group("var_to"))}
+        elif kind == "vis":
+            if visibility_m is None:
+                visibility_m = int(match.group("vis_m"))
+        elif kind == "cavok":
+            visibility_m = 9999
+        elif kind == "vis_sm_whole":
+            # First half of a mixed statute-mile group such as ``1 1/2SM``.
+            whole_miles = int(match.group("sm_prefix"))
+        elif kind == "vis_sm":
+            if visibility_m is None:
+                if match.group("sm_whole"):
+                    miles = int(match.group("sm_whole"))
+                else:
+                    miles = whole_miles + int(match.group("sm_num")) / int(match.group("sm_den"))
+                visibility_m = min(round(miles * METRES_PER_SM), 9999)
+        elif kind == "weather":
+            weather.append(match.group())
+        elif kind == "cloud":
+            cloud_layers.append(
+                {"cover": match.group("cover"), "base_ft": int(match.group("base")) * 100}
+            )
+        elif kind == "temp":
+            temp_c = _parse_temp(match.group("temp_c"))
+            dew_c = _parse_temp(match.group("dew_c")) if match.group("dew_c") else None
+        elif kind == "qnh":
+            qnh_hpa = int(match.group("qnh_hpa"))
+        elif kind == "altimeter":
+            if qnh_hpa is None:
+                qnh_hpa = round(int(match.group("inhg")) / 100 * HPA_PER_INHG)
+        elif kind == "time":
+            if reference is None:
+                reference = dt.datetime.now(dt.timezone.utc)
+            observed_time = _observation_time(match.group(), reference)
 
     ceiling = None
     for layer in cloud_layers:
-        if layer["cover"] in {"BKN", "OVC"}:
+        if layer["cover"] in {"BKN", "OVC", "VV"}:
             ceiling = layer["base_ft"]
             break
 
-    temp_match = TEMP_RE.search(raw)
-    temp_c = dew_c = None
-    if temp_match:
-        temp_c = _parse_temp(temp_match.group("temp"))
-        dew_c = _parse_temp(temp_match.group("dew"))
-
-    qnh_match = QNH_RE.search(raw)
-    qnh_hpa = int(qnh_match.group("qnh")) if qnh_match else None
-
-    observed_time = _parse_time(raw)
-
-    weather = [token for token in raw.split() if any(code in token for code in WEATHER_CODES)]
-
-    remarks = ""
-    if "RMK" in raw:
-        remarks = raw.split("RMK", 1)[1].strip()
-
     return {
         "raw": raw,
         "observed_time_utc": observed_time,
@@ -1,15 +1,118 @@
 from __future__ import annotations
 
+import re
+
+# Vertical extent: FL080-FL180 (sample form), FL080/180, SFC/FL100, TOP FL350, ABV FL100.
+FL_BAND_RE = re.compile(
+    r"(?<!\S)(?:(?:FL(?P<base>\d{3})|(?P<sfc>SFC))[-/](?:FL)?(?P<top>\d{3})"
+    r"|(?P<kind>TOP|ABV|BLW)\s+FL(?P<level>\d{3}))(?!\S)"
+)
+VALID_RE = re.compile(r"(?<!\S)VALID\s+(?P<from>\d{6})/(?P<to>\d{6})(?!\S)")
+MOVEMENT_RE = re.compile(
+    r"(?<!\S)(?:MOV\s+(?P<dir>[NSEW]{1,3})(?:\s+(?P<speed>\d+)KT)?|STNR)(?!\S)"
+)
+POINT_RE = re.compile(
+    r"(?P<ns>[NS])(?P<lat>\d{2})(?P<lat_min>\d{2})?\s+(?P<ew>[EW])(?P<lon>\d{3})(?P<lon_min>\d{2})?"
+)
+AREA_RE = re.compile(
+    r"(?<!\S)WI\s+(?P<points>[NS]\d{2,4}\s+[EW]\d{3,5}(?:\s*-\s*[NS]\d{2,4}\s+[EW]\d{3,5})+)"
+)
+# ICAO form: the FIR's location indicator, then its name.
+FIR_RE = re.compile(r"(?<!\S)(?P<id>[A-Z]{4})\s+(?P<name>[A-Z]+(?:\s[A-Z]+)*?)\s+FIR(?!\S)")
+# The qualifier usually leads (SEV TURB); some AIRMETs give the intensity after (ICE MOD).
+PHENOMENON_RE = re.compile(
+    r"(?<!\S)(?P<qualifier>ISOL|OCNL|FRQ|EMBD|OBSC|SQL|MOD|SEV|HVY)?\s*"
+    r"(?P<phenomenon>TSGR|TS|TURB|ICE|MTW|DS|SS|VA|TC|RDOACT)(?!\w)"
+    r"(?:\s+(?P<trailing>MOD|SEV|HVY)(?!\S))?"
+)
+CHANGE_RE = re.compile(r"(?<!\S)(INTSF|WKN|NC)(?!\S)")
+INTENSITIES = ("MOD", "SEV", "HVY")
+# Stand-in for the top of a band that is only bounded below (ABV FLxxx).
+UNBOUNDED_TOP_FT = 60000
+
+
+def _band(text: str) -> tuple[int | None, int | None]:
+    match = FL_BAND_RE.search(text)
+    if not match:
+        return None, None
+    if match.group("kind"):
+        level = int(match.group("level")) * 100
+        if match.group("kind") == "ABV":
+            return level, UNBOUNDED_TOP_FT
+        return 0, level
+    base = 0 if match.group("sfc") else int(match.group("base")) * 100
+    return base, int(match.group("top")) * 100
+
+
+def _point(match: re.Match) -> tuple[float, float]:
+    lat = int(match.group("lat")) + int(match.group("lat_min") or 0) / 60
+    lon = int(match.group("lon")) + int(match.group("lon_min") or 0) / 60
+    return (
+        round(-lat if match.group("ns") == "S" else lat, 4),
+        round(-lon if match.group("ew") == "W" else lon, 4),
+    )
+
+
+def _area(text: str) -> dict:
+    """``WI`` polygon vertices (closed ring dropped), else the whole FIR."""
+    match = AREA_RE.search(text)
+    if match:
+        points = [_point(point) for point in POINT_RE.finditer(match.group("points"))]
+        if len(points) > 1 and points[0] == points[-1]:
+            points.pop()
+        if len(points) >= 3:
+            return {"type": "polygon", "points": [list(point) for point in points]}
+    fir = FIR_RE.search(text)
+    return {
+        "type": "fir",
+        "id": fir.group("id") if fir else None,
+        "name": fir.group("name") if fir else None,
+    }
+
 
 def decode_sigmet(lines: list[str]) -> list[dict]:
+    """Decode SIGMET/AIRMET lines into hazard volumes.
+
+    Each gets its phenomenon (``TSGR`` folds into ``TS``), qualifier and intensity, FL band
+    (``base_ft``/``top_ft``, None when none is given), movement, validity as ``DDHHMM``
+    groups and an ``area``: a ``WI`` polygon of ``[lat, lon]`` points or the whole FIR.
+    """
     decoded = []
-    for line in lines:
+    for raw in lines:
+        line = raw.rstrip("= ")
         tokens = line.split()
+        kind = next((token for token in tokens if token in ("SIGMET", "AIRMET")), tokens[0])
+        hazard = PHENOMENON_RE.search(line)
+        qualifier = (hazard.group("qualifier") or hazard.group("trailing")) if hazard else None
+        phenomenon = hazard.group("phenomenon") if hazard else None
+        base_ft, top_ft = _band(line)
+        valid = VALID_RE.search(line)
+        movement = MOVEMENT_RE.search(line)
+        change = CHANGE_RE.search(line)
         decoded.append(
             {
-                "raw": line,
-                "type": tokens[0],
+                "raw": raw,
+                "type": kind,
                 "details": " ".join(tokens[1:]) if len(tokens) > 1 else "",
+                "phenomenon": "TS" if phenomenon == "TSGR" else phenomenon,
+                "qualifier": qualifier,
+                "intensity": qualifier if qualifier in INTENSITIES else None,
+                "base_ft": base_ft,
+                "top_ft": top_ft,
+                "valid_from": valid.group("from") if valid else None,
+                "valid_to": valid.group("to") if valid else None,
+                "movement": (
+                    {
+                        "direction": movement.group("dir"),
+                        "speed_kt": (
+                            int(movement.group("speed")) if movement.group("speed") else None
+                        ),
+                    }
+                    if movement and movement.group("dir")
+                    else {"direction": None, "speed_kt": 0} if movement else None
+                ),
+                "change": change.group(1) if change else None,
+                "area": _area(line),
             }
         )
     return decoded
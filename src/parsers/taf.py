@@ -2,8 +2,132 @@ from __future__ import annotations
 
 import re
 
+from src.parsers.metar import GROUP_RE, METRES_PER_SM
+
 VALID_RE = re.compile(r"(?P<from>\d{4})/(?P<to>\d{4})")
-CHANGE_RE = re.compile(r"\b(TEMPO|BECMG|PROB\d{2}|FM\d{4})\b")
+HEADER_RE = re.compile(
+    r"\s*(?:TAF\s+)?(?:(?:AMD|COR)\s+)?[A-Z0-9]{4}\s+(?:\d{6}Z\s+)?"
+    r"(?P<from>\d{4})/(?P<to>\d{4})(?!\S)"
+)
+CHANGE_RE = re.compile(
+    r"(?<!\S)(?:(?P<fm>FM\d{6})|(?P<prob>PROB(?P<percent>\d{2}))(?:\s+TEMPO)?"
+    r"|(?P<marker>BECMG|TEMPO))(?!\S)"
+)
+PERIOD_RE = re.compile(r"\s*(?P<from>\d{4})/(?P<to>\d{4})(?!\S)")
+CLOUD_TYPE_RE = re.compile(r"(CB|TCU)$")
+
+
+def decode_conditions(text: str) -> dict:
+    """Decode the forecast groups of one TAF period.
+
+    Only the elements the period actually forecasts are present, so a change group can be
+    laid over the prevailing conditions field by field.
+    """
+    conditions: dict = {}
+    weather: list[str] = []
+    clouds: list[dict] = []
+    clouds_given = False
+    whole_miles = 0
+    for match in GROUP_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "wind":
+            direction = match.group("wind_dir")
+            conditions["wind_dir_deg"] = None if direction == "VRB" else int(direction)
+            conditions["wind_speed_kt"] = int(match.group("wind_speed"))
+            conditions["gust_kt"] = int(match.group("gust")) if match.group("gust") else None
+        elif kind == "vis":
+            conditions["visibility_m"] = int(match.group("vis_m"))
+        elif kind == "cavok":
+            conditions["visibility_m"] = 9999
+            conditions["weather_codes"] = []
+            clouds_given = True
+        elif kind == "vis_sm_whole":
+            whole_miles = int(match.group("sm_prefix"))
+        elif kind == "vis_sm":
+            if match.group("sm_whole"):
+                miles = int(match.group("sm_whole"))
+            else:
+                miles = whole_miles + int(match.group("sm_num")) / int(match.group("sm_den"))
+            conditions["visibility_m"] = min(round(miles * METRES_PER_SM), 9999)
+        elif kind == "weather":
+            weather.append(match.group())
+        elif kind == "cloud":
+            layer = {"cover": match.group("cover"), "base_ft": int(match.group("base")) * 100}
+            cloud_type = CLOUD_TYPE_RE.search(match.group())
+            if cloud_type:
+                layer["type"] = cloud_type.group(1)
+            clouds.append(layer)
+            clouds_given = True
+        elif kind == "no_cloud":
+            clouds_given = True
+
+    if weather:
+        conditions["weather_codes"] = weather
+    elif "NSW" in text.split():
+        conditions["weather_codes"] = []
+    if clouds_given:
+        conditions["cloud_layers"] = clouds
+        conditions["ceiling_ft"] = next(
+            (layer["base_ft"] for layer in clouds if layer["cover"] in {"BKN", "OVC", "VV"}),
+            None,
+        )
+    return conditions
+
+
+def decode_periods(raw: str) -> list[dict]:
+    """Split a TAF into its base forecast and FM/BECMG/TEMPO/PROB change periods.
+
+    Period times are left as the report's ``DDHH``/``DDHHMM`` groups; resolving them to
+    datetimes needs a reference date and is done by ``TafTimeline``.
+    """
+    header = HEADER_RE.match(raw)
+    if not header:
+        return []
+    markers = list(CHANGE_RE.finditer(raw, header.end()))
+    ends = [marker.start() for marker in markers[1:]] + [len(raw)]
+    periods = [
+        {
+            "change": "BASE",
+            "probability": None,
+            "from": header.group("from"),
+            "to": header.group("to"),
+            "conditions": decode_conditions(
+                raw[header.end() : markers[0].start() if markers else len(raw)]
+            ),
+        }
+    ]
+    for marker, end in zip(markers, ends):
+        body = raw[marker.end() : end]
+        if marker.group("fm"):
+            change, start, stop = "FM", marker.group("fm")[2:], None
+        else:
+            if marker.group("prob"):
+                change = "PROB"
+            else:
+                change = marker.group("marker")
+            period = PERIOD_RE.match(body)
+            if not period:
+                continue
+            start, stop = period.group("from"), period.group("to")
+            body = body[period.end() :]
+        periods.append(
+            {
+                "change": change,
+                "probability": int(marker.group("percent")) if marker.group("prob") else None,
+                "from": start,
+                "to": stop,
+                "conditions": decode_conditions(body),
+            }
+        )
+    return periods
+
+
+def _change_label(period: dict) -> str:
+    if period["change"] == "FM":
+        return f"FM{period['from']}"
+    if period["change"] == "PROB":
+        return f"PROB{period['probability']:02d}"
+    return period["change"]
 
 
 def decode_taf(raw: str) -> dict:
@@ -14,11 +138,12 @@ def decode_taf(raw: str) -> dict:
         valid_from = match.group("from")
         valid_to = match.group("to")
 
-    changes = CHANGE_RE.findall(raw)
+    periods = decode_periods(raw)
+    changes = [_change_label(period) for period in periods[1:]]
     summary = {
         "valid_from": valid_from,
         "valid_to": valid_to,
         "key_changes": changes,
     }
 
-    return {"raw": raw, "summary": summary}
+    return {"raw": raw, "summary": summary, "periods": periods}
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class Profiler:
+    """Wall time per named phase, integer counters and per-item timings for one build.
+
+    Phases may nest and each records its own inclusive time, so the report is a breakdown
+    rather than a sum. Updates take a lock because adapters fetch from worker threads.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, dict] = {}
+        self.counters: dict[str, int] = {}
+        self.items: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            entry = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += seconds
+            entry["calls"] += calls
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_item(self, group: str, key: str, seconds: float) -> None:
+        with self._lock:
+            self.items.setdefault(group, {})[key] = seconds
+
+    def merge(self, stats: dict) -> None:
+        """Fold in the ``to_dict()`` of a profiler that ran elsewhere (e.g. a worker process)."""
+        for name, entry in stats.get("phases", {}).items():
+            self.add_time(name, entry["seconds"], entry["calls"])
+        for name, amount in stats.get("counters", {}).items():
+            self.count(name, amount)
+        for group, items in stats.get("items", {}).items():
+            for key, seconds in items.items():
+                self.record_item(group, key, seconds)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "phases": {
+                    name: {"seconds": round(entry["seconds"], 6), "calls": entry["calls"]}
+                    for name, entry in sorted(self.phases.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+                "items": {
+                    group: {key: round(seconds, 6) for key, seconds in sorted(items.items())}
+                    for group, items in sorted(self.items.items())
+                },
+            }
+
+    def summary(self, total_phase: str = "build") -> str:
+        """Plain-text table of phases (slowest first) followed by the counters."""
+        stats = self.to_dict()
+        total = stats["phases"].get(total_phase, {}).get("seconds") or 0.0
+        width = max((len(name) for name in stats["phases"]), default=5)
+        lines = [f"{'phase':<{width}}  {'calls':>6}  {'seconds':>9}  {'share':>6}"]
+        ordered = sorted(stats["phases"].items(), key=lambda item: -item[1]["seconds"])
+        for name, entry in ordered:
+            share = f"{entry['seconds'] / total:6.1%}" if total else f"{'-':>6}"
+            lines.append(f"{name:<{width}}  {entry['calls']:>6}  {entry['seconds']:>9.3f}  {share}")
+        for name, amount in stats["counters"].items():
+            lines.append(f"{name}: {amount}")
+        for group, items in stats["items"].items():
+            slowest = sorted(items.items(), key=lambda item: -item[1])[:5]
+            listed = ", ".join(f"{key} {seconds:.3f}s" for key, seconds in slowest)
+            lines.append(f"slowest {group}: {listed}")
+        return "\n".join(lines)
+
+
+_active = Profiler()
+
+
+def active() -> Profiler:
+    return _active
+
+
+def reset() -> Profiler:
+    """Start a fresh profiler for a new build and return it."""
+    global _active
+    _active = Profiler()
+    return _active
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    with _active.phase(name):
+        yield
+
+
+def count(name: str, amount: int = 1) -> None:
+    _active.count(name, amount)
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator recording every call of the wrapped function under phase ``name``."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _active.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def capture() -> Iterator[Profiler]:
+    """Route instrumentation to a fresh profiler for the duration of the block."""
+    global _active
+    previous = _active
+    _active = Profiler()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def run_profiled(func: Callable, *args, **kwargs) -> tuple[Any, float, dict]:
+    """Call ``func`` and return its result, wall time and the phases it recorded.
+
+    Meant for process-pool workers, whose module-level profiler the parent never sees; the
+    parent merges the returned stats. Works the same in-process, where capture() keeps the
+    phases from being counted twice.
+    """
+    with capture() as captured:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return result, elapsed, captured.to_dict()
+
+
+def peak_rss_kb() -> int | None:
+    """Peak resident set size of this process in KiB (Linux reports ru_maxrss in KiB)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@contextmanager
+def cprofile(path: Path | str | None) -> Iterator[None]:
+    """Run the block under cProfile and dump pstats to ``path``; a no-op when path is None."""
+    if not path:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(path))
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
+from pathlib import Path
 from typing import Any
 
+from src.profiling import count
+
+# Bump when load_yaml's output for the same text changes, to invalidate on-disk caches.
+CACHE_VERSION = 1
+_memo: dict[Path, tuple[tuple[int, int], bytes]] = {}
+
 
 def _parse_scalar(value: str) -> Any:
     value = value.strip()
@@ -87,3 +97,51 @@ def load_yaml(text: str) -> Any:
 
     parsed, _ = parse_block(0, 0)
     return parsed
+
+
+def _disk_cache_path(cache_dir: Path, path: Path) -> Path:
+    return cache_dir / f"{hashlib.sha1(str(path).encode('utf-8')).hexdigest()}.pickle"
+
+
+def _read_disk_cache(cache_path: Path, path: Path, key: tuple[int, int]) -> bytes | None:
+    try:
+        version, cached_path, cached_key, payload = pickle.loads(cache_path.read_bytes())
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+        return None
+    if (version, cached_path, tuple(cached_key)) != (CACHE_VERSION, str(path), key):
+        return None
+    return payload
+
+
+def _write_disk_cache(cache_path: Path, path: Path, key: tuple[int, int], payload: bytes) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(pickle.dumps((CACHE_VERSION, str(path), key, payload)))
+    os.replace(tmp_path, cache_path)
+
+
+def load_yaml_path(path: Path, cache_dir: Path | None = None) -> Any:
+    """Parse a YAML file at most once per process, and with ``cache_dir`` once per change.
+
+    Parses are keyed on (path, mtime, size) and kept as pickles, in memory and optionally
+    under ``cache_dir``, so each call returns a fresh copy the caller may mutate.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _memo.get(path)
+    if cached and cached[0] == key:
+        count("yaml.memo_hits")
+        return pickle.loads(cached[1])
+
+    cache_path = _disk_cache_path(cache_dir, path) if cache_dir else None
+    payload = _read_disk_cache(cache_path, path, key) if cache_path else None
+    if payload is None:
+        count("yaml.parsed")
+        payload = pickle.dumps(load_yaml(path.read_text(encoding="utf-8")), pickle.HIGHEST_PROTOCOL)
+        if cache_path:
+            _write_disk_cache(cache_path, path, key, payload)
+    else:
+        count("yaml.disk_hits")
+    _memo[path] = (key, payload)
+    return pickle.loads(payload)
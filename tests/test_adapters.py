@@ -0,0 +1,135 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.adapters.http_cache import HttpCache
+from src.adapters.live_metar_taf import LiveMetarTafAdapter
+
+
+class FakeLiveAdapter(LiveMetarTafAdapter):
+    def __init__(self, responses: dict[str, str]) -> None:
+        super().__init__(batch_size=2)
+        self.responses = responses
+        self.requested: list[str] = []
+
+    def _fetch(self, url: str, product: str) -> str:
+        self.requested.append(url)
+        if url not in self.responses:
+            raise OSError("unreachable")
+        return self.responses[url]
+
+
+def test_fetch_metars_batches_idents_and_falls_back_per_station():
+    adapter = FakeLiveAdapter(
+        {
+            LiveMetarTafAdapter.metar_url.format(ident="FAOR,FALA"): (
+                "FAOR 121100Z 03012KT 9999 Q1016\nFALA 121100Z 05008KT 9999 Q1018"
+            ),
+            LiveMetarTafAdapter.metar_url.format(ident="FABB"): "",
+            LiveMetarTafAdapter.metar_fallback_url.format(ident="FABB"): (
+                "2026/02/12 11:00\nFABB 121100Z VRB03KT 5000 BR Q1017"
+            ),
+        }
+    )
+    results = adapter.fetch_metars(["FAOR", "FALA", "FABB", "FAPN"])
+    assert results["FAOR"].raw.startswith("FAOR 121100Z")
+    assert results["FALA"].raw.startswith("FALA 121100Z")
+    assert results["FABB"].raw.startswith("FABB 121100Z")
+    assert "FAPN" not in results
+    assert len([url for url in adapter.requested if "aviationweather" in url]) == 2
+
+
+def test_fetch_tafs_keeps_first_line_of_multiline_report():
+    adapter = FakeLiveAdapter(
+        {
+            LiveMetarTafAdapter.taf_url.format(ident="FAOR"): (
+                "TAF FAOR 121100Z 1212/1318 02010KT 9999 SCT020\n  TEMPO 1212/1218 4000 SHRA"
+            ),
+        }
+    )
+    adapter.batch_size = 5
+    results = adapter.fetch_tafs(["FAOR"])
+    assert results["FAOR"].raw == "TAF FAOR 121100Z 1212/1318 02010KT 9999 SCT020"
+
+
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    requests: list[dict] = []
+
+    def do_GET(self):  # noqa: N802
+        type(self).requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"FAOR 121100Z 03012KT 9999 Q1016"
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_cache_serves_fresh_entries_and_revalidates_stale_ones(tmp_path):
+    _ConditionalHandler.requests = []
+    server = HTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    now = [1000.0]
+    cache = HttpCache(tmp_path, ttl_seconds={"metar": 60}, clock=lambda: now[0])
+    url = f"http://127.0.0.1:{server.server_port}/metar?ids=FAOR"
+    try:
+        first = cache.get(url, "metar")
+        second = cache.get(url, "metar")
+        now[0] += 120
+        third = cache.get(url, "metar")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first == second == third == "FAOR 121100Z 03012KT 9999 Q1016"
+    assert cache.stats == {"hits": 1, "revalidated": 1, "misses": 1, "empty": 0}
+    assert len(_ConditionalHandler.requests) == 2
+    assert _ConditionalHandler.requests[1]["If-None-Match"] == '"v1"'
+
+
+class _EmptyAfterFirstHandler(BaseHTTPRequestHandler):
+    served = 0
+
+    def do_GET(self):  # noqa: N802
+        body = b"FAOR 121100Z 03012KT 9999 Q1016" if type(self).served == 0 else b"  \n"
+        type(self).served += 1
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_cache_never_caches_an_empty_body(tmp_path):
+    _EmptyAfterFirstHandler.served = 0
+    server = HTTPServer(("127.0.0.1", 0), _EmptyAfterFirstHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    now = [1000.0]
+    cache = HttpCache(tmp_path, ttl_seconds={"metar": 60}, clock=lambda: now[0])
+    url = f"http://127.0.0.1:{server.server_port}/metar?ids=FAOR"
+    empty_url = f"http://127.0.0.1:{server.server_port}/metar?ids=FALA"
+    try:
+        cache.get(url, "metar")
+        now[0] += 120
+        stale = cache.get(url, "metar")
+        retried = cache.get(url, "metar")
+        empty = cache.get(empty_url, "metar")
+        cache.get(empty_url, "metar")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stale == retried == "FAOR 121100Z 03012KT 9999 Q1016"
+    assert empty == ""
+    assert _EmptyAfterFirstHandler.served == 5
+    assert cache.stats == {"hits": 0, "revalidated": 0, "misses": 1, "empty": 4}
@@ -0,0 +1,369 @@
+import datetime as dt
+import gzip
+import json
+
+import pytest
+
+from src.build import build_site
+from src.build.history_store import open_history_store
+from src.build.manifest import content_digest
+from src.build.output import write_page
+from src.build.render_html import _chrome, render_airfield_page, use_assets
+from src.build.render_json import write_json
+from src.build.schema_validate import validate_all
+from src.build.snapshot_store import compact, load_snapshot, write_snapshot
+from src.build.synthetic import dump_yaml, write_synthetic_data
+from src.compute.spatial import SpatialIndex
+from src.yaml_loader import load_yaml
+
+
+@pytest.fixture
+def site_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_site, "SITE_DIR", tmp_path / "site")
+    monkeypatch.setattr(build_site, "HISTORY_DIR", tmp_path / "history")
+    return tmp_path / "site"
+
+
+def test_incremental_build_only_rerenders_changed_airfields_and_routes(site_dirs, monkeypatch):
+    now = build_site.utc_now()
+    monkeypatch.setattr(build_site, "utc_now", lambda: now)
+    build_site.build_site("sample")
+    build_site.build_site("sample")  # history now has a prior observation
+    manifest_path = site_dirs / "api" / "_manifest.json"
+    pages = {
+        "FABB": site_dirs / "airfield" / "FABB.html",
+        "FALA": site_dirs / "airfield" / "FALA.html",
+        "FALA-FABB": site_dirs / "route" / "FALA-FABB.html",
+        "FAOR-FAPN": site_dirs / "route" / "FAOR-FAPN.html",
+    }
+    for path in pages.values():
+        path.write_text("stale", encoding="utf-8")
+
+    build_site.build_site("sample")
+    assert all(path.read_text(encoding="utf-8") == "stale" for path in pages.values())
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["airfields"]["FABB"] = "changed"
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    build_site.build_site("sample")
+
+    assert pages["FABB"].read_text(encoding="utf-8") != "stale"
+    assert pages["FALA-FABB"].read_text(encoding="utf-8") != "stale"
+    assert pages["FALA"].read_text(encoding="utf-8") == "stale"
+    assert pages["FAOR-FAPN"].read_text(encoding="utf-8") == "stale"
+
+    # Same METAR/TAF text twelve hours on: TAF expiry and night state move, so pages re-render.
+    monkeypatch.setattr(build_site, "utc_now", lambda: now + dt.timedelta(hours=12))
+    build_site.build_site("sample")
+    assert pages["FALA"].read_text(encoding="utf-8") != "stale"
+    assert pages["FAOR-FAPN"].read_text(encoding="utf-8") != "stale"
+
+
+def test_parallel_build_airfields_matches_serial(site_dirs, monkeypatch):
+    now = dt.datetime(2026, 2, 12, 12, 0, tzinfo=dt.timezone.utc)
+    monkeypatch.setattr(build_site, "utc_now", lambda: now)
+    serial, _, _ = build_site.build_airfields("sample", record_history=False)
+    parallel, _, _ = build_site.build_airfields("sample", record_history=False, jobs=2)
+    assert [a["ident"] for a in parallel] == [a["ident"] for a in serial]
+    assert json.dumps(parallel) == json.dumps(serial)
+
+
+def test_history_store_dedupes_by_timestamp_and_applies_retention(tmp_path):
+    legacy = [
+        {"timestamp": f"2026-02-12T{hour:02d}:00:00Z", "qnh_hpa": 1000 + hour}
+        for hour in (1, 2, 2, 3)
+    ]
+    (tmp_path / "FAOR.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    with open_history_store(tmp_path, retention=3) as store:
+        assert [entry["qnh_hpa"] for entry in store.tail("FAOR", 10)] == [1001, 1002, 1003]
+        assert not store.append("FAOR", {"timestamp": "2026-02-12T03:00:00Z", "qnh_hpa": 1})
+        assert store.append("FAOR", {"timestamp": "2026-02-12T04:00:00Z", "qnh_hpa": 1004})
+        assert [entry["qnh_hpa"] for entry in store.tail("FAOR", 2)] == [1003, 1004]
+        assert len(store.tail("FAOR", 10)) == 3
+
+
+def test_trend_window_sets_how_much_history_trends_cover(site_dirs):
+    with open_history_store(build_site.HISTORY_DIR) as store:
+        for hour in range(30):
+            store.append("FAOR", {"timestamp": f"2020-01-0{1 + hour // 24}T{hour % 24:02}:00:00Z"})
+    build_site.build_site("sample", trend_window=30)
+    trends = json.loads((site_dirs / "api" / "airfield" / "FAOR.json").read_text("utf-8"))
+    assert len(trends["computed"]["trends"]["qnh"]) == 30
+    build_site.build_site("sample")
+    trends = json.loads((site_dirs / "api" / "airfield" / "FAOR.json").read_text("utf-8"))
+    assert len(trends["computed"]["trends"]["qnh"]) == build_site.TREND_WINDOW == 20
+
+    assert build_site.parse_args(["--trend-window", "48"]).trend_window == 48
+    with pytest.raises(SystemExit):
+        build_site.parse_args(["--trend-window", "300", "--history-retention", "200"])
+
+
+def test_v2_api_is_minified_and_references_airfields_by_ident(site_dirs):
+    build_site.build_site("sample", precompress=True)
+    api = site_dirs / "api"
+    assert not (api / "latest.json").exists()
+
+    index = json.loads((api / "v2" / "index.json").read_text(encoding="utf-8"))
+    assert index["version"] == 2
+    # The cache-busting hash covers the bytes served, so a code change that alters them
+    # changes the URL even when the inputs are the same.
+    assert index["airfields"]["FAOR"] == content_digest(
+        (api / "v2" / "airfield" / "FAOR.json").read_bytes()
+    )
+
+    route_path = api / "v2" / "route" / "FALA-FABB.json"
+    raw = route_path.read_bytes()
+    assert index["routes"]["FALA-FABB"] == content_digest(raw)
+    assert b"\n" not in raw
+    route = json.loads(raw)
+    assert route["airfields"] and all(isinstance(item, str) for item in route["airfields"])
+    assert set(route["airfields"]) <= set(index["airfields"])
+    assert gzip.decompress(route_path.with_name("FALA-FABB.json.gz").read_bytes()) == raw
+
+    build_site.build_site("sample", legacy_latest=True)
+    assert (api / "latest.json").exists()
+    rebuilt = json.loads((api / "v2" / "index.json").read_text(encoding="utf-8"))
+    assert rebuilt["routes"]["FALA-FABB"] == content_digest(route_path.read_bytes())
+
+
+def test_build_stats_report_phases_airfields_and_bytes_written(site_dirs):
+    build_site.build_site("sample")
+    stats = json.loads((site_dirs / "api" / "_build_stats.json").read_text(encoding="utf-8"))
+    manifest = json.loads((site_dirs / "api" / "_manifest.json").read_text(encoding="utf-8"))
+
+    assert {"build", "airfields", "compute", "decode", "routes", "write"} <= set(stats["phases"])
+    assert stats["phases"]["decode"]["calls"] == len(manifest["airfields"])
+    assert set(stats["airfields"]) == set(manifest["airfields"])
+
+    written = [
+        path for path in site_dirs.rglob("*") if path.is_file() and path.name != "_build_stats.json"
+    ]
+    assert stats["counters"]["files_written"] == len(written)
+    assert stats["counters"]["bytes_written"] == sum(path.stat().st_size for path in written)
+
+
+def test_synthetic_data_dir_validates_and_builds(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    counts = write_synthetic_data(data_dir, aerodromes=40, routes=12, seed=3)
+    assert counts == {"aerodromes": 40, "routes": 12}
+    validate_all(data_dir)
+
+    pack_text = (data_dir / "packs" / "SY" / "aerodromes.yaml").read_text(encoding="utf-8")
+    aerodromes = load_yaml(pack_text)["aerodromes"]
+    assert dump_yaml({"aerodromes": aerodromes}) in pack_text
+    assert aerodromes[0]["runways"][0]["designator"].isdigit()
+
+    for name in ("DATA_DIR", "PACKS_DIR", "SAMPLES_DIR", "HISTORY_DIR"):
+        monkeypatch.setattr(build_site, name, getattr(build_site, name))  # restored afterwards
+    build_site.use_data_dir(data_dir)
+    monkeypatch.setattr(build_site, "SITE_DIR", tmp_path / "site")
+    build_site.build_site("sample")
+    assert len(list((tmp_path / "site" / "airfield").glob("*.html"))) == 40
+    assert len(list((tmp_path / "site" / "route").glob("*.html"))) == 12
+
+
+def test_page_chrome_is_cached_per_mode_and_pages_stream_to_disk(tmp_path):
+    airfields, _, _ = build_site.build_airfields("sample", record_history=False)
+    mode_info = build_site.build_mode_info("sample")
+    use_assets({"style.css": "style.0123abcd.css"})
+    first = render_airfield_page(airfields[0], mode_info)
+    second = render_airfield_page(airfields[1], mode_info)
+    assert _chrome.cache_info().hits >= 1
+    assert first[0] is second[0] and first[-1] is second[-1]
+    assert 'href="../assets/style.0123abcd.css"' in "".join(first)
+
+    path = tmp_path / "airfield" / "FAOR.html"
+    write_page(path, first)
+    assert path.read_text(encoding="utf-8") == "".join(first)
+    mtime = path.stat().st_mtime_ns
+    write_page(path, render_airfield_page(airfields[0], mode_info))
+    assert path.stat().st_mtime_ns == mtime
+    assert not list(path.parent.glob(".*.tmp"))
+
+    use_assets({})
+    assert 'href="../assets/style.css"' in "".join(render_airfield_page(airfields[0], mode_info))
+
+
+def test_write_json_streams_indented_output_and_replaces_files_atomically(tmp_path):
+    path = tmp_path / "api" / "latest.json"
+    data = {"airfields": [{"ident": "FAOR", "name": "OR Tambo Intl", "flags": []}]}
+    write_json(path, data)
+    assert path.read_text(encoding="utf-8") == json.dumps(data, indent=2)
+
+    with pytest.raises(TypeError):
+        write_json(path, {"airfields": [object()]})
+    assert json.loads(path.read_text(encoding="utf-8")) == data
+    assert [item.name for item in path.parent.iterdir()] == ["latest.json"]
+
+
+def test_rebuild_leaves_identical_files_untouched(site_dirs, monkeypatch):
+    now = build_site.utc_now()
+    monkeypatch.setattr(build_site, "utc_now", lambda: now)
+    build_site.build_site("sample")
+    build_site.build_site("sample", full=True)  # history now has a prior observation
+    page = site_dirs / "airfield" / "FAOR.html"
+    svg = next((site_dirs / "assets").glob("*.svg"))
+    mtimes = {path: path.stat().st_mtime_ns for path in (page, svg)}
+
+    build_site.build_site("sample", full=True)
+    stats = json.loads((site_dirs / "api" / "_build_stats.json").read_text(encoding="utf-8"))
+    assert stats["changed"]["files"] < stats["counters"]["files_written"] / 10
+    assert all(path.stat().st_mtime_ns == mtime for path, mtime in mtimes.items())
+    assert not list(site_dirs.rglob(".*.tmp"))
+
+
+def test_assets_are_fingerprinted_and_linked_through_the_manifest(site_dirs, monkeypatch):
+    build_site.build_site("sample")
+    assets_dir = site_dirs / "assets"
+    stale = assets_dir / "style.0123456789.css"
+    stale.write_text("old", encoding="utf-8")
+    build_site.build_site("sample")
+
+    manifest = json.loads((assets_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert set(manifest) == {"style.css", "app.js", "low_sigwx.svg", "high_sigwx.svg"}
+    for name, fingerprinted in manifest.items():
+        assert (assets_dir / name).read_bytes() == (assets_dir / fingerprinted).read_bytes()
+    assert not stale.exists()
+
+    route_page = next((site_dirs / "route").glob("*.html")).read_text(encoding="utf-8")
+    for name in ("style.css", "app.js", "low_sigwx.svg"):
+        assert f"assets/{manifest[name]}" in route_page
+        assert f"assets/{name}" not in route_page
+
+    # Superseded fingerprints outlive the next two stylesheet changes, for cached pages.
+    original = assets_dir / manifest["style.css"]
+    for version in range(3):
+        monkeypatch.setattr(build_site, "_style_css", lambda: f"body {{ order: {version}; }}")
+        build_site.build_site("sample")
+        assert original.exists() == (version < 2)
+    build_site.build_snapshot("airfield", "FABB", "PPL", "sample", "snap-assets")
+    snapshot_page = (site_dirs / "snapshot" / "snap-assets.html").read_text(encoding="utf-8")
+    assert 'href="../assets/style.css"' in snapshot_page
+
+
+def test_snapshots_compute_only_the_target_and_its_route_airfields(site_dirs, monkeypatch):
+    airfields, default_profile, profiles = build_site.build_airfields(
+        "sample", record_history=False
+    )
+    expected = next(
+        r for r in build_site.build_routes(airfields, profiles[0]) if r["route_id"] == "FAOR-FALA"
+    )
+
+    computed = []
+    compute_airfield = build_site.compute_airfield
+
+    def counting_compute(aerodrome, *args, **kwargs):
+        computed.append(aerodrome["ident"])
+        return compute_airfield(aerodrome, *args, **kwargs)
+
+    monkeypatch.setattr(build_site, "compute_airfield", counting_compute)
+    build_site.build_snapshot("route", "FAOR-FALA", "PPL", "sample", "snap-route")
+    snapshot = load_snapshot(site_dirs / "api" / "snapshots", "snap-route")
+    route = snapshot["payload"]["route"]
+    index = SpatialIndex.from_aerodromes(build_site.load_packs()[0])
+    assert sorted(computed) == sorted(build_site.route_dependencies(expected, index))
+    assert route["en_route"] == expected["en_route"]
+    assert [item["ident"] for item in route["airfields"]] == [
+        item["ident"] for item in expected["airfields"]
+    ]
+    assert route["upper_winds"] == expected["upper_winds"]
+
+    computed.clear()
+    build_site.build_snapshot("airfield", "FABB", "PPL", "sample", "snap-airfield")
+    assert computed == ["FABB"]
+    with pytest.raises(ValueError):
+        build_site.build_snapshot("airfield", "ZZZZ", "PPL", "sample", "snap-missing")
+
+
+def test_snapshot_store_shares_objects_and_compacts_full_copies(tmp_path):
+    snapshots_dir = tmp_path / "snapshots"
+    profile = {"name": "PPL", "thresholds": {"min_vis_m": 5000}, "notes": "x" * 300}
+    airfield = {
+        "ident": "FAOR",
+        "runways": [{"id": "03L", "notes": "y" * 300}],
+        "metar": {"raw": "FAOR 121100Z 03012KT 9999 " + "z" * 300, "qnh": 1016},
+    }
+    legacy = {
+        "id": "old",
+        "generated_at": "t0",
+        "profile": profile,
+        "payload": {"airfield": airfield},
+    }
+    snapshots_dir.mkdir()
+    (snapshots_dir / "old.json").write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+    (snapshots_dir / "objects").mkdir()
+    (snapshots_dir / "objects" / f"{'0' * 20}.json").write_text("{}", encoding="utf-8")
+
+    result = compact(snapshots_dir)
+    assert result["removed_objects"] == 1
+    assert load_snapshot(snapshots_dir, "old") == legacy
+
+    newer = {
+        **legacy,
+        "id": "new",
+        "payload": {"airfield": {**airfield, "metar": {"raw": "FAOR", "qnh": 1009}}},
+    }
+    added = write_snapshot(snapshots_dir, newer)
+    # The changed METAR is small enough to stay inline; profile and runways are shared.
+    assert added == 0
+    assert load_snapshot(snapshots_dir, "new") == newer
+    old, new = (
+        json.loads((snapshots_dir / f"{name}.json").read_text(encoding="utf-8"))
+        for name in ("old", "new")
+    )
+    assert new["profile"] == old["profile"] and "$ref" in new["profile"]
+
+
+def test_routes_only_carry_sigmets_that_cross_their_legs_and_levels(site_dirs):
+    airfields, _, profiles = build_site.build_airfields("sample", record_history=False)
+    routes = {route["route_id"]: route for route in build_site.build_routes(airfields, profiles[0])}
+
+    circuit = routes["FAWB-FAMB-FAWR-FAWB"]
+    # FAMB lies inside the TS polygon, but the circuit's 6500/8500 ft levels sit below both the
+    # TS band (FL100-FL200) and the FIR-wide icing AIRMET (FL090-FL150).
+    assert circuit["sigmets_on_route"] == []
+    assert "CONVECTIVE_RISK_HIGH" not in circuit["summary"]["flags"]
+    assert not any("CONVECTIVE_RISK_HIGH" in route["summary"]["flags"] for route in routes.values())
+    assert [
+        (item["phenomenon"], item["legs"]) for item in routes["FAOR-FABL"]["sigmets_on_route"]
+    ] == [
+        ("TURB", [0]),
+        ("ICE", [0]),
+    ]
+    assert "TURB_POSSIBLE (TRAINING)" in routes["FAOR-FABL"]["summary"]["flags"]
+    assert "TURB_POSSIBLE (TRAINING)" not in routes["FAOR-FAPN"]["summary"]["flags"]
+
+
+def test_build_routes_closes_the_winds_grid_when_a_route_fails(site_dirs, monkeypatch):
+    airfields, _, profiles = build_site.build_airfields("sample", record_history=False)
+    opened = []
+    fetch = build_site.SampleWindsGridAdapter.fetch
+    monkeypatch.setattr(
+        build_site.SampleWindsGridAdapter,
+        "fetch",
+        lambda self: opened.append(fetch(self)) or opened[-1],
+    )
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("level plan failed")
+
+    monkeypatch.setattr(build_site, "level_plans", fail)
+    with pytest.raises(RuntimeError):
+        build_site.build_routes(airfields, profiles[0])
+    assert opened and opened[0]._mapped is None
+
+
+def test_route_taf_at_eta_and_expiry_follow_a_taf_that_began_yesterday(site_dirs, monkeypatch):
+    now = dt.datetime(2026, 2, 13, 6, 0, tzinfo=dt.timezone.utc)
+    monkeypatch.setattr(build_site, "utc_now", lambda: now)
+    airfields, _, profiles = build_site.build_airfields("sample", record_history=False)
+    routes = {route["route_id"]: route for route in build_site.build_routes(airfields, profiles[0])}
+
+    route = routes["FAOR-FALA"]
+    # The sample TAFs run 1212/1312 and 1212/1318, so both are six or twelve hours from expiry.
+    assert route["taf_time_to_expiry"]["dep"]["hours"] == 12.0
+    assert route["taf_time_to_expiry"]["dest"]["hours"] == 6.0
+    arrival = route["taf_at_eta"][-1]
+    assert arrival["ident"] == "FALA" and arrival["eta"].startswith("2026-02-13T")
+    assert arrival["in_validity"] and arrival["prevailing"]["wind_dir_deg"] == 90
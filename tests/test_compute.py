@@ -1,10 +1,27 @@
 import datetime as dt
 import math
+import random
 
-from src.build.build_site import parse_taf_valid_to
+import pytest
+
+from src.build.build_site import parse_taf_valid_to, taf_at_eta_entry
+from src.compute.cruise_level import candidate_levels, optimise_cruise_level
 from src.compute.density_altitude import density_altitude
-from src.compute.route import bearing_deg, headwind_component
+from src.compute.route import bearing_deg, headwind_component, level_plans, route_legs
+from src.compute.sigmet_index import SigmetIndex
+from src.compute.spatial import (
+    SpatialIndex,
+    distance_to_leg_nm,
+    haversine_nm,
+    path_points,
+    segment_meets_polygon,
+)
+from src.compute.taf_timeline import TafTimeline, resolve_taf_time
+from src.compute.trends import HistoryColumns, qnh_falling_fast, qnh_rate, trend_stats
 from src.compute.wind_components import wind_components
+from src.compute.winds_grid import WindsGrid, freezing_level_ft, interpolate_level
+from src.parsers.sigmet import decode_sigmet
+from src.parsers.taf import decode_taf
 
 
 def test_wind_components_headwind():
@@ -35,3 +52,240 @@ def test_parse_taf_valid_to_supports_24z_rollover():
 def test_parse_taf_valid_to_rejects_invalid_hour():
     reference = dt.datetime(2026, 2, 12, 10, 0, tzinfo=dt.timezone.utc)
     assert parse_taf_valid_to("1260", reference) is None
+
+
+def test_trend_stats_wrap_wind_shift_and_rate_qnh_per_hour():
+    columns = HistoryColumns.from_entries(
+        [
+            {"timestamp": "2026-02-12T10:00:00Z", "wind_dir_deg": 350, "qnh_hpa": 1015},
+            {"timestamp": "2026-02-12T11:00:00Z", "wind_dir_deg": 10, "qnh_hpa": 1013},
+            {"timestamp": "2026-02-12T11:30:00Z", "wind_dir_deg": None, "qnh_hpa": 1011},
+        ]
+    )
+    stats = trend_stats(columns)
+    assert stats["wind_shift"]["max_deg"] == 20
+    assert stats["wind_shift"]["last_deg"] is None
+    assert qnh_rate(columns) == -4.0
+    assert qnh_falling_fast(columns, 2.0)
+    assert not qnh_falling_fast(columns, 2.5)
+
+
+def test_taf_timeline_point_and_window_lookups():
+    taf = decode_taf(
+        "TAF FAOR 121100Z 1212/1318 02010KT 9999 SCT020 TEMPO 1214/1218 4000 TSRA BKN008CB "
+        "FM130000 27015KT 6000 OVC012"
+    )
+    utc = dt.timezone.utc
+    timeline = TafTimeline.from_decoded(taf, dt.datetime(2026, 2, 12, 11, 0, tzinfo=utc))
+    assert timeline.valid_to == dt.datetime(2026, 2, 13, 18, 0, tzinfo=utc)
+
+    at_1500 = timeline.conditions_at(dt.datetime(2026, 2, 12, 15, 0, tzinfo=utc))
+    assert at_1500["prevailing"]["visibility_m"] == 9999
+    assert at_1500["worst"]["convective"]
+    after_fm = timeline.conditions_at(dt.datetime(2026, 2, 13, 3, 0, tzinfo=utc))
+    assert after_fm["prevailing"]["ceiling_ft"] == 1200
+    assert timeline.conditions_at(dt.datetime(2026, 2, 13, 18, 0, tzinfo=utc)) is None
+
+    evening = timeline.worst_in(
+        dt.datetime(2026, 2, 12, 18, 0, tzinfo=utc), dt.datetime(2026, 2, 13, 1, 0, tzinfo=utc)
+    )
+    assert (evening["visibility_m"], evening["convective"]) == (6000, False)
+    assert timeline.outlook(dt.datetime(2026, 2, 12, 13, 0, tzinfo=utc))["deteriorating"]
+
+
+def test_taf_timeline_resolves_a_validity_that_began_yesterday():
+    taf = decode_taf("TAF FAOR 121100Z 1212/1318 02010KT 9999 SCT020 FM130000 27015KT 6000 OVC012")
+    utc = dt.timezone.utc
+    now = dt.datetime(2026, 2, 13, 6, 0, tzinfo=utc)
+    timeline = TafTimeline.from_decoded(taf, now)
+    assert timeline.valid_from == dt.datetime(2026, 2, 12, 12, 0, tzinfo=utc)
+    assert timeline.valid_to == dt.datetime(2026, 2, 13, 18, 0, tzinfo=utc)
+    assert timeline.conditions_at(now)["prevailing"]["ceiling_ft"] == 1200
+    assert timeline.outlook(now)["to"] == "2026-02-13T18:00:00Z"
+
+    new_year = dt.datetime(2027, 1, 1, 2, 0, tzinfo=utc)
+    assert resolve_taf_time("3118", new_year) == dt.datetime(2026, 12, 31, 18, 0, tzinfo=utc)
+    assert resolve_taf_time("3124", new_year) == dt.datetime(2027, 1, 1, 0, 0, tzinfo=utc)
+    end_of_month = dt.datetime(2026, 1, 31, 20, 0, tzinfo=utc)
+    assert resolve_taf_time("0106", end_of_month) == dt.datetime(2026, 2, 1, 6, 0, tzinfo=utc)
+
+
+def test_spatial_index_matches_brute_force_radius_nearest_and_corridor():
+    rng = random.Random(3)
+    points = [(f"P{i}", rng.uniform(-40, 40), rng.uniform(-180, 180)) for i in range(3000)]
+    index = SpatialIndex(points)
+    for _ in range(50):
+        lat, lon = rng.uniform(-40, 40), rng.uniform(-180, 180)
+        by_distance = sorted((haversine_nm(lat, lon, a, b), key) for key, a, b in points)
+        radius = rng.uniform(20, 400)
+        assert index.within(lat, lon, radius) == [hit for hit in by_distance if hit[0] <= radius]
+        assert index.nearest(lat, lon, 3) == by_distance[:3]
+
+        path = [(lat, lon), (lat + rng.uniform(-4, 4), lon + rng.uniform(-4, 4))]
+        width = rng.uniform(10, 80)
+        expected = {key for key, a, b in points if distance_to_leg_nm(a, b, *path)[0] <= width}
+        assert {hit["key"] for hit in index.corridor(path, width)} == expected
+
+    wrapped = SpatialIndex([("EAST", 0.0, 179.9), ("WEST", 0.0, -179.9)])
+    assert [key for _, key in wrapped.within(0.0, 179.95, 10)] == ["EAST", "WEST"]
+    assert [hit["key"] for hit in wrapped.corridor([(0.0, 179.0), (0.0, -179.0)], 5)] == [
+        "EAST",
+        "WEST",
+    ]
+
+
+def test_level_plans_work_through_every_leg_with_cumulative_etas():
+    waypoints = [
+        {"ident": "A", "latitude_deg": 0.0, "longitude_deg": 0.0},
+        {"ident": "B", "latitude_deg": 0.0, "longitude_deg": 1.0},
+        {"ident": "C", "latitude_deg": 1.0, "longitude_deg": 1.0},
+    ]
+    legs = route_legs(waypoints)
+    assert [round(leg["track_deg"]) for leg in legs] == [90, 0]
+    assert [round(leg["distance_nm"]) for leg in legs] == [60, 60]
+
+    levels = [
+        {"level_ft": 5000, "wind_dir_deg": 90, "wind_speed_kt": 20, "temp_c": 5},
+        {"level_ft": 9000, "wind_dir_deg": 90, "wind_speed_kt": 200, "temp_c": -3},
+    ]
+    calm, storm = level_plans(legs, levels, tas_kt=120)
+    assert calm["headwind_kt"] == [20.0, 0.0]
+    assert calm["ground_speed_kt"] == [100.0, 120.0]
+    assert calm["eta_minutes"] == [
+        round(legs[0]["distance_nm"] * 0.6, 1),
+        round(legs[0]["distance_nm"] * 0.6 + legs[1]["distance_nm"] * 0.5, 1),
+    ]
+    assert storm["leg_minutes"][0] is None and storm["total_minutes"] is None
+
+
+def test_cruise_level_optimiser_interpolates_and_avoids_hazard_bands():
+    legs = [
+        {"from": "A", "to": "B", "distance_nm": 60.0, "track_deg": 90.0},
+        {"from": "B", "to": "C", "distance_nm": 60.0, "track_deg": 0.0},
+    ]
+    table = [
+        {"level_ft": 4000, "wind_dir_deg": 90, "wind_speed_kt": 40, "temp_c": 10},
+        {"level_ft": 8000, "wind_dir_deg": 0, "wind_speed_kt": 40, "temp_c": 2},
+        {"level_ft": 12000, "wind_dir_deg": 0, "wind_speed_kt": 40, "temp_c": -6},
+    ]
+    between = interpolate_level(table, 6000)
+    assert (between["wind_dir_deg"], between["wind_speed_kt"]) == (45, 28.3)
+    assert between["interpolated"] and interpolate_level(table, 2000) is None
+    assert freezing_level_ft(table) == 9000
+    assert candidate_levels([4000, 8000]) == [4000, 5000, 6000, 7000, 8000]
+
+    clear = optimise_cruise_level(legs, table, candidate_levels([4000, 8000]), 120)
+    assert clear["min_time"]["levels_ft"] == [8000, 4000]
+    assert clear["min_time"]["total_minutes"] == 60.0
+    assert clear["min_time"]["level_changes"] == 1
+
+    hazards = decode_sigmet(["SIGMET 1 ZFWG JOHANNESBURG FIR MOD TURB FL070-FL090 MOV NE"])
+    stormy = optimise_cruise_level(legs, table, candidate_levels([4000, 8000]), 120, hazards)
+    assert stormy["min_time"]["hazards"][0] == ["TURB"]
+    # Exposure weights the minutes in TURB by 2; hazard_minutes stays plain time.
+    assert stormy["min_time"]["hazard_minutes"] > 0.0
+    assert stormy["min_time"]["hazard_exposure"] == 2 * stormy["min_time"]["hazard_minutes"]
+    assert stormy["min_risk"]["levels_ft"] == [6000, 4000]
+    assert stormy["min_risk"]["hazard_minutes"] == stormy["min_risk"]["hazard_exposure"] == 0.0
+
+    capped = optimise_cruise_level(legs, table, candidate_levels([4000, 8000], 5000), 120)
+    assert capped["evaluated_levels"] == [4000, 5000]
+    assert max(capped["min_time"]["levels_ft"]) <= 5000
+
+
+def test_winds_grid_round_trips_and_interpolates_along_a_path(tmp_path):
+    table = [
+        {"level_ft": 3000, "wind_dir_deg": 40, "wind_speed_kt": 12, "temp_c": 20},
+        {"level_ft": 9000, "wind_dir_deg": 80, "wind_speed_kt": 25, "temp_c": 8},
+    ]
+    built = WindsGrid.from_column(table, [-30, -26, -22], [24, 28, 32], (-26.0, 28.0))
+    built.write(tmp_path / "grid.bin")
+    with WindsGrid.load(tmp_path / "grid.bin") as grid:
+        assert grid.sample(-26, 28, 9000) == {**table[1], "temp_c": 8.0, "wind_speed_kt": 25.0}
+        assert grid.sample(-26, 28, 6000) == {
+            key: value
+            for key, value in interpolate_level(table, 6000).items()
+            if key != "interpolated"
+        }
+        assert grid.sample(-26, 28, 12000) is None
+        # Halfway between two grid columns is the mean of the two, and beyond the edge clamps.
+        south = grid.vector(-30, 28, 3000)
+        assert grid.vector(-28, 28, 3000) == pytest.approx(
+            [(a + b) / 2 for a, b in zip(south, grid.vector(-26, 28, 3000))]
+        )
+        assert grid.vector(-40, 28, 3000) == pytest.approx(south)
+        assert grid.sample(-30, 28, 3000)["wind_speed_kt"] > 12
+
+        legs = route_legs(
+            [
+                {"ident": "A", "latitude_deg": -30.0, "longitude_deg": 24.0},
+                {"ident": "B", "latitude_deg": -30.0, "longitude_deg": 32.0},
+            ]
+        )
+        legs[0]["winds"] = grid.column(path_points((-30.0, 24.0), (-30.0, 32.0), 50))
+        along = level_plans(legs, [table[0]], tas_kt=120)[0]
+        fixed = level_plans([{**legs[0], "winds": None}], [table[0]], tas_kt=120)[0]
+        # The southern leg sees the stronger winds the grid has there, not the column's.
+        assert along["headwind_kt"][0] > fixed["headwind_kt"][0]
+
+
+def test_sigmet_index_matches_brute_force_and_filters_by_band_and_time():
+    rng = random.Random(3)
+    lines = []
+    for number in range(200):
+        lat, lon = rng.randrange(22 * 60, 34 * 60, 10), rng.randrange(17 * 60, 32 * 60, 10)
+        corners = [(lat, lon), (lat, lon + 90), (lat + 90, lon + 90), (lat + 90, lon)]
+        area = " - ".join(
+            f"S{a // 60:02d}{a % 60:02d} E{o // 60:03d}{o % 60:02d}" for a, o in corners
+        )
+        lines.append(f"SIGMET {number} ZFWG JOHANNESBURG FIR SEV TURB WI {area} FL100-FL200")
+    lines.append("AIRMET 1 ZFWG JOHANNESBURG FIR ICE MOD FL090-FL150")
+    decoded = decode_sigmet(lines)
+    index = SigmetIndex(decoded)
+    paths = [
+        path_points((-26.1, 28.2), (-29.1, 26.3), 50),
+        path_points((-29.1, 26.3), (-33.9, 18.6), 50),
+    ]
+
+    found = {item["index"]: item["legs"] for item in index.crossing(paths)}
+    expected = {len(lines) - 1: [0, 1]}
+    for number, sigmet in enumerate(decoded[:-1]):
+        polygon = [tuple(point) for point in sigmet["area"]["points"]]
+        legs = [
+            leg
+            for leg, path in enumerate(paths)
+            if any(segment_meets_polygon(a, b, polygon) for a, b in zip(path, path[1:]))
+        ]
+        if legs:
+            expected[number] = legs
+    assert found == expected and len(found) > 2
+    assert [item["index"] for item in index.crossing(paths, base_ft=3000, top_ft=8000)] == []
+
+    valid = decode_sigmet(
+        ["FAJO SIGMET 1 VALID 121200/121600 FAJO JOHANNESBURG FIR SEV TURB FL100-FL200"]
+    )
+    timed = SigmetIndex(valid, reference=dt.datetime(2026, 2, 12, 9, tzinfo=dt.timezone.utc))
+    morning = dt.datetime(2026, 2, 12, 9, tzinfo=dt.timezone.utc)
+    assert timed.crossing(paths, morning, morning + dt.timedelta(hours=2)) == []
+    assert timed.crossing(paths, morning, morning + dt.timedelta(hours=4))[0]["legs"] == [0, 1]
+    assert timed.valid_to(0) == dt.datetime(2026, 2, 12, 16, tzinfo=dt.timezone.utc)
+
+    overnight = decode_sigmet(
+        ["FAJO SIGMET 2 VALID 122200/130400 FAJO JOHANNESBURG FIR SEV TURB FL100-FL200"]
+    )
+    after_midnight = dt.datetime(2026, 2, 13, 1, tzinfo=dt.timezone.utc)
+    in_force = SigmetIndex(overnight, reference=after_midnight)
+    assert in_force.valid_to(0) == dt.datetime(2026, 2, 13, 4, tzinfo=dt.timezone.utc)
+    assert in_force.crossing(paths, after_midnight, after_midnight + dt.timedelta(hours=1))
+
+
+def test_taf_at_eta_uses_the_arrival_time_and_an_hour_either_side():
+    taf = decode_taf(
+        "TAF FAOR 121100Z 1212/1318 02010KT 9999 SCT020 TEMPO 1214/1218 4000 TSRA BKN008CB"
+    )
+    departure = dt.datetime(2026, 2, 12, 12, 0, tzinfo=dt.timezone.utc)
+    before_tempo = taf_at_eta_entry({"ident": "FAOR", "taf": taf}, 90, departure)
+    assert before_tempo["eta"] == "2026-02-12T13:30:00Z"
+    assert before_tempo["prevailing"]["visibility_m"] == 9999
+    assert before_tempo["worst_within_1h"]["convective"]
+    assert not taf_at_eta_entry({"ident": "FAOR", "taf": taf}, 40 * 60, departure)["in_validity"]
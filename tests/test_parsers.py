@@ -0,0 +1,120 @@
+import datetime as dt
+
+import pytest
+
+from src import yaml_loader
+from src.parsers.metar import decode_metar, tokenize_metar
+from src.parsers.sigmet import decode_sigmet
+from src.parsers.taf import decode_taf
+
+REFERENCE = dt.datetime(2026, 2, 14, 12, 0, tzinfo=dt.timezone.utc)
+
+
+def test_decode_metar_reads_every_group_once():
+    decoded = decode_metar(
+        "FAOR 121100Z 03012G20KT 340V060 8000 -RA FEW020 BKN035 18/12 Q1016 NOSIG",
+        reference=REFERENCE,
+    )
+    assert decoded["observed_time_utc"] == "2026-02-12T11:00:00Z"
+    assert (decoded["wind_dir_deg"], decoded["wind_speed_kt"], decoded["gust_kt"]) == (30, 12, 20)
+    assert decoded["variable_wind"] == {"from": 340, "to": 60}
+    assert decoded["visibility_m"] == 8000
+    assert decoded["weather_codes"] == ["-RA"]
+    assert decoded["ceiling_ft"] == 3500
+    assert (decoded["temp_c"], decoded["dewpoint_c"], decoded["qnh_hpa"]) == (18, 12, 1016)
+
+
+def test_weather_codes_ignore_trend_and_remarks():
+    raw = "FALA 121100Z 05008KT 9999 SCT030 20/10 Q1018 TEMPO 3000 TSRA RMK RAB15 TS OHD"
+    decoded = decode_metar(raw, reference=REFERENCE)
+    assert decoded["weather_codes"] == []
+    assert decoded["remarks"] == "RAB15 TS OHD"
+    assert [match.lastgroup for match in tokenize_metar(raw)[0]][-2:] == ["temp", "qnh"]
+
+
+def test_decode_metar_handles_cavok_statute_miles_and_month_rollover():
+    cavok = decode_metar("FAMB 010000Z 06008KT CAVOK 19/08 Q1017", reference=REFERENCE)
+    assert cavok["visibility_m"] == 9999
+    us = decode_metar(
+        "METAR KJFK 301751Z 28015KT 1 1/2SM R04R/2200FT BR OVC004 M01/M03 A2992",
+        reference=REFERENCE,
+    )
+    assert us["observed_time_utc"] == "2026-01-30T17:51:00Z"
+    assert us["visibility_m"] == 2414
+    assert us["ceiling_ft"] == 400
+    assert (us["temp_c"], us["qnh_hpa"]) == (-1, 1013)
+
+
+def test_decode_taf_splits_change_periods():
+    decoded = decode_taf(
+        "TAF EGLL 121100Z 1212/1318 24010KT 9999 SCT020 PROB30 TEMPO 1214/1218 3000 +TSRA "
+        "BKN008CB FM130000 27015G25KT 6000 -RA OVC012 BECMG 1306/1308 NSW SCT030"
+    )
+    assert decoded["summary"]["key_changes"] == ["PROB30", "FM130000", "BECMG"]
+    base, prob, fm, becmg = decoded["periods"]
+    assert (base["from"], base["to"], base["conditions"]["visibility_m"]) == ("1212", "1318", 9999)
+    assert prob["change"] == "PROB" and prob["probability"] == 30
+    assert (prob["from"], prob["to"]) == ("1214", "1218")
+    assert prob["conditions"]["cloud_layers"] == [{"cover": "BKN", "base_ft": 800, "type": "CB"}]
+    assert "wind_speed_kt" not in prob["conditions"]
+    assert fm["from"] == "130000" and fm["to"] is None
+    assert (fm["conditions"]["gust_kt"], fm["conditions"]["ceiling_ft"]) == (25, 1200)
+    assert becmg["conditions"] == {
+        "weather_codes": [],
+        "cloud_layers": [{"cover": "SCT", "base_ft": 3000}],
+        "ceiling_ft": None,
+    }
+
+
+def test_decode_sigmet_reads_phenomenon_band_movement_validity_and_area():
+    polygon, fir_wide, trailing = decode_sigmet(
+        [
+            "FAJO SIGMET A3 VALID 121200/121600 FAOR- FAJO JOHANNESBURG FIR EMBD TSGR OBS WI "
+            "S2530 E02700 - S2530 E02900 - S2700 E02900 - S2530 E02700 TOP FL350 MOV NE 15KT NC=",
+            "AIRMET 1 ZFWG JOHANNESBURG FIR SEV ICE FL090/150 STNR",
+            "AIRMET 2 ZFWG JOHANNESBURG FIR ICE MOD FL090-FL150",
+        ]
+    )
+    assert (polygon["type"], polygon["phenomenon"], polygon["qualifier"]) == (
+        "SIGMET",
+        "TS",
+        "EMBD",
+    )
+    assert (polygon["base_ft"], polygon["top_ft"]) == (0, 35000)
+    assert (polygon["valid_from"], polygon["valid_to"]) == ("121200", "121600")
+    assert polygon["movement"] == {"direction": "NE", "speed_kt": 15}
+    assert polygon["change"] == "NC"
+    assert polygon["area"] == {
+        "type": "polygon",
+        "points": [[-25.5, 27.0], [-25.5, 29.0], [-27.0, 29.0]],
+    }
+    assert (fir_wide["phenomenon"], fir_wide["intensity"]) == ("ICE", "SEV")
+    assert (fir_wide["base_ft"], fir_wide["top_ft"]) == (9000, 15000)
+    assert fir_wide["movement"] == {"direction": None, "speed_kt": 0}
+    assert fir_wide["area"] == {"type": "fir", "id": "ZFWG", "name": "JOHANNESBURG"}
+    assert fir_wide["valid_from"] is None
+    assert (trailing["phenomenon"], trailing["intensity"]) == ("ICE", "MOD")
+
+
+def test_load_yaml_path_memoises_and_persists_parses(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_loader, "_memo", {})
+    path = tmp_path / "pack.yaml"
+    path.write_text("routes:\n  - route_id: A-B\n    alternates: [C]\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    first = yaml_loader.load_yaml_path(path, cache_dir)
+    first["routes"][0]["alternates"].append("mutated")
+    assert yaml_loader.load_yaml_path(path, cache_dir) == {
+        "routes": [{"route_id": "A-B", "alternates": ["C"]}]
+    }
+
+    def no_parse(text):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(yaml_loader, "_memo", {})
+    monkeypatch.setattr(yaml_loader, "load_yaml", no_parse)
+    assert yaml_loader.load_yaml_path(path, cache_dir)["routes"][0]["route_id"] == "A-B"
+
+    path.write_text("routes: []\n", encoding="utf-8")
+    with pytest.raises(AssertionError, match="parsed again"):
+        yaml_loader.load_yaml_path(path, cache_dir)
@@ -4,6 +4,7 @@ from src.compute.change_detection import detect_changes
 from src.compute.compound_flags import compound_flags
 from src.compute.stability import stability_score
 from src.compute.sun import sun_times
+from src.compute.verdicts import REASON_BITS, verdict_matrix
 from src.compute.workload import workload_score
 
 
@@ -76,3 +77,39 @@ def test_sun_times():
     times = sun_times(date, -26.0, 28.0)
     assert times["sunrise"] is not None
     assert times["sunset"] is not None
+
+
+def test_verdict_matrix_combines_profile_minima_and_aircraft_crosswind():
+    profiles = [
+        {
+            "name": "Student PPL",
+            "thresholds": {
+                "max_crosswind_kt": 10,
+                "min_vis_m": 5000,
+                "min_ceiling_ft": 2000,
+                "max_da_ft": 6500,
+            },
+        },
+        {
+            "name": "CPL",
+            "thresholds": {
+                "max_crosswind_kt": 18,
+                "min_vis_m": 2000,
+                "min_ceiling_ft": 1200,
+                "max_da_ft": 9000,
+            },
+        },
+    ]
+    aircraft = [
+        {"type": "C152", "demonstrated_crosswind_kt": 12},
+        {"type": "C182", "demonstrated_crosswind_kt": 20},
+    ]
+    inputs = {"crosswind_kt": 14, "visibility_m": 4000, "ceiling_ft": 1500, "da_ft": 7000}
+    table = verdict_matrix(inputs, profiles, aircraft)
+    student_minima = (
+        REASON_BITS["visibility"] | REASON_BITS["ceiling"] | REASON_BITS["density_altitude"]
+    )
+    assert table["matrix"] == [
+        [student_minima | REASON_BITS["crosswind"], student_minima | REASON_BITS["crosswind"]],
+        [REASON_BITS["crosswind"], 0],
+    ]